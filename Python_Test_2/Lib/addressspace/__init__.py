@@ -0,0 +1 @@
+from .addressspace import browse_batched, read_attribute_batched, write_attribute_batched, walk_address_space, CountingSession, DEFAULT_BATCH_SIZE
\ No newline at end of file
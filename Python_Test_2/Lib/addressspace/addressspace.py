@@ -0,0 +1,232 @@
+"""
+Address Space bundles batched OPC UA service calls, so a large address space can be explored
+with a few requests instead of several requests per node.
+
+It works with every asyncua session, the internal session of a server (server.nodes.objects.session)
+as well as the session of a client (client.nodes.objects.session).
+
+Rules:
+• The results are aligned with the input, the n-th result belongs to the n-th node id.
+• Requests are split into chunks of _batch_size nodes to stay within the server limits.
+• walk_address_space() is an async generator, nodes are yielded while the walk goes on
+  and no list of the whole address space is built.
+• CountingSession wraps a session and counts the requests of the helpers above.
+"""
+
+import asyncio
+
+from asyncua import ua
+
+DEFAULT_BATCH_SIZE = 1000
+
+
+class CountingSession:
+    """ Session proxy which counts the service requests sent through it, e.g. to report round trips """
+
+    def __init__(self, _session: object) -> None:
+        self.session = _session                                 # wrapped asyncua session
+        self.requests = 0                                       # number of service requests
+
+    async def browse(self, _parameters: ua.BrowseParameters) -> list:
+        self.requests += 1
+        return await self.session.browse(_parameters)
+
+    async def browse_next(self, _parameters: ua.BrowseNextParameters) -> list:
+        self.requests += 1
+        return await self.session.browse_next(_parameters)
+
+    async def read(self, _parameters: ua.ReadParameters) -> list:
+        self.requests += 1
+        return await self.session.read(_parameters)
+
+    async def write(self, _parameters: ua.WriteParameters) -> list:
+        self.requests += 1
+        return await self.session.write(_parameters)
+
+
+@staticmethod
+async def browse_batched(
+        _session: object,
+        _node_ids: list,
+        _reference_type: int = ua.ObjectIds.HierarchicalReferences,
+        _direction: ua.BrowseDirection = ua.BrowseDirection.Forward,
+        _batch_size: int = DEFAULT_BATCH_SIZE
+    ) -> list:
+    """ Browse many nodes with one Browse request per chunk """
+
+    """
+        Attributes:
+            _session            obj     asyncua session (internal server session or client session)
+            _node_ids           list    NodeIds to browse
+            _reference_type     int     reference type to follow, subtypes are included,
+                                        ua.ObjectIds.Null follows all references
+            _direction          enum    browse direction
+            _batch_size         int     maximum nodes per Browse request
+
+        Return value:
+            references          list    one list of ReferenceDescriptions per node id
+    """
+    references = []
+    for start in range(0, len(_node_ids), _batch_size):
+        params = ua.BrowseParameters()
+        params.View.Timestamp = ua.get_win_epoch()
+        params.RequestedMaxReferencesPerNode = 0
+        for node_id in _node_ids[start:start + _batch_size]:
+            description = ua.BrowseDescription()
+            description.NodeId = node_id
+            description.BrowseDirection = _direction
+            description.ReferenceTypeId = ua.NodeId(_reference_type)
+            description.IncludeSubtypes = True
+            description.NodeClassMask = ua.NodeClass.Unspecified
+            description.ResultMask = ua.BrowseResultMask.All
+            params.NodesToBrowse.append(description)
+        results = await _session.browse(params)
+        for result in results:
+            references.append(await _browse_next(_session= _session, _result= result))
+    return references
+
+@staticmethod
+async def _browse_next(_session: object, _result: ua.BrowseResult) -> list:
+    """ Collect the remaining references of a browse result with continuation point """
+
+    """
+        Attributes:
+            _session            obj     asyncua session
+            _result             obj     BrowseResult of one node
+
+        Return value:
+            references          list    all ReferenceDescriptions of the node
+    """
+    references = list(_result.References)
+    while _result.ContinuationPoint:
+        params = ua.BrowseNextParameters()
+        params.ContinuationPoints = [_result.ContinuationPoint]
+        params.ReleaseContinuationPoints = False
+        _result = (await _session.browse_next(params))[0]
+        references.extend(_result.References)
+    return references
+
+@staticmethod
+async def read_attribute_batched(
+        _session: object,
+        _node_ids: list,
+        _attribute: ua.AttributeIds = ua.AttributeIds.Value,
+        _batch_size: int = DEFAULT_BATCH_SIZE,
+        _max_age: float = 0
+    ) -> list:
+    """ Read one attribute of many nodes with one Read request per chunk """
+
+    """
+        Attributes:
+            _session            obj     asyncua session (internal server session or client session)
+            _node_ids           list    NodeIds to read
+            _attribute          enum    attribute to read
+            _batch_size         int     maximum nodes per Read request
+            _max_age            float   MaxAge of the Read in ms, the server may answer from its cache
+
+        Return value:
+            data_values         list    one DataValue per node id
+    """
+    data_values = []
+    for start in range(0, len(_node_ids), _batch_size):
+        params = ua.ReadParameters()
+        params.MaxAge = _max_age
+        for node_id in _node_ids[start:start + _batch_size]:
+            read_value = ua.ReadValueId()
+            read_value.NodeId = node_id
+            read_value.AttributeId = _attribute
+            params.NodesToRead.append(read_value)
+        data_values.extend(await _session.read(params))
+    return data_values
+
+@staticmethod
+async def write_attribute_batched(
+        _session: object,
+        _node_ids: list,
+        _data_values: list,
+        _attribute: ua.AttributeIds = ua.AttributeIds.Value,
+        _batch_size: int = DEFAULT_BATCH_SIZE
+    ) -> list:
+    """ Write one attribute of many nodes with one Write request per chunk """
+
+    """
+        Attributes:
+            _session            obj     asyncua session (internal server session or client session)
+            _node_ids           list    NodeIds to write
+            _data_values        list    one DataValue per node id
+            _attribute          enum    attribute to write
+            _batch_size         int     maximum nodes per Write request
+
+        Return value:
+            status_codes        list    one StatusCode per node id
+    """
+    status_codes = []
+    for start in range(0, len(_node_ids), _batch_size):
+        params = ua.WriteParameters()
+        for node_id, data_value in zip(_node_ids[start:start + _batch_size], _data_values[start:start + _batch_size]):
+            write_value = ua.WriteValue()
+            write_value.NodeId = node_id
+            write_value.AttributeId = _attribute
+            write_value.Value = data_value
+            params.NodesToWrite.append(write_value)
+        status_codes.extend(await _session.write(params))
+    return status_codes
+
+@staticmethod
+async def walk_address_space(
+        _session: object,
+        _root_node_id: ua.NodeId,
+        _reference_type: int = ua.ObjectIds.HierarchicalReferences,
+        _node_filter: object = None,
+        _max_depth: int = None,
+        _concurrency: int = 1,
+        _batch_size: int = DEFAULT_BATCH_SIZE
+    ):
+    """ Walk the address space breadth first and yield every reached node """
+
+    """
+        The walk is iterative, one batched Browse per chunk of _batch_size nodes of a level.
+        Up to _concurrency chunks are browsed at the same time. A visited set guarantees every
+        node is yielded once, also if non-tree references lead back to known nodes.
+
+        Attributes:
+            _session            obj     asyncua session (internal server session or client session)
+            _root_node_id       NodeId  start node, it is not yielded itself
+            _reference_type     int     reference type to follow, subtypes are included
+            _node_filter        func    optional filter(reference) -> bool, rejected nodes are
+                                        neither yielded nor expanded
+            _max_depth          int     optional depth limit, children of the root have depth 1
+            _concurrency        int     number of Browse requests in flight
+            _batch_size         int     maximum nodes per Browse request
+
+        Yield value:
+            (reference, parent_node_id, depth)
+                reference       obj     ReferenceDescription of the node (NodeId, BrowseName,
+                                        DisplayName, NodeClass, TypeDefinition)
+                parent_node_id  NodeId  node the reference was found on
+                depth           int     depth below the root
+    """
+    visited = {_root_node_id}
+    level_node_ids = [_root_node_id]
+    depth = 1
+    while level_node_ids and (_max_depth is None or depth <= _max_depth):
+        next_level_node_ids = []
+        chunks = [level_node_ids[start:start + _batch_size] for start in range(0, len(level_node_ids), _batch_size)]
+        for window in range(0, len(chunks), max(1, _concurrency)):
+            window_chunks = chunks[window:window + max(1, _concurrency)]
+            window_references = await asyncio.gather(*(
+                browse_batched(_session= _session, _node_ids= chunk, _reference_type= _reference_type, _batch_size= _batch_size)
+                for chunk in window_chunks
+            ))
+            for chunk, chunk_references in zip(window_chunks, window_references):
+                for parent_node_id, references in zip(chunk, chunk_references):
+                    for reference in references:
+                        if reference.NodeId in visited:
+                            continue
+                        if _node_filter is not None and not _node_filter(reference):
+                            continue
+                        visited.add(reference.NodeId)
+                        next_level_node_ids.append(reference.NodeId)
+                        yield reference, parent_node_id, depth
+        level_node_ids = next_level_node_ids
+        depth += 1
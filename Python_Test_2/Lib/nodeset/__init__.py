@@ -0,0 +1 @@
+from .nodeset import load_nodeset, SUPPORTED_ASYNCUA_VERSION
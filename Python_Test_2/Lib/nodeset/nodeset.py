@@ -0,0 +1,320 @@
+"""
+NodeSet loads a NodeSet2 XML design model into an asyncua server in a single streaming pass.
+
+Server.import_xml() reads the file three times (required models, namespaces and nodes) and keeps
+the whole element tree plus every parsed node in memory until the last node is added. load_nodeset()
+reads the file once with iterparse, registers the namespaces and aliases as soon as their header
+elements are complete and adds the nodes in batches while the rest of the file is still parsed.
+The node creation itself is done by asyncua's XmlImporter, so the resulting address space is the
+same as with Server.import_xml().
+
+Rules:
+• Every top level element is cleared after it is parsed, the memory does not grow with the file.
+• A node is added after its parent, type definition and data type, if they are part of the file.
+  Nodes with a missing dependency wait until it is parsed, nodes whose dependency never shows up
+  are added at the end in the order of XmlImporter._sort_nodes().
+• Nodes without parent get it from the HasComponent/HasProperty references of the file at the end,
+  like Server.import_xml() does.
+• The loader uses private parts of asyncua (XmlImporter._add_node_data, _map_namespaces, _sort_nodes,
+  XMLParser._parse_node, NodeManagementService._add_reference). It is written against
+  SUPPORTED_ASYNCUA_VERSION (pinned in requirements.txt), tests/test_nodeset.py compares it with
+  Server.import_xml() and has to pass before asyncua is updated.
+"""
+
+import time
+import logging
+import xml.etree.ElementTree as ET
+
+import asyncua
+
+from asyncua import ua
+from asyncua.common.xmlimporter import XmlImporter
+from asyncua.common.xmlparser import XMLParser
+from asyncua.crypto.permission_rules import User, UserRole
+
+from Lib.addressspace import browse_batched
+
+DEFAULT_BATCH_SIZE = 1000
+
+# asyncua version the private parts used here are checked against
+SUPPORTED_ASYNCUA_VERSION = "2.1.0"
+
+logger = logging.getLogger(__name__)
+
+# NodeSet2 elements which do not contain nodes
+HEADER_TAGS = ("NamespaceUris", "Aliases", "Models", "Extensions")
+
+# Node types which do not need their type definition before themselves
+TYPE_NODE_TAGS = ("UAObjectType", "UAVariableType", "UADataType", "UAReferenceType")
+
+# Reference types which are not mirrored by a reverse reference, see XmlImporter._add_missing_reverse_references()
+UNIDIRECTIONAL_TYPES = {
+    ua.ObjectIds.GuardVariableType,
+    ua.ObjectIds.HasGuard,
+    ua.ObjectIds.TransitionVariableType,
+    ua.ObjectIds.StateMachineType,
+    ua.ObjectIds.StateVariableType,
+    ua.ObjectIds.TwoStateVariableType,
+    ua.ObjectIds.StateType,
+    ua.ObjectIds.TransitionType,
+    ua.ObjectIds.FiniteTransitionVariableType,
+    ua.ObjectIds.HasInterface,
+}
+
+
+class _StreamParser(XMLParser):
+    """ XMLParser fed element by element, the header getters answer from the collected header """
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.namespace_uris = []                                # NamespaceUris of the file
+        self.aliases = {}                                       # Aliases of the file, not migrated
+        self.required_models = []                               # RequiredModel attributes of the file
+        self.root = ET.Element("UANodeSet")                     # holds the Models element only
+
+    def get_used_namespaces(self) -> list:
+        return list(self.namespace_uris)
+
+    def get_aliases(self) -> dict:
+        return self.aliases
+
+    def list_required_models(self, xmlpath=None, xmlstring=None) -> list:
+        return list(self.required_models)
+
+
+@staticmethod
+async def load_nodeset(_server: object, _xml_file: str, _batch_size: int = DEFAULT_BATCH_SIZE, _strict_mode: bool = True) -> dict:
+    """ Load a NodeSet2 XML file into the server with one streaming pass """
+
+    """
+        Attributes:
+            _server             obj     asyncua Server
+            _xml_file           str     path of the NodeSet2 XML file
+            _batch_size         int     parsed nodes which are added to the server at once
+            _strict_mode        bool    stop on the first node which can not be added
+
+        Return value:
+            statistics          dict    nodes, batches, deferred nodes and the durations of the
+                                        namespace mapping and the node import
+    """
+    if asyncua.__version__ != SUPPORTED_ASYNCUA_VERSION:
+        logger.warning("load_nodeset() is written for asyncua %s, installed is %s", SUPPORTED_ASYNCUA_VERSION, asyncua.__version__)
+    parser = _StreamParser()
+    importer = XmlImporter(_server, strict_mode= _strict_mode)
+    importer.parser = parser
+    importer.refs = []
+
+    statistics = {"nodes": 0, "batches": 0, "deferred": 0, "namespaces_duration": 0.0, "nodes_duration": 0.0}
+    local_namespaces = set()                    # server namespace indices of the file
+    scheduled = set()                           # node ids in the batch or already added
+    waiting = {}                                # missing dependency -> nodes waiting for it
+    orphans = []                                # nodes without parent
+    childs = {}                                 # child -> (parent, reference type) of the file
+    batch = []
+    added = []
+
+    async def _flush() -> int:
+        """ Add the nodes of the current batch to the server """
+        for nodedata in batch:
+            try:
+                added.append(await importer._add_node_data(nodedata, no_namespace_migration= True))
+            except Exception as error:
+                logger.warning("failure adding node %s %s", nodedata, error)
+                if _strict_mode:
+                    raise
+        statistics["nodes"] += len(batch)
+        statistics["batches"] += 1 if batch else 0
+        batch.clear()
+        return 1
+
+    def _schedule(_nodedata: object) -> int:
+        """ Put a node and all nodes waiting for it into the batch, return the number of batched nodes """
+        count = 0
+        pending = [_nodedata]
+        while pending:
+            nodedata = pending.pop()
+            missing = _missing_dependency(nodedata)
+            if missing is not None:
+                waiting.setdefault(missing, []).append(nodedata)
+                continue
+            batch.append(nodedata)
+            scheduled.add(nodedata.nodeid)
+            pending.extend(reversed(waiting.pop(nodedata.nodeid, [])))
+            count += 1
+        return count
+
+    def _missing_dependency(_nodedata: object) -> object:
+        """ First dependency of the file which is not batched yet, None if there is none """
+        dependencies = [_nodedata.parent, _nodedata.datatype]
+        if _nodedata.nodetype not in TYPE_NODE_TAGS:
+            dependencies.append(_nodedata.typedef)
+        dependencies += [field.datatype for field in _nodedata.definitions]
+        for dependency in dependencies:
+            if dependency is None or dependency == _nodedata.nodeid:
+                continue
+            if dependency.NamespaceIndex in local_namespaces and dependency not in scheduled:
+                return dependency
+        return None
+
+    namespaces_ready = False
+    start_time = time.perf_counter()
+    depth = 0
+    root = None
+    for event, element in ET.iterparse(_xml_file, events= ("start", "end")):
+        if event == "start":
+            if root is None:
+                root = element
+            depth += 1
+            continue
+        depth -= 1
+        if depth != 1:
+            continue
+        tag = parser._retag.match(element.tag).groups()[1]
+
+        if tag == "NamespaceUris":
+            parser.namespace_uris = [uri.text for uri in element]
+        elif tag == "Aliases":
+            parser.aliases = {alias.attrib["Alias"]: alias.text for alias in element}
+        elif tag == "Models":
+            parser.required_models = [model.attrib for model in element.iter() if model.tag.endswith("RequiredModel")]
+            parser.root.append(element)
+        elif tag not in HEADER_TAGS:
+            if not namespaces_ready:
+                # NamespaceUris, Aliases and Models precede the nodes in a NodeSet2 file
+                namespace_start_time = time.perf_counter()
+                await importer._check_required_models()
+                importer.namespaces = await importer._map_namespaces()
+                importer._unmigrated_aliases = parser.get_aliases()
+                importer.aliases = importer._map_aliases(importer._unmigrated_aliases)
+                local_namespaces = set(importer.namespaces.values())
+                statistics["namespaces_duration"] = time.perf_counter() - namespace_start_time
+                namespaces_ready = True
+
+            nodedata = importer.make_objects([parser._parse_node(tag, element)])[0]
+            for ref in nodedata.refs:
+                if ref.forward and ref.reftype in (_server.nodes.HasComponent.nodeid, _server.nodes.HasProperty.nodeid):
+                    childs[ref.target] = (nodedata.nodeid, ref.reftype)
+            if not nodedata.parent or nodedata.parent == nodedata.nodeid:
+                orphans.append(nodedata)
+            elif _schedule(nodedata) == 0:
+                statistics["deferred"] += 1
+            if len(batch) >= _batch_size:
+                await _flush()
+
+        if tag != "Models":
+            element.clear()
+        root.clear()
+
+    if not namespaces_ready:
+        importer.namespaces = await importer._map_namespaces()
+
+    # Nodes without parent attribute, their parent is known now
+    for nodedata in orphans:
+        if nodedata.nodeid in childs:
+            nodedata.parent, nodedata.parentlink = childs[nodedata.nodeid]
+        _schedule(nodedata)
+    await _flush()
+
+    # Nodes whose dependency is not part of the file
+    leftovers = [nodedata for nodes in waiting.values() for nodedata in nodes]
+    if leftovers:
+        waiting.clear()
+        try:
+            batch.extend(importer._sort_nodes(leftovers))
+        except ValueError:
+            batch.extend(leftovers)
+        await _flush()
+
+    importer.refs, remaining_refs = [], importer.refs
+    await importer._add_references(remaining_refs)
+    missing_nodes = await _add_missing_reverse_references(_server= _server, _importer= importer, _node_ids= added, _batch_size= _batch_size)
+    if missing_nodes:
+        logger.warning("The following references exist, but the Nodes are missing: %s", missing_nodes)
+    if importer.refs:
+        logger.warning("The following references could not be imported and are probably broken: %s", importer.refs)
+    await importer._check_if_namespace_meta_information_is_added()
+
+    statistics["nodes_duration"] = time.perf_counter() - start_time - statistics["namespaces_duration"]
+    return statistics
+
+
+@staticmethod
+async def _add_missing_reverse_references(_server: object, _importer: XmlImporter, _node_ids: list, _batch_size: int = DEFAULT_BATCH_SIZE) -> set:
+    """ Add the reverse of every reference of the imported nodes which has none """
+
+    """
+        Same result as XmlImporter._add_missing_reverse_references(), without its two hot spots:
+        the references of the nodes are browsed in batches instead of one request per node and the
+        reverse references are checked against an index of their source node. The address space compares
+        every new reference with all references of its source node, so e.g. the inverse HasTypeDefinition
+        references of 100k variables on BaseDataVariableType cost O(n²), here O(n).
+
+        Attributes:
+            _server             obj     asyncua Server
+            _importer           obj     XmlImporter of the load, refs which fail are collected in _importer.refs
+            _node_ids           list    NodeIds of the imported nodes
+            _batch_size         int     maximum nodes per Browse request
+
+        Return value:
+            missing_nodes       set     imported NodeIds without any reference
+    """
+    missing_nodes = set(_node_ids)
+    node_references = {}
+    browse_results = await browse_batched(
+        _session= _server.iserver.isession,
+        _node_ids= _node_ids,
+        _reference_type= ua.ObjectIds.Null,
+        _direction= ua.BrowseDirection.Both,
+        _batch_size= _batch_size
+    )
+    for node_id, references in zip(_node_ids, browse_results):
+        for reference in references:
+            missing_nodes.discard(node_id)
+            missing_nodes.discard(reference.NodeId)
+            if reference.ReferenceTypeId.NamespaceIndex != 0 or reference.ReferenceTypeId.Identifier not in UNIDIRECTIONAL_TYPES:
+                node_references[(node_id, reference.NodeId, reference.ReferenceTypeId)] = reference
+    for node_id in missing_nodes:
+        logger.warning("Node %s has no references, so it does not exist in Server!", node_id)
+
+    # Reverse references grouped by their source node
+    reverse_references = {}
+    for (source_node_id, target_node_id, reference_type), reference in node_references.items():
+        if (target_node_id, source_node_id, reference_type) not in node_references:
+            reverse_references.setdefault(target_node_id, []).append(ua.AddReferencesItem(
+                SourceNodeId= target_node_id,
+                TargetNodeId= source_node_id,
+                ReferenceTypeId= reference_type,
+                IsForward= not reference.IsForward
+            ))
+
+    address_space = _server.iserver.aspace
+    node_management = _server.iserver.node_mgt_service
+    user = User(role= UserRole.Admin)
+    for source_node_id, items in reverse_references.items():
+        source = address_space.get(source_node_id)
+        if source is None:
+            _importer.refs.extend(items)
+            continue
+        existing = {(reference.ReferenceTypeId, reference.NodeId): reference.IsForward for reference in source.references}
+        # Every reference is added to an empty list, so the address space does not scan the existing ones.
+        # The original list is restored with the new references also if adding fails with an exception
+        references, new_references = source.references, []
+        try:
+            for item in items:
+                is_forward = existing.get((item.ReferenceTypeId, item.TargetNodeId))
+                if is_forward is None:
+                    source.references = []
+                    try:
+                        status = node_management._add_reference(item, user)
+                    finally:
+                        new_references += source.references
+                elif is_forward != item.IsForward:
+                    logger.error("Cannot add conflicting reference %s ", item)
+                    status = ua.StatusCode(ua.StatusCodes.BadReferenceNotAllowed)
+                else:
+                    continue
+                if not status.is_good():
+                    _importer.refs.append(item)
+        finally:
+            source.references = references + new_references
+    return missing_nodes
@@ -0,0 +1 @@
+from .snapshot import hash_source_files, write_snapshot, read_snapshot, install_snapshot, restore_namespaces, load_snapshot_nodes
@@ -0,0 +1,245 @@
+"""
+Snapshot stores a built asyncua address space in a binary file, so a server restart does not have to
+generate the standard address space and import the json config or the NodeSet2 XML design model again.
+
+A snapshot holds every node of the address space as its own pickled record (NodeId, attribute values
+and references). On restart only the record table is read, the records are unpickled when a node is
+accessed the first time, the rest is unpickled in the background after the server has started.
+
+Rules:
+• A snapshot is valid for one content hash of its source files, see hash_source_files(). A snapshot
+  with another hash, another format or another asyncua version is ignored and has to be rebuilt.
+• Method callbacks and value callbacks are not stored, they are bound again by the server and the
+  application after the snapshot is loaded.
+• Snapshots are pickle files, only load snapshots which were written by this application.
+• A snapshot replaces private parts of asyncua: InternalServer.load_standard_address_space() and the
+  node table AddressSpace._nodes. The records are pickled asyncua NodeData objects, so a snapshot is
+  only read by the asyncua version which wrote it. The supported version is pinned in requirements.txt,
+  tests/test_snapshot.py compares a snapshot start with a normal start and has to pass before asyncua
+  is updated.
+"""
+
+import os
+import pickle
+import asyncio
+import hashlib
+import itertools
+import collections.abc
+
+from importlib import metadata
+
+from asyncua import ua
+from asyncua.server.address_space import AttributeValue, NodeData
+
+SNAPSHOT_FORMAT = 1
+DEFAULT_CHUNK_SIZE = 100
+
+
+class _SnapshotNodes(collections.abc.MutableMapping):
+    """ Node table of an address space which unpickles snapshot records on first access """
+
+    def __init__(self, _records: dict) -> None:
+        self.cache = {}                                         # NodeId -> NodeData, loaded nodes
+        self.records = _records                                 # NodeId -> pickled NodeData, not loaded yet
+
+    def __getitem__(self, _node_id: ua.NodeId) -> NodeData:
+        try:
+            return self.cache[_node_id]
+        except KeyError:
+            node = self.cache[_node_id] = pickle.loads(self.records.pop(_node_id))
+            return node
+
+    def get(self, _node_id: ua.NodeId, _default: object = None) -> NodeData:
+        node = self.cache.get(_node_id)
+        if node is None and _node_id in self.records:
+            node = self.cache[_node_id] = pickle.loads(self.records.pop(_node_id))
+        return node if node is not None else _default
+
+    def __setitem__(self, _node_id: ua.NodeId, _node: NodeData) -> None:
+        self.records.pop(_node_id, None)
+        self.cache[_node_id] = _node
+
+    def __contains__(self, _node_id: object) -> bool:
+        return _node_id in self.cache or _node_id in self.records
+
+    def __delitem__(self, _node_id: ua.NodeId) -> None:
+        if self.records.pop(_node_id, None) is None:
+            del self.cache[_node_id]
+
+    def __iter__(self):
+        yield from list(self.cache)
+        yield from list(self.records)
+
+    def __len__(self) -> int:
+        return len(self.cache) + len(self.records)
+
+
+def _asyncua_version() -> str:
+    """ Installed asyncua version, "unknown" if it is not installed as a package """
+    try:
+        return metadata.version("asyncua")
+    except metadata.PackageNotFoundError:
+        return "unknown"
+
+
+@staticmethod
+def hash_source_files(_files: list, _salt: str = "") -> str:
+    """ Content hash of the source files of a snapshot """
+
+    """
+        Attributes:
+            _files              list    paths of the source files, missing files are hashed as missing
+            _salt               str     further text which invalidates the snapshot, e.g. the build mode
+
+        Return value:
+            source_hash         str     sha256 hex digest
+    """
+    digest = hashlib.sha256(f"{SNAPSHOT_FORMAT}|{_asyncua_version()}|{_salt}".encode())
+    for file in _files:
+        digest.update(os.path.basename(file).encode())
+        if not os.path.isfile(file):
+            digest.update(b"<missing>")
+            continue
+        with open(file, "rb") as source_file:
+            for block in iter(lambda: source_file.read(1 << 20), b""):
+                digest.update(block)
+    return digest.hexdigest()
+
+@staticmethod
+async def write_snapshot(_server: object, _file: str, _source_hash: str, _data: dict = None) -> int:
+    """ Write the address space of the server to a snapshot file """
+
+    """
+        Attributes:
+            _server             obj     asyncua Server with the built address space
+            _file               str     snapshot file, written atomically
+            _source_hash        str     hash_source_files() of the sources the address space was built from
+            _data               dict    optional application data stored with the snapshot, must be picklable
+
+        Return value:
+            nodes               int     number of stored nodes
+    """
+    address_space = _server.iserver.aspace
+    records = {}
+    data_types = False
+    for node_id in list(address_space.keys()):
+        node = address_space.get(node_id)
+        # Store the plain node without callbacks
+        record = NodeData(node.nodeid)
+        record.attributes = {attribute: AttributeValue(value.value) for attribute, value in node.attributes.items()}
+        record.references = list(node.references)
+        records[node_id] = pickle.dumps(record, pickle.HIGHEST_PROTOCOL)
+        if node_id.NamespaceIndex != 0 and not data_types:
+            node_class = node.attributes.get(ua.AttributeIds.NodeClass)
+            data_types = node_class is not None and node_class.value.Value.Value == ua.NodeClass.DataType
+
+    snapshot = {
+        "format": SNAPSHOT_FORMAT,
+        "asyncua_version": _asyncua_version(),
+        "source_hash": _source_hash,
+        "namespace_array": await _server.get_namespace_array(),
+        "data_types": data_types,
+        "data": _data or {},
+        "records": records
+    }
+    os.makedirs(os.path.dirname(os.path.abspath(_file)), exist_ok=True)
+    temporary_file = f"{_file}.tmp"
+    with open(temporary_file, "wb") as snapshot_file:
+        pickle.dump(snapshot, snapshot_file, pickle.HIGHEST_PROTOCOL)
+    os.replace(temporary_file, _file)
+    return len(records)
+
+@staticmethod
+def read_snapshot(_file: str, _source_hash: str) -> dict:
+    """ Read a snapshot file, None if it is missing, unreadable, built from other sources or by another asyncua version """
+
+    """
+        Attributes:
+            _file               str     snapshot file
+            _source_hash        str     expected hash_source_files() of the current sources
+
+        Return value:
+            snapshot            dict    snapshot with "namespace_array", "data_types", "data" and "records"
+    """
+    if not os.path.isfile(_file):
+        return None
+    try:
+        with open(_file, "rb") as snapshot_file:
+            snapshot = pickle.load(snapshot_file)
+    except (OSError, EOFError, pickle.UnpicklingError, AttributeError, ImportError):
+        return None
+    if not isinstance(snapshot, dict) or snapshot.get("format") != SNAPSHOT_FORMAT or snapshot.get("source_hash") != _source_hash:
+        return None
+    if snapshot.get("asyncua_version") != _asyncua_version():
+        return None
+    return snapshot
+
+@staticmethod
+def install_snapshot(_server: object, _snapshot: dict) -> int:
+    """ Let the server load its address space from the snapshot instead of generating it """
+
+    """
+        Must be called before Server.init(). The standard address space of the server is replaced
+        by the snapshot nodes, Server.init() binds the callbacks and writes the server status again.
+
+        Attributes:
+            _server             obj     asyncua Server, not initialised
+            _snapshot           dict    snapshot from read_snapshot()
+
+        Return value:
+            int                 1, -1 if this asyncua version has no replaceable standard address space
+    """
+    internal_server = _server.iserver
+    if not hasattr(internal_server, "load_standard_address_space") or not hasattr(internal_server.aspace, "_nodes"):
+        return -1
+
+    async def _load_address_space(_shelf_file: object = None) -> None:
+        internal_server.aspace._nodes = _SnapshotNodes(_records= _snapshot["records"])
+
+    internal_server.load_standard_address_space = _load_address_space
+    return 1
+
+@staticmethod
+async def restore_namespaces(_server: object, _snapshot: dict) -> int:
+    """ Register the namespaces of the snapshot again, Server.init() resets the namespace array """
+
+    """
+        Attributes:
+            _server             obj     asyncua Server, initialised from the snapshot
+            _snapshot           dict    snapshot from read_snapshot()
+
+        Return value:
+            int                 1 if every namespace has its index of the snapshot, else -1
+    """
+    for index, uri in enumerate(_snapshot["namespace_array"]):
+        if await _server.register_namespace(uri) != index:
+            return -1
+    if _snapshot["data_types"]:
+        await _server.load_data_type_definitions()
+    return 1
+
+@staticmethod
+async def load_snapshot_nodes(_server: object, _chunk_size: int = DEFAULT_CHUNK_SIZE) -> int:
+    """ Unpickle the nodes which were not accessed yet, chunk by chunk between other tasks """
+
+    """
+        Attributes:
+            _server             obj     asyncua Server, initialised from the snapshot
+            _chunk_size         int     nodes unpickled before other tasks may run
+
+        Return value:
+            nodes               int     number of nodes unpickled
+    """
+    address_space = _server.iserver.aspace
+    nodes = address_space._nodes
+    if not isinstance(nodes, _SnapshotNodes):
+        return 0
+    count = 0
+    while nodes.records:
+        for node_id in list(itertools.islice(nodes.records, _chunk_size)):
+            nodes.get(node_id)
+            count += 1
+        await asyncio.sleep(0)
+    # All nodes are loaded, the plain dict is faster for every later access
+    address_space._nodes = nodes.cache
+    return count
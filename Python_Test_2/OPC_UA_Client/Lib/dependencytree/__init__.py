@@ -1 +1,2 @@
-from .dependencytree import dependencytree_print
\ No newline at end of file
+from .dependencytree import dependencytree_print, dependencytree_lines, compacttree_print, compacttree_lines
+from .compacttree import CompactTree
\ No newline at end of file
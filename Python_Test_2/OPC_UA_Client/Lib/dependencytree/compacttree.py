@@ -0,0 +1,185 @@
+"""
+Compact Tree stores a dependency tree in parallel array columns instead of padded lists.
+
+Every node is one row, the rows are kept in depth first order like the rows of the tree list
+([None] * level + [id]) of dependencytree. A row needs a few bytes per column, independent
+of its depth, and every name or information text is stored once in a string table.
+
+Rules:
+• The first row is the root with depth 0.
+• A row is a child of the last row one level higher, a child is always one level deeper than its parent.
+• Numeric ids are stored directly, string ids are stored in the string table.
+• The children of a row are found from its first child (the next row) and the next sibling column,
+  so a subtree can be walked without indexing the whole tree.
+• find() looks ids up in a dict of the first row per id, it does not scan the id column.
+• from_lists() and to_lists() convert from and to the tree list and name lists of dependencytree.
+• Lib/dependencytree and OPC_UA_Client/Lib/dependencytree hold the same files, a change has to be
+  copied to both folders.
+
+Example:
+tree = CompactTree()
+tree.append(_id= 85, _depth= 0, _name= "root folder")
+tree.append(_id= 1001, _depth= 1, _name= "sub folder1")
+tree.append(_id= 1002, _depth= 2, _name= "sub sub folder2")
+dependencytree.compacttree_print(_tree= tree, _names_only= True)
+"""
+
+from array import array
+
+
+class CompactTree:
+    """ Tree with one row per node in parallel id and depth columns and a string table """
+
+    def __init__(self) -> None:
+        self.ids = array("q")                                   # numeric id, string ids as -(string index + 1)
+        self.depths = array("I")                                # level of the row, 0 for the root
+        self.next_siblings = array("i")                         # row of the next child of the same parent, -1 for the last child
+        self.names = array("i")                                 # string index of the name, -1 if none
+        self.information = array("i")                           # string index of the information text, -1 if none
+        self.strings: list = []                                 # string table
+        self.string_index: dict = {}                            # string -> index in the string table
+        self.last_at_depth = array("i")                         # last appended row per depth, parent of the next deeper row
+        self.rows: dict = {}                                    # stored id -> first row with this id
+
+    def append(self, _id: object, _depth: int, _name: str = None, _information: str = None) -> int:
+        """
+        Append a node after the last row.
+
+        Args:
+            _id: Id of the node (int or str).
+            _depth: Level of the node, at most one level deeper than the last row.
+            _name: Optional name of the node.
+            _information: Optional information text of the node.
+
+        Returns:
+            int: Row of the node, -1 if the depth does not fit to the last row.
+        """
+        if _depth > len(self.last_at_depth) or (_depth == 0 and self.ids):
+            return -1
+        row = len(self.ids)
+        value = _id if isinstance(_id, int) else -(self._intern(_id) + 1)
+        self.ids.append(value)
+        self.rows.setdefault(value, row)
+        self.depths.append(_depth)
+        self.next_siblings.append(-1)
+        if _depth < len(self.last_at_depth):
+            # The last row on this level has the same parent, deeper rows were removed by a shallower row
+            self.next_siblings[self.last_at_depth[_depth]] = row
+        self.names.append(self._intern(_name) if _name is not None else -1)
+        self.information.append(self._intern(_information) if _information is not None else -1)
+        del self.last_at_depth[_depth:]
+        self.last_at_depth.append(row)
+        return row
+
+    def get_id(self, _row: int) -> object:
+        """ Id of a row """
+        value = self.ids[_row]
+        return value if value >= 0 else self.strings[-value - 1]
+
+    def get_name(self, _row: int) -> str:
+        """ Name of a row, None if it has no name """
+        index = self.names[_row]
+        return self.strings[index] if index >= 0 else None
+
+    def get_information(self, _row: int) -> str:
+        """ Information text of a row, None if it has no information """
+        index = self.information[_row]
+        return self.strings[index] if index >= 0 else None
+
+    def get_first_child(self, _row: int) -> int:
+        """ Row of the first child of a row, -1 if it has no children """
+        child = _row + 1
+        if child < len(self.ids) and self.depths[child] == self.depths[_row] + 1:
+            return child
+        return -1
+
+    def get_children(self, _row: int) -> list:
+        """
+        Rows of the children of a row in tree order.
+
+        Args:
+            _row: Row of the parent.
+
+        Returns:
+            list: Child rows.
+        """
+        children = []
+        child = self.get_first_child(_row)
+        while child >= 0:
+            children.append(child)
+            child = self.next_siblings[child]
+        return children
+
+    def find(self, _id: object) -> int:
+        """
+        Row of a node id.
+
+        Args:
+            _id: Id of the node (int or str).
+
+        Returns:
+            int: First row with this id, -1 if the id is not in the tree.
+        """
+        if isinstance(_id, int):
+            value = _id
+        elif _id in self.string_index:
+            value = -(self.string_index[_id] + 1)
+        else:
+            return -1
+        return self.rows.get(value, -1)
+
+    def clear(self) -> None:
+        """ Remove all rows and strings """
+        self.__init__()
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    @classmethod
+    def from_lists(cls, _tree: list, _object_names: list = [], _information: list = []) -> "CompactTree":
+        """
+        Import a tree list and [id, text] lists of dependencytree.
+
+        Args:
+            _tree: Tree list, one [None] * level + [id] row per node.
+            _object_names: [id, name] entries.
+            _information: [id, information text] entries.
+
+        Returns:
+            CompactTree: The imported tree, rows which do not fit to their parent are skipped.
+        """
+        names_lookup = {item[0]: item[1] for item in _object_names}
+        information_lookup = {item[0]: item[1] for item in _information}
+        tree = cls()
+        for row in _tree:
+            node_id = row[-1]
+            tree.append(_id= node_id, _depth= len(row) - 1, _name= names_lookup.get(node_id), _information= information_lookup.get(node_id))
+        return tree
+
+    def to_lists(self) -> tuple:
+        """
+        Export the tree list and [id, text] lists of dependencytree.
+
+        Returns:
+            tuple: (tree list, [id, name] list, [id, information text] list).
+        """
+        tree = []
+        object_names = []
+        information = []
+        for row in range(len(self.ids)):
+            node_id = self.get_id(row)
+            tree.append([None] * self.depths[row] + [node_id])
+            if self.names[row] >= 0:
+                object_names.append([node_id, self.strings[self.names[row]]])
+            if self.information[row] >= 0:
+                information.append([node_id, self.strings[self.information[row]]])
+        return tree, object_names, information
+
+    def _intern(self, _text: str) -> int:
+        """ Index of a string in the string table, it is added if it is new """
+        index = self.string_index.get(_text)
+        if index is None:
+            index = len(self.strings)
+            self.strings.append(_text)
+            self.string_index[_text] = index
+        return index
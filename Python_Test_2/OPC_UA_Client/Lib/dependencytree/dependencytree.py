@@ -37,6 +37,13 @@ This tree creates the output
     └─ 1008
         └─ 1009
 
+compacttree_print and compacttree_lines do the same for a CompactTree (compacttree.py), which
+stores the tree and the names in array columns instead of the lists below.
+
+dependencytree_print writes the tree to a text stream (default sys.stdout) in buffered chunks,
+dependencytree_lines returns a generator of the lines. Both work without recursion, so the
+depth of the tree is not limited by the recursion limit.
+
 The name list contains the ids combinded with the objcet name.
 The name string can contain a name or a hole sentence.
 
@@ -60,8 +67,11 @@ Example name list (_object_names):
 
 """
 
+import sys
+import bisect
+
 @staticmethod
-def dependencytree_print(_tree: list = [], _object_names: list = [], _add_names: bool = False, _names_only: bool = False) -> int:
+def dependencytree_print(_tree: list = [], _object_names: list = [], _add_names: bool = False, _names_only: bool = False, _stream: object = None) -> int:
     """ Print tree function """
     
     """
@@ -70,6 +80,7 @@ def dependencytree_print(_tree: list = [], _object_names: list = [], _add_names:
             _objcet_names       list    contains the name for every object
             _add_names          bool    if True, prints the id and the name
             _names_only         bool    if True, prints only the name, overrieds _add_names
+            _stream             object  text stream the tree is written to, e.g. an open file, None writes to sys.stdout
 
         Return value:
             int 
@@ -79,9 +90,112 @@ def dependencytree_print(_tree: list = [], _object_names: list = [], _add_names:
     children = _get_all_children(_tree= _tree)
 
     # Print tree
-    _print_tree(_tree= _tree, _children= children, _object_names= _object_names, _add_names= _add_names, _names_only= _names_only)
+    _print_tree(_tree= _tree, _children= children, _object_names= _object_names, _add_names= _add_names, _names_only= _names_only, _stream= _stream)
     return 1
 
+@staticmethod
+def dependencytree_lines(_tree: list = [], _object_names: list = [], _add_names: bool = False, _names_only: bool = False):
+    """ Tree lines generator function """
+    
+    """
+        Attributes:             
+            _tree               list    contains the tree shape, information about the heritage
+            _objcet_names       list    contains the name for every object
+            _add_names          bool    if True, prints the id and the name
+            _names_only         bool    if True, prints only the name, overrieds _add_names
+
+        Return value:
+            generator                   yields one line (str, without line break) per node
+    """
+
+    # Get the children list
+    children = _get_all_children(_tree= _tree)
+
+    # Generate the lines
+    yield from _iter_tree_lines(_tree= _tree, _children= children, _object_names= _object_names, _add_names= _add_names, _names_only= _names_only)
+
+@staticmethod
+def compacttree_print(_tree: object, _information: bool = False, _add_names: bool = False, _names_only: bool = False, _stream: object = None, _root_id: object = None, _max_depth: int = None, _max_nodes: int = None) -> int:
+    """ Print compact tree function """
+    
+    """
+        Attributes:             
+            _tree               obj     CompactTree, see compacttree.py
+            _information        bool    if True, the information texts are printed instead of the names
+            _add_names          bool    if True, prints the id and the name
+            _names_only         bool    if True, prints only the name, overrieds _add_names
+            _stream             object  text stream the tree is written to, e.g. an open file, None writes to sys.stdout
+            _root_id            int     id of the first printed node, None prints from the root of the tree
+            _max_depth          int     levels printed below the first node, None prints all levels
+            _max_nodes          int     maximum number of printed nodes, None prints all nodes
+
+        Return value:
+            int                         1, -1 if _root_id is not in the tree
+    """
+    root = _tree.find(_root_id) if _root_id is not None else 0
+    if root < 0:
+        return -1
+    lines = compacttree_lines(_tree= _tree, _information= _information, _add_names= _add_names, _names_only= _names_only, _root_id= _root_id, _max_depth= _max_depth, _max_nodes= _max_nodes)
+    return _write_lines(_lines= lines, _stream= _stream)
+
+@staticmethod
+def compacttree_lines(_tree: object, _information: bool = False, _add_names: bool = False, _names_only: bool = False, _root_id: object = None, _max_depth: int = None, _max_nodes: int = None):
+    """ Compact tree lines generator function """
+    
+    """
+        Attributes:             
+            _tree               obj     CompactTree, see compacttree.py
+            _information        bool    if True, the information texts are printed instead of the names
+            _add_names          bool    if True, prints the id and the name
+            _names_only         bool    if True, prints only the name, overrieds _add_names
+            _root_id            int     id of the first printed node, None prints from the root of the tree
+            _max_depth          int     levels printed below the first node, None prints all levels
+            _max_nodes          int     maximum number of printed nodes, None prints all nodes,
+                                        a last line "..." marks that nodes were left out
+
+        Return value:
+            generator                   yields one line (str, without line break) per node
+    """
+    
+    vertical = "│"
+    branch_middle = "├"
+    branch_last = "└"
+    horizontal = "─"
+
+    if not len(_tree):
+        return
+    root = _tree.find(_root_id) if _root_id is not None else 0
+    if root < 0:
+        return
+
+    get_label = _tree.get_information if _information else _tree.get_name
+    next_siblings = _tree.next_siblings
+
+    def _text_of(_row) -> str:
+        label = get_label(_row)
+        return _create_object_print(_id= _tree.get_id(_row), _name= "" if label is None else label, _add_names= _add_names, _names_only= _names_only)
+
+    # Only the visited rows are touched, a node pushes its next sibling and its first child.
+    # Stack of (row, level below the first node, prefix of the lines of the parents children)
+    yield _text_of(root)
+    printed = 1
+    first_child = _tree.get_first_child(root)
+    stack = [(first_child, 1, "")] if first_child >= 0 and (_max_depth is None or _max_depth >= 1) else []
+    while stack:
+        if _max_nodes is not None and printed >= _max_nodes:
+            yield stack[-1][2] + "..."
+            return
+        row, level, prefix = stack.pop()
+        is_last = next_siblings[row] < 0
+        yield prefix + (branch_last if is_last else branch_middle) + horizontal + _text_of(row)
+        printed += 1
+
+        if not is_last:
+            stack.append((next_siblings[row], level, prefix))
+        first_child = _tree.get_first_child(row)
+        if first_child >= 0 and (_max_depth is None or level < _max_depth):
+            stack.append((first_child, level + 1, prefix + ("    " if is_last else vertical + "   ")))
+
 @staticmethod
 def _get_all_children (_tree) -> list:
         """ Find all "close" children """
@@ -93,7 +207,6 @@ def _get_all_children (_tree) -> list:
             Return value:
                 children            list    list of close children 
         """
-        n = len(_tree)
         result = []
         last_seen = []
 
@@ -109,16 +222,24 @@ def _get_all_children (_tree) -> list:
             parent = last_seen[len(row)-2] if len(row) > 1 else None
             parents.append(parent)
 
-        # Collect children
+        # Group the rows by their parent id in one pass, the rows stay in tree order
+        children_by_parent = {}
+        for j, parent in enumerate(parents):
+            if parent is not None:
+                children_by_parent.setdefault(parent, []).append(j)
+
+        # Collect children, only rows after the parent belong to it (an id can appear more than once)
         ids = [row[-1] for row in _tree]
         for idx, id_ in enumerate(ids):
-            children = [j for j in range(idx+1, n) if parents[j] == id_]
+            children = children_by_parent.get(id_, [])
+            if children and children[0] <= idx:
+                children = children[bisect.bisect_right(children, idx):]
             result.append([idx] + children)
 
         return result
 
 @staticmethod
-def _print_tree(_tree: list = [], _children: list = [], _object_names: list = [], _add_names: bool = False, _names_only: bool = False) -> int:
+def _print_tree(_tree: list = [], _children: list = [], _object_names: list = [], _add_names: bool = False, _names_only: bool = False, _stream: object = None, _chunk_lines: int = 1000) -> int:
     """ Print the tree  """
     
     """
@@ -128,53 +249,101 @@ def _print_tree(_tree: list = [], _children: list = [], _object_names: list = []
             _objcet_names       list    contains the name for every object
             _add_names          bool    if True, prints the id and the name
             _names_only         bool    if True, prints only the name, overrieds _add_names
+            _stream             object  text stream the tree is written to, None writes to sys.stdout
+            _chunk_lines        int     number of lines joined to one write call
 
         Return value:
             int 
     """
+    lines = _iter_tree_lines(_tree= _tree, _children= _children, _object_names= _object_names, _add_names= _add_names, _names_only= _names_only)
+    return _write_lines(_lines= lines, _stream= _stream, _chunk_lines= _chunk_lines)
+
+@staticmethod
+def _write_lines(_lines: object, _stream: object = None, _chunk_lines: int = 1000) -> int:
+    """ Write lines in buffered chunks """
     
-    vertical = "│"
-    branch_middle = "├"
-    branch_last = "└"
-    horizontal = "─"
-    prefix=""
+    """
+        Attributes:             
+            _lines              iter    printable lines without line break
+            _stream             object  text stream the lines are written to, None writes to sys.stdout
+            _chunk_lines        int     number of lines joined to one write call
 
-    ids = [row[-1] for row in _tree]
-    names_lookup = {item[0]: item[1] for item in _object_names}
+        Return value:
+            int 
+    """
+    stream = sys.stdout if _stream is None else _stream
+    chunk = []
+    for line in _lines:
+        chunk.append(line)
+        if len(chunk) >= _chunk_lines:
+            stream.write("\n".join(chunk) + "\n")
+            chunk.clear()
+    if chunk:
+        stream.write("\n".join(chunk) + "\n")
+    return 1
 
-    def _print_node(_idx, _prefix_parts= []) -> None:
-        """ Creates one node """
+@staticmethod
+def _iter_tree_lines(_tree: list = [], _children: list = [], _object_names: list = [], _add_names: bool = False, _names_only: bool = False):
+    """ Generate the lines of a tree list """
     
-        """
-            Attributes:             
-                _idx                int     current node index
-                _prefix_parts       list    contains the tree elements
+    """
+        Attributes:             
+            _tree               list    contains the tree shape, information about the heritage
+            _children           list    contains the infomration about the closesed children
+            _objcet_names       list    contains the name for every object
+            _add_names          bool    if True, prints the id and the name
+            _names_only         bool    if True, prints only the name, overrieds _add_names
 
-            Return value:
-                None 
-        """
+        Return value:
+            line                str     one printable line per node, without line break
+    """
+    if not _tree:
+        return
+
+    ids = [row[-1] for row in _tree]
+    names_lookup = {item[0]: item[1] for item in _object_names}
+
+    def _text_of(_idx) -> str:
         node_id = ids[_idx]
-        node_name = names_lookup.get(node_id, "")
-        text = _create_object_print(_id= node_id, _name= node_name, _add_names= _add_names, _names_only= _names_only)
+        return _create_object_print(_id= node_id, _name= names_lookup.get(node_id, ""), _add_names= _add_names, _names_only= _names_only)
 
-        prefix = ""
-        for i, has_vertical in enumerate(_prefix_parts[:-1]):
-            prefix += vertical + "   " if has_vertical else "    "
+    yield from _iter_lines(_root= 0, _children_of= lambda _idx: _children[_idx][1:], _text_of= _text_of)
 
-        if _prefix_parts:
-            connector = branch_last + horizontal*1 if not _prefix_parts[-1] else branch_middle + horizontal*1
-            prefix += connector
+@staticmethod
+def _iter_lines(_root: int, _children_of: object, _text_of: object):
+    """ Generate the tree lines depth first without recursion """
+    
+    """
+        Attributes:             
+            _root               int     index of the first printed node
+            _children_of        func    returns the child indexes of a node index in tree order
+            _text_of            func    returns the text of a node index
 
-        print(prefix + text)
+        Return value:
+            line                str     one printable line per node, without line break
+    """
+    
+    vertical = "│"
+    branch_middle = "├"
+    branch_last = "└"
+    horizontal = "─"
 
-        children_idx = _children[_idx][1:]
-        n = len(children_idx)
-        for i, child in enumerate(children_idx):
-            is_middle = (i != n - 1)
-            _print_node(child, _prefix_parts + [is_middle])
+    # Stack of (node index, prefix of its line, prefix of the lines of its children)
+    # Siblings share their prefix strings, a prefix is only built once per parent
+    stack = [(_root, "", "")]
+    while stack:
+        idx, prefix, children_prefix = stack.pop()
+        yield prefix + _text_of(idx)
 
-    # Start printing
-    _print_node(0)
+        children_idx = _children_of(idx)
+        if not children_idx:
+            continue
+        middle = (children_prefix + branch_middle + horizontal, children_prefix + vertical + "   ")
+        last = (children_prefix + branch_last + horizontal, children_prefix + "    ")
+        # Pushed in reverse, the first child is printed next
+        stack.append((children_idx[-1],) + last)
+        for child in reversed(children_idx[:-1]):
+            stack.append((child,) + middle)
 
 @staticmethod
 def _create_object_print(_id: int = 0, _name: str = None, _add_names: bool = False, _names_only: bool = False) -> str:
@@ -1 +1,6 @@
-from .asyncua_client import OPCUAClient
\ No newline at end of file
+from .asyncua_client import OPCUAClient
+from .asyncua_node_registry import NodeRegistry, LoadedNode
+from .asyncua_subscription import OPCUASubscription
+from .asyncua_client_pool import OPCUAClientPool
+from .asyncua_value_cache import ValueCache
+from .asyncua_publisher import OPCUAPublisher
\ No newline at end of file
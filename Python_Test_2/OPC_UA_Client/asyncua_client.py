@@ -1,9 +1,42 @@
 import asyncio
 import os
 import json
+import time
+import uuid
+import random
+import contextlib
 
+from datetime import datetime
 from pathlib import Path
-from asyncua import Client
+from asyncua import Client, Node, ua
+from asyncua.common.ua_utils import data_type_to_variant_type
+from Lib.addressspace import read_attribute_batched, write_attribute_batched, walk_address_space, CountingSession, DEFAULT_BATCH_SIZE
+from .asyncua_node_registry import NodeRegistry
+from .asyncua_subscription import OPCUASubscription
+from .asyncua_client_pool import OPCUAClientPool, is_connection_error
+from .asyncua_value_cache import ValueCache
+
+# Python types accepted for a VariantType, types without entry are not checked locally
+PYTHON_TYPES = {
+    ua.VariantType.Boolean: (bool,),
+    ua.VariantType.SByte: (int,),
+    ua.VariantType.Byte: (int,),
+    ua.VariantType.Int16: (int,),
+    ua.VariantType.UInt16: (int,),
+    ua.VariantType.Int32: (int,),
+    ua.VariantType.UInt32: (int,),
+    ua.VariantType.Int64: (int,),
+    ua.VariantType.UInt64: (int,),
+    ua.VariantType.Float: (float,),
+    ua.VariantType.Double: (float,),
+    ua.VariantType.String: (str,),
+    ua.VariantType.DateTime: (datetime,),
+    ua.VariantType.Guid: (uuid.UUID,),
+    ua.VariantType.ByteString: (bytes,),
+    ua.VariantType.LocalizedText: (ua.LocalizedText,),
+    ua.VariantType.QualifiedName: (ua.QualifiedName,),
+    ua.VariantType.NodeId: (ua.NodeId,),
+}
 
 class OPCUAClient:
     """
@@ -18,7 +51,15 @@ class OPCUAClient:
             _endpoint: str = "opc.tcp://192.168.50.52:4840/freeopcua/server/",
             _client_config_path: str = "client_config_files",
             _client_config_file: str = "client_config.json",
-            _use_config_file: bool = None
+            _use_config_file: bool = None,
+            _client_cache_path: str = "client_cache_files",
+            _client_cache_file: str = "browse_name_cache.json",
+            _use_cache_file: bool = True,
+            _auto_reconnect: bool = False,
+            _watchdog_interval: float = 1.0,
+            _reconnect_backoff_initial: float = 0.5,
+            _reconnect_backoff_max: float = 30.0,
+            _value_cache_size: int = 0
         ) -> None:
         """
         Initialize the OPC UA client with optional configuration file.
@@ -28,19 +69,52 @@ class OPCUAClient:
             _client_config_path: Directory where configuration files are stored.
             _client_config_file: JSON file name containing client configuration.
             _use_config_file: If True, load configuration from file instead of arguments.
+            _client_cache_path: Directory where the browse name cache is stored.
+            _client_cache_file: JSON file name of the browse name cache.
+            _use_cache_file: If True, resolved browse names are cached on disk per endpoint.
+            _auto_reconnect: If True, a lost connection is detected and restored with loaded nodes and subscriptions.
+            _watchdog_interval: Seconds between two connection checks in auto reconnect mode.
+            _reconnect_backoff_initial: First reconnect delay in seconds.
+            _reconnect_backoff_max: Maximum reconnect delay in seconds.
+            _value_cache_size: Nodes kept in the read cache for get_value(_max_age=...), 0 disables the cache.
         """
         # Core configuration
         self.endpoint = _endpoint
         self.client_config_path = _client_config_path
         self.client_config_file = _client_config_file
         self.use_config_file = _use_config_file
+        self.client_cache_path = _client_cache_path
+        self.client_cache_file = _client_cache_file
+        self.use_cache_file = _use_cache_file
+        self.auto_reconnect = _auto_reconnect
+        self.watchdog_interval = _watchdog_interval
+        self.reconnect_backoff_initial = _reconnect_backoff_initial
+        self.reconnect_backoff_max = _reconnect_backoff_max
         self.module_path = Path(__file__).parent                    # Get module path
 
         # Node tracking
         self.loadable_nodes: list = []      # Nodes defined in config file
-        self.loaded_nodes: list = []        # Nodes successfully connected to
+        self.loaded_nodes = NodeRegistry()  # Nodes successfully connected to, indexed by name and (ns, i)
         self.objects = None                 # Root 'Objects' node reference
         self.client: Client | None = None   # asyncua Client instance
+        self.startup_requests: int = 0      # Server requests of the last start_Client node resolution
+        self.max_nodes_per_read: int = None # Read chunk size, from the server OperationLimits on first use
+        self.max_nodes_per_write: int = None# Write chunk size, from the server OperationLimits on first use
+        self.data_type_cache: dict = {}     # DataType NodeId -> VariantType
+        self.subscriptions: list = []       # Active OPCUASubscription objects
+        self.namespace_array: list = None   # Namespace array of the server at connect
+        self.value_cache = ValueCache(_size= _value_cache_size) if _value_cache_size > 0 else None
+
+        # Auto reconnect
+        self.connected: bool = False                # Session is usable
+        self.reconnects: list = []                  # One metrics dict per restored connection
+        self._watchdog_task = None                  # Connection check in auto reconnect mode
+        self._reconnect_task = None                 # Running reconnect
+
+        # Browse name cache
+        self.browse_name_cache: dict = {}           # Browse name -> NodeId string of the current endpoint
+        self.cache_namespace_array: list = None     # Namespace array the cache was built with
+        self._cache_changed: bool = False           # Cache has entries which are not saved yet
 
         # Load from configuration file if enabled
         if self.use_config_file:
@@ -49,6 +123,7 @@ class OPCUAClient:
                 config_data = json.load(config_file)
                 self.endpoint = config_data.get("endpoint", self.endpoint)                      # Get endpoint
                 self.loadable_nodes = config_data.get("loadable_nodes", [])
+                self.auto_reconnect = config_data.get("auto_reconnect", self.auto_reconnect)
 
     # ---------------------------------------------------------------------- #
     # Connection management
@@ -63,16 +138,450 @@ class OPCUAClient:
         """
         self.client = Client(self.endpoint)
         await self.client.connect()
+        self.connected = True
         self.objects = self.client.nodes.objects
+        session = CountingSession(self.client.uaclient)
+        self.namespace_array = await self.read_namespace_array(_session= session)
+        if self.use_cache_file:
+            self.load_browse_name_cache()
+            await self.validate_browse_name_cache(_session= session)
         if self.loadable_nodes is not None:
-            i = 1
-            for loadable_node in self.loadable_nodes:
-                await self.add_node(_browse_name = loadable_node.get("browseName"), _identifier = loadable_node.get("i") , _namespace_index = loadable_node.get("i"))
+            await self.add_nodes(_loadable_nodes= self.loadable_nodes, _session= session)
+        if self.use_cache_file:
+            self.save_browse_name_cache()
+        self.startup_requests = session.requests
+        if self.auto_reconnect:
+            self._watchdog_task = asyncio.create_task(self._watchdog())
+
+    async def stop_Client(self) -> int:
+        """
+        Disconnect from the OPC UA server.
+
+        Returns:
+            int: 1 if disconnected, -1 if the client was not connected.
+        """
+        if self.client is None:
+            return -1
+        tasks = [task for task in (self._watchdog_task, self._reconnect_task) if task is not None]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions= True)
+        self._watchdog_task = self._reconnect_task = None
+        for subscription in list(self.subscriptions):
+            await self.unsubscribe(_subscription= subscription)
+        await self._close_client()
+        self.max_nodes_per_read = None
+        self.max_nodes_per_write = None
+        return 1
+
+    async def _close_client(self) -> None:
+        """ Close the asyncua client, errors of a dead connection are ignored """
+        self.connected = False
+        client, self.client = self.client, None
+        if client is None:
+            return
+        try:
+            await client.disconnect()
+        except Exception:
+            with contextlib.suppress(Exception):
+                client.disconnect_socket()
+
+    async def read_namespace_array(self, _session: object = None) -> list:
+        """
+        Read the namespace array of the server.
+
+        Args:
+            _session: Optional session the request is sent with, e.g. a CountingSession.
+
+        Returns:
+            list: Namespace URIs, the position is the namespace index.
+        """
+        data_value = (await read_attribute_batched(
+            _session= _session or self.client.uaclient,
+            _node_ids= [ua.NodeId(ua.ObjectIds.Server_NamespaceArray)]
+        ))[0]
+        return data_value.Value.Value
+
+    # ---------------------------------------------------------------------- #
+    # Auto reconnect
+    # ---------------------------------------------------------------------- #
+
+    def connection_lost(self) -> int:
+        """
+        Start the reconnect after a connection error, if auto reconnect is enabled.
+
+        Returns:
+            int: 1 if a reconnect is running, -1 if auto reconnect is disabled.
+        """
+        if not self.auto_reconnect or self.client is None:
+            return -1
+        self.connected = False
+        if self._reconnect_task is None or self._reconnect_task.done():
+            self._reconnect_task = asyncio.create_task(self._reconnect())
+        return 1
+
+    async def _watchdog(self) -> None:
+        """ Read the server state periodically, a failed read starts the reconnect """
+        while True:
+            await asyncio.sleep(self.watchdog_interval)
+            if not self.connected:
+                continue
+            try:
+                await self.client.nodes.server_state.read_value()
+            except Exception:
+                self.connection_lost()
+
+    async def _reconnect(self) -> None:
+        """ Reconnect with exponential backoff and restore the loaded nodes and subscriptions """
+        lost_at = time.time()
+        start_time = time.perf_counter()
+        print("Connection lost, reconnecting ...")
+        # Close the dead session, so its publish loop stops
+        with contextlib.suppress(Exception):
+            await asyncio.wait_for(self.client.disconnect(), self.watchdog_interval)
+        attempts = 0
+        delay = self.reconnect_backoff_initial
+        while True:
+            attempts += 1
+            client = Client(self.endpoint)
+            try:
+                await client.connect()
+                break
+            except Exception:
+                await asyncio.sleep(delay * random.uniform(0.5, 1.0))
+                delay = min(delay * 2, self.reconnect_backoff_max)
+        self.client = client
+        self.objects = self.client.nodes.objects
+        self.max_nodes_per_read = None
+        self.max_nodes_per_write = None
+        if self.value_cache is not None:
+            self.value_cache.clear()
+        self.connected = True
+
+        restored_nodes, lost_nodes = await self.restore_nodes()
+        restored_subscriptions = 0
+        for subscription in self.subscriptions:
+            if await subscription.restore(_client= self.client) > 0:
+                restored_subscriptions += 1
+        downtime = time.perf_counter() - start_time
+        self.reconnects.append({
+            "lost_at": lost_at,
+            "downtime": downtime,
+            "attempts": attempts,
+            "restored_nodes": restored_nodes,
+            "lost_nodes": lost_nodes,
+            "restored_subscriptions": restored_subscriptions
+        })
+        print(f"Reconnected after {downtime:.2f} s ({attempts} attempts), {restored_nodes} nodes and {restored_subscriptions} subscriptions restored")
+
+    async def restore_nodes(self) -> tuple:
+        """
+        Bind the loaded nodes to the new session without browsing again.
+
+        The Node objects stay the same, so handles returned by get_node() remain valid.
+        Namespace indices are mapped by their URI, if the namespace array of the server
+        changed. The NodeIds are verified with one batched BrowseName read, nodes which do
+        not exist any more are removed from loaded_nodes.
+
+        Returns:
+            tuple: (restored nodes, lost nodes)
+        """
+        namespace_array, old_namespace_array = await self.read_namespace_array(), self.namespace_array
+        self.namespace_array = namespace_array
+        index_map = {}
+        if namespace_array != old_namespace_array:
+            index_map = {
+                index: namespace_array.index(uri) if uri in namespace_array else None
+                for index, uri in enumerate(old_namespace_array or [])
+            }
+            self.data_type_cache.clear()
+            if self.use_cache_file:
+                await self.validate_browse_name_cache()
+
+        entries = list(self.loaded_nodes)
+        node_ids = []
+        for entry in entries:
+            namespace_index = index_map.get(entry.namespace_index, entry.namespace_index) if index_map else entry.namespace_index
+            node_ids.append(None if namespace_index is None else ua.NodeId(entry.identifier, namespace_index))
+        data_values = await read_attribute_batched(
+            _session= self.client.uaclient,
+            _node_ids= [node_id for node_id in node_ids if node_id is not None],
+            _attribute= ua.AttributeIds.BrowseName
+        )
+        data_values = iter(data_values)
+
+        restored = []
+        for entry, node_id in zip(entries, node_ids):
+            data_value = next(data_values) if node_id is not None else None
+            if data_value is None or not data_value.StatusCode.is_good() or data_value.Value.Value.Name != entry.browse_name:
+                print(f"Node lost after reconnect: browseName='{entry.browse_name}'")
+                continue
+            entry.node.session = self.client.uaclient
+            entry.node.nodeid = node_id
+            entry.namespace_index = node_id.NamespaceIndex
+            restored.append(entry)
+        self.loaded_nodes.rebuild(_entries= restored)
+        return len(restored), len(entries) - len(restored)
+
+    async def create_pool(self, _size: int = 4, _requests_per_session: int = 1, _health_interval: float = 10.0) -> OPCUAClientPool:
+        """
+        Open a pool of sessions to the endpoint of this client for concurrent tasks.
+
+        Args:
+            _size: Number of sessions.
+            _requests_per_session: Tasks which may use one session at the same time.
+            _health_interval: Seconds between two health checks of the idle sessions.
+
+        Returns:
+            OPCUAClientPool: The started pool, stop it with its stop() method.
+        """
+        pool = OPCUAClientPool(
+            _endpoint= self.endpoint,
+            _size= _size,
+            _requests_per_session= _requests_per_session,
+            _health_interval= _health_interval
+        )
+        await pool.start()
+        return pool
+
+    async def read_operation_limits(self) -> int:
+        """
+        Read the MaxNodesPerRead and MaxNodesPerWrite operation limits of the server in one request.
+        A server without limit (0) gets DEFAULT_BATCH_SIZE.
+
+        Returns:
+            int: 1 if successful, -1 if the client is not connected.
+        """
+        if self.client is None:
+            print("Client not connected.")
+            return -1
+        data_values = await read_attribute_batched(
+            _session= self.client.uaclient,
+            _node_ids= [
+                ua.NodeId(ua.ObjectIds.Server_ServerCapabilities_OperationLimits_MaxNodesPerRead),
+                ua.NodeId(ua.ObjectIds.Server_ServerCapabilities_OperationLimits_MaxNodesPerWrite)
+            ]
+        )
+        limits = [data_value.Value.Value if data_value.StatusCode.is_good() and data_value.Value is not None else 0 for data_value in data_values]
+        self.max_nodes_per_read = limits[0] or DEFAULT_BATCH_SIZE
+        self.max_nodes_per_write = limits[1] or DEFAULT_BATCH_SIZE
+        return 1
+
+    # ---------------------------------------------------------------------- #
+    # Browse name cache
+    # ---------------------------------------------------------------------- #
+
+    def load_browse_name_cache(self) -> int:
+        """
+        Load the cached browse names of the current endpoint from the cache file.
+
+        Returns:
+            int: 1 if cached browse names were loaded, -1 otherwise.
+        """
+        self.browse_name_cache = {}
+        self.cache_namespace_array = None
+        cache_path = os.path.join(self.module_path, self.client_cache_path, self.client_cache_file)
+        if not os.path.isfile(cache_path):
+            return -1
+        try:
+            with open(cache_path, "r") as cache_file:
+                cache_data = json.load(cache_file)
+        except (OSError, ValueError):
+            print(f"Browse name cache not readable: {cache_path}")
+            return -1
+        entry = cache_data.get(self.endpoint)
+        if entry is None:
+            return -1
+        self.browse_name_cache = entry.get("nodes", {})
+        self.cache_namespace_array = entry.get("namespace_array")
+        return 1
+
+    async def validate_browse_name_cache(self, _session: object = None) -> int:
+        """
+        Compare the namespace array of the server with the one the cache was built with.
+        A different namespace array invalidates all cached browse names of the endpoint.
+
+        Args:
+            _session: Optional session the request is sent with, e.g. a CountingSession.
+
+        Returns:
+            int: 1 if the cache is valid, -1 if it was cleared.
+        """
+        namespace_array = self.namespace_array
+        if namespace_array is None:
+            namespace_array = await self.read_namespace_array(_session= _session)
+        if namespace_array == self.cache_namespace_array:
+            return 1
+        if self.browse_name_cache:
+            print("Namespace array of the server changed, browse name cache cleared.")
+        self.browse_name_cache = {}
+        self.cache_namespace_array = namespace_array
+        self._cache_changed = True
+        return -1
+
+    def save_browse_name_cache(self) -> int:
+        """
+        Write the browse names of the current endpoint to the cache file,
+        entries of other endpoints are kept.
+
+        Returns:
+            int: 1 if the cache file was written, -1 if there was nothing to write.
+        """
+        if not self._cache_changed or self.cache_namespace_array is None:
+            return -1
+        cache_path = os.path.join(self.module_path, self.client_cache_path, self.client_cache_file)
+        cache_data = {}
+        if os.path.isfile(cache_path):
+            try:
+                with open(cache_path, "r") as cache_file:
+                    cache_data = json.load(cache_file)
+            except (OSError, ValueError):
+                cache_data = {}
+        cache_data[self.endpoint] = {"namespace_array": self.cache_namespace_array, "nodes": self.browse_name_cache}
+        os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+        with open(cache_path, "w") as cache_file:
+            json.dump(cache_data, cache_file, indent=4)
+        self._cache_changed = False
+        return 1
 
     # ---------------------------------------------------------------------- #
     # Node handling
     # ---------------------------------------------------------------------- #
 
+    async def add_nodes(self, _loadable_nodes: list, _session: object = None) -> int:
+        """
+        Add many node references at once, in configuration order.
+
+        Cached browse names and nodes given by namespace and identifier are verified
+        with one batched Read. All other browse names are matched during a single
+        breadth-first walk under 'Objects', which stops when every name is found.
+
+        Args:
+            _loadable_nodes: Node entries like in the config file,
+                             {"browseName": ..., "ns": ..., "i": ...}.
+            _session: Optional session the requests are sent with, e.g. a CountingSession.
+
+        Returns:
+            int: Number of added nodes, -1 if the client is not connected.
+        """
+        if self.client is None:
+            print("Client not connected.")
+            return -1
+        session = _session or self.client.uaclient
+
+        name_indices = {}       # browse name -> indices of the entries
+        id_indices = []         # indices of the entries given by ns and i
+        for index, loadable_node in enumerate(_loadable_nodes):
+            if loadable_node.get("browseName") is not None:
+                name_indices.setdefault(loadable_node["browseName"], []).append(index)
+            elif loadable_node.get("ns") is not None and loadable_node.get("i") is not None:
+                id_indices.append(index)
+            else:
+                print(f"Invalid node information provided: {loadable_node}")
+
+        # Verify cached browse names and read the browse names of ns/i entries in one request
+        cached_names = [name for name in name_indices if name in self.browse_name_cache]
+        cached_node_ids = [ua.NodeId.from_string(self.browse_name_cache[name]) for name in cached_names]
+        id_node_ids = [ua.NodeId(_loadable_nodes[index]["i"], _loadable_nodes[index]["ns"]) for index in id_indices]
+        data_values = []
+        if cached_node_ids or id_node_ids:
+            data_values = await read_attribute_batched(_session= session, _node_ids= cached_node_ids + id_node_ids, _attribute= ua.AttributeIds.BrowseName)
+
+        resolved = {}           # browse name -> NodeId
+        for name, node_id, data_value in zip(cached_names, cached_node_ids, data_values):
+            if data_value.StatusCode.is_good() and data_value.Value.Value.Name == name:
+                resolved[name] = node_id
+            else:
+                del self.browse_name_cache[name]
+                self._cache_changed = True
+
+        records = {}            # entry index -> (browse name, NodeId)
+        for index, node_id, data_value in zip(id_indices, id_node_ids, data_values[len(cached_names):]):
+            if data_value.StatusCode.is_good():
+                records[index] = (data_value.Value.Value.Name, node_id)
+            else:
+                print(f"Node not found: namespace={node_id.NamespaceIndex}, identifier={node_id.Identifier}")
+
+        # One walk for all remaining browse names
+        missing = set(name_indices) - set(resolved)
+        if missing:
+            # aclosing stops the walk and its Browse requests in flight when it is left early
+            async with contextlib.aclosing(walk_address_space(_session= session, _root_node_id= self.objects.nodeid)) as walk:
+                async for reference, _, _ in walk:
+                    name = reference.BrowseName.Name
+                    if name in missing:
+                        resolved[name] = reference.NodeId
+                        missing.discard(name)
+                        if self.use_cache_file:
+                            self.browse_name_cache[name] = reference.NodeId.to_string()
+                            self._cache_changed = True
+                        if not missing:
+                            break
+
+        for name, indices in name_indices.items():
+            if name not in resolved:
+                print(f"Node not found: browseName='{name}'")
+                continue
+            for index in indices:
+                records[index] = (name, resolved[name])
+
+        entries = []
+        for index in sorted(records):
+            name, node_id = records[index]
+            entries.append(self.loaded_nodes.add(name, node_id.NamespaceIndex, node_id.Identifier, self.client.get_node(node_id)))
+        await self.load_variant_types(_entries= entries, _session= session)
+        return len(records)
+
+    async def load_variant_types(self, _entries: list, _session: object = None) -> int:
+        """
+        Read the DataType of registered nodes in one batched request and cache their VariantType,
+        so writes are type checked locally. DataTypes which are no builtin type are resolved
+        once over their supertypes and kept in data_type_cache.
+
+        Args:
+            _entries: LoadedNode entries of the registry.
+            _session: Optional session the requests are sent with, e.g. a CountingSession.
+
+        Returns:
+            int: Number of entries with a VariantType.
+        """
+        entries = [entry for entry in _entries if entry.variant_type is None]
+        if not entries:
+            return 0
+        session = _session or self.client.uaclient
+        data_values = await read_attribute_batched(
+            _session= session,
+            _node_ids= [entry.node.nodeid for entry in entries],
+            _attribute= ua.AttributeIds.DataType
+        )
+        count = 0
+        for entry, data_value in zip(entries, data_values):
+            if not data_value.StatusCode.is_good() or data_value.Value is None:
+                continue                            # no variable
+            entry.variant_type = await self.get_variant_type(_data_type= data_value.Value.Value, _session= session)
+            count += 1
+        return count
+
+    async def get_variant_type(self, _data_type: ua.NodeId, _session: object = None) -> ua.VariantType:
+        """
+        VariantType to encode values of a DataType.
+
+        Args:
+            _data_type: NodeId of the DataType.
+            _session: Optional session the supertypes are browsed with, e.g. a CountingSession.
+
+        Returns:
+            VariantType of the DataType.
+        """
+        variant_type = self.data_type_cache.get(_data_type)
+        if variant_type is None:
+            if _data_type.NamespaceIndex == 0 and isinstance(_data_type.Identifier, int) and _data_type.Identifier <= 25 and _data_type.Identifier != ua.ObjectIds.BaseDataType:
+                variant_type = ua.VariantType(_data_type.Identifier)
+            else:
+                variant_type = await data_type_to_variant_type(Node(_session or self.client.uaclient, _data_type))
+            self.data_type_cache[_data_type] = variant_type
+        return variant_type
+
     async def add_node(
         self,
         _browse_name: str = None,
@@ -93,7 +602,8 @@ class OPCUAClient:
 
         async def find_node_by_name(_parent_node, _name_to_find):
             """
-            Recursively search for a node by its browse name.
+            Search for a node by its browse name, breadth first with batched Browse requests.
+            The browse names are part of the browse results, no extra read per node is needed.
 
             Args:
                 _parent_node: Parent node to search under.
@@ -102,14 +612,34 @@ class OPCUAClient:
             Returns:
                 Node object if found, else None.
             """
-            children = await _parent_node.get_children()
-            for child in children:
-                bname = await child.read_browse_name()
-                if bname.Name == _name_to_find:
-                    return child
-                result = await find_node_by_name(child, _name_to_find)
-                if result is not None:
-                    return result
+            async with contextlib.aclosing(walk_address_space(_session= _parent_node.session, _root_node_id= _parent_node.nodeid)) as walk:
+                async for reference, _, _ in walk:
+                    if reference.BrowseName.Name == _name_to_find:
+                        return self.client.get_node(reference.NodeId)
+            return None
+
+        async def get_node_from_cache(_name: str):
+            """
+            Retrieve a node from the browse name cache, the browse name of the cached
+            NodeId is read to verify the entry. Invalid entries are removed.
+
+            Args:
+                _name: Target browse name.
+
+            Returns:
+                Node object if the cache entry is valid, else None.
+            """
+            node_id_str = self.browse_name_cache.get(_name)
+            if node_id_str is None:
+                return None
+            node = self.client.get_node(node_id_str)
+            try:
+                if (await node.read_browse_name()).Name == _name:
+                    return node
+            except Exception:
+                pass
+            del self.browse_name_cache[_name]
+            self._cache_changed = True
             return None
 
         async def get_node_by_id(_ns: int, _i: int):
@@ -136,7 +666,12 @@ class OPCUAClient:
         
         node = None
         if _browse_name is not None:
-            node = await find_node_by_name(_parent_node= self.objects, _name_to_find= _browse_name)
+            node = await get_node_from_cache(_name= _browse_name)
+            if node is None:
+                node = await find_node_by_name(_parent_node= self.objects, _name_to_find= _browse_name)
+                if node is not None and self.use_cache_file:
+                    self.browse_name_cache[_browse_name] = node.nodeid.to_string()
+                    self._cache_changed = True
         elif _namespace_index is not None and _identifier is not None:
             node = await get_node_by_id(_ns= _namespace_index, _i= _identifier)
         else:
@@ -146,9 +681,8 @@ class OPCUAClient:
         if node:
             bname = await node.read_browse_name()
             #print(f"found node, browsename: {bname.Name}, namesapce: {node.nodeid.NamespaceIndex}, identifier: {node.nodeid.Identifier}")
-            self.loaded_nodes.append(
-                [bname.Name, node.nodeid.NamespaceIndex, node.nodeid.Identifier, node]
-            )
+            entry = self.loaded_nodes.add(bname.Name, node.nodeid.NamespaceIndex, node.nodeid.Identifier, node)
+            await self.load_variant_types(_entries= [entry])
             return 1
         else:
             print(
@@ -174,41 +708,208 @@ class OPCUAClient:
         Returns:
             Node object if found, else -1.
         """
-        if self.loaded_nodes == []:
+        if not self.loaded_nodes:
             print("No nodes have been loaded.")
             return -1
-        for node in self.loaded_nodes:
-            if _browse_name == node[0]:
-                return node[3]
-            elif _namespace_index == node[1] and _identifier == node[2]:
-                return node[3]
-        print("No loaded node found matching given parameters.")
-        return -1
+        entry = self.loaded_nodes.get(_browse_name, _namespace_index, _identifier)
+        if entry is None:
+            print("No loaded node found matching given parameters.")
+            return -1
+        return entry.node
 
     # ---------------------------------------------------------------------- #
     # Node value operations
     # ---------------------------------------------------------------------- #
 
-    async def get_value(self, _node) -> object:
+    async def get_value(self, _node, _max_age: float = None) -> object:
         """
         Read the current value from a given OPC UA node.
 
         Args:
             _node: Target node object.
+            _max_age: Optional accepted age of the value in ms. A value of the read cache which is
+                      not older is returned without request, else it is sent as MaxAge of the Read.
 
         Returns:
             The current node value, or None if reading fails.
         """
+        if _max_age is not None or self.value_cache is not None:
+            # get_values() raises errors which are neither connection errors nor service faults
+            try:
+                value, status_code = (await self.get_values(_nodes= [_node], _max_age= _max_age))[0]
+            except Exception as e:
+                print(f"Get value not possible: {e}")
+                return None
+            if not status_code.is_good():
+                print(f"Get value not possible: {status_code.name}")
+            return value
         try:
             return await _node.read_value()
         except Exception as e:
             print(f"Get value not possible: {e}")
+            if is_connection_error(e):
+                self.connection_lost()
             return None
 
+    async def get_values(self, _nodes: list, _max_age: float = None) -> list:
+        """
+        Read the current values of many nodes with one Read request per chunk.
+
+        The chunk size is the MaxNodesPerRead operation limit of the server, read once per
+        connection, or DEFAULT_BATCH_SIZE if the server has no limit. With read cache and
+        _max_age only the nodes without a value of that age are read.
+
+        Args:
+            _nodes: Node objects or NodeIds to read.
+            _max_age: Optional accepted age of the values in ms, also sent as MaxAge of the Read.
+
+        Returns:
+            list: One (value, StatusCode) tuple per input node, in input order.
+                  The value is None if the status code is not good.
+        """
+        if self.client is None or not self.connected:
+            print("Client not connected.")
+            return [(None, ua.StatusCode(ua.StatusCodes.BadNotConnected)) for _ in _nodes]
+        node_ids = [node.nodeid if hasattr(node, "nodeid") else node for node in _nodes]
+        results = [None] * len(node_ids)
+        if self.value_cache is not None and _max_age is not None:
+            for index, node_id in enumerate(node_ids):
+                results[index] = self.value_cache.get(node_id, _max_age)
+        missing = [index for index, result in enumerate(results) if result is None]
+        if not missing:
+            return results
+
+        try:
+            if self.max_nodes_per_read is None:
+                await self.read_operation_limits()
+            data_values = await read_attribute_batched(
+                _session= self.client.uaclient,
+                _node_ids= [node_ids[index] for index in missing],
+                _batch_size= self.max_nodes_per_read,
+                _max_age= _max_age or 0
+            )
+        except Exception as e:
+            status_code = self._request_failed(_error= e, _operation= "Get values")
+            return [(None, status_code) for _ in _nodes]
+        for index, data_value in zip(missing, data_values):
+            value = data_value.Value.Value if data_value.StatusCode.is_good() and data_value.Value is not None else None
+            results[index] = (value, data_value.StatusCode)
+            if self.value_cache is not None and data_value.StatusCode.is_good():
+                self.value_cache.put(node_ids[index], value, data_value.StatusCode)
+        return results
+
+    async def set_values(self, _values: dict) -> list:
+        """
+        Write the values of many nodes with one Write request per chunk, without reading them first.
+
+        Values are type checked against the cached VariantType of the node. The VariantType of
+        registered nodes is read once when they are added, the one of other nodes with one
+        batched DataType read per call. Values with the wrong type are not written.
+
+        Args:
+            _values: Node object or NodeId -> new value.
+
+        Returns:
+            list: One StatusCode per entry of _values, in order. BadTypeMismatch for values
+                  which are rejected locally.
+        """
+        if self.client is None or not self.connected:
+            print("Client not connected.")
+            return [ua.StatusCode(ua.StatusCodes.BadNotConnected) for _ in _values]
+        try:
+            return await self._write_values(_values= _values)
+        except Exception as e:
+            status_code = self._request_failed(_error= e, _operation= "Set values")
+            return [status_code for _ in _values]
+
+    def _request_failed(self, _error: Exception, _operation: str) -> ua.StatusCode:
+        """
+        Handle an exception of a batched request.
+
+        A lost connection is reported to connection_lost(), a service fault of the working
+        connection keeps the connection and its status code is returned. Other errors are raised.
+
+        Args:
+            _error: Raised exception.
+            _operation: Name of the operation for the message.
+
+        Returns:
+            ua.StatusCode: Status code for every node of the request.
+        """
+        print(f"{_operation} not possible: {_error}")
+        if is_connection_error(_error):
+            self.connection_lost()
+            return ua.StatusCode(ua.StatusCodes.BadConnectionClosed)
+        if isinstance(_error, ua.UaStatusCodeError):
+            return ua.StatusCode(_error.code)
+        raise _error
+
+    async def _write_values(self, _values: dict) -> list:
+        """ Type check and write the values of set_values() """
+        if self.max_nodes_per_write is None:
+            await self.read_operation_limits()
+
+        node_ids = [node.nodeid if hasattr(node, "nodeid") else node for node in _values]
+        values = list(_values.values())
+        variant_types = [None] * len(node_ids)
+        unknown = []            # indices of nodes which are not registered
+        for index, node_id in enumerate(node_ids):
+            entry = self.loaded_nodes.get_by_node_id(node_id)
+            if entry is not None and entry.variant_type is not None:
+                variant_types[index] = entry.variant_type
+            else:
+                unknown.append(index)
+        if unknown:
+            data_values = await read_attribute_batched(
+                _session= self.client.uaclient,
+                _node_ids= [node_ids[index] for index in unknown],
+                _attribute= ua.AttributeIds.DataType,
+                _batch_size= self.max_nodes_per_read
+            )
+            for index, data_value in zip(unknown, data_values):
+                if data_value.StatusCode.is_good() and data_value.Value is not None:
+                    variant_types[index] = await self.get_variant_type(_data_type= data_value.Value.Value)
+
+        status_codes = [None] * len(node_ids)
+        write_indices = []
+        data_values = []
+        for index, (value, variant_type) in enumerate(zip(values, variant_types)):
+            python_types = PYTHON_TYPES.get(variant_type)
+            items = value if isinstance(value, (list, tuple)) else [value]
+            if python_types is not None and not all(
+                isinstance(item, python_types) and (variant_type == ua.VariantType.Boolean or not isinstance(item, bool))
+                for item in items
+            ):
+                print(
+                    f"Type mismatch: Node {node_ids[index].to_string()} expects {variant_type.name}, "
+                    f"but got {type(value).__name__}"
+                )
+                status_codes[index] = ua.StatusCode(ua.StatusCodes.BadTypeMismatch)
+                continue
+            variant = ua.Variant(value) if variant_type in (None, ua.VariantType.Variant) else ua.Variant(value, variant_type)
+            write_indices.append(index)
+            data_values.append(ua.DataValue(variant))
+
+        if write_indices:
+            results = await write_attribute_batched(
+                _session= self.client.uaclient,
+                _node_ids= [node_ids[index] for index in write_indices],
+                _data_values= data_values,
+                _batch_size= self.max_nodes_per_write
+            )
+            for index, status_code in zip(write_indices, results):
+                status_codes[index] = status_code
+                if self.value_cache is not None:
+                    self.value_cache.invalidate(node_ids[index])
+        return status_codes
+
     async def set_value(self, _node, _value) -> object:
         """
         Write a value to an OPC UA node after verifying type compatibility.
 
+        The type is checked locally against the cached VariantType of the node,
+        the current value is not read, see set_values().
+
         Args:
             _node: Target node object.
             _value: New value to write.
@@ -217,15 +918,77 @@ class OPCUAClient:
             int: 1 if successful, -1 on type mismatch or error.
         """
         try:
-            current_value = await _node.read_value()
-            if not isinstance(_value, type(current_value)):
-                print(
-                    f"Type mismatch: Node expects {type(current_value).__name__}, "
-                    f"but got {type(_value).__name__}"
-                )
+            status_code = (await self.set_values({_node: _value}))[0]
+            if status_code.value in (ua.StatusCodes.BadNotConnected, ua.StatusCodes.BadConnectionClosed):
                 return -1
-            await _node.write_value(_value)
+            if status_code.value == ua.StatusCodes.BadTypeMismatch:
+                return -1
+            status_code.check()
             return 1
         except Exception as e:
             print(f"Unable to write value to node: {e}")
-            return -1
\ No newline at end of file
+            return -1
+
+    # ---------------------------------------------------------------------- #
+    # Subscriptions
+    # ---------------------------------------------------------------------- #
+
+    async def subscribe(
+        self,
+        _nodes: list,
+        _interval: float = 1000,
+        _handler: object = None,
+        _sampling_interval: float = None,
+        _queue_size: int = 1,
+        _deadband: float = None,
+        _deadband_type: ua.DeadbandType = ua.DeadbandType.Absolute
+    ) -> OPCUASubscription:
+        """
+        Subscribe to value changes of nodes instead of polling them.
+
+        Args:
+            _nodes: Node objects to monitor.
+            _interval: Publishing interval in ms.
+            _handler: Optional callback handler(node, value, data_value), may be a coroutine function.
+                      Without handler the changes are read with 'async for' from the subscription.
+            _sampling_interval: Sampling interval in ms on the server, None uses _interval.
+            _queue_size: Values the server queues per node between two publishes.
+            _deadband: Optional deadband, numeric changes within it are not reported.
+            _deadband_type: ua.DeadbandType.Absolute or ua.DeadbandType.Percent.
+
+        Returns:
+            OPCUASubscription: The started subscription, None if the client is not connected.
+        """
+        if self.client is None:
+            print("Client not connected.")
+            return None
+        subscription = OPCUASubscription(
+            _client= self.client,
+            _nodes= _nodes,
+            _interval= _interval,
+            _handler= _handler,
+            _sampling_interval= _sampling_interval,
+            _queue_size= _queue_size,
+            _deadband= _deadband,
+            _deadband_type= _deadband_type,
+            _value_cache= self.value_cache
+        )
+        await subscription.start()
+        self.subscriptions.append(subscription)
+        return subscription
+
+    async def unsubscribe(self, _subscription: OPCUASubscription) -> int:
+        """
+        Delete a subscription created with subscribe().
+
+        Args:
+            _subscription: The subscription.
+
+        Returns:
+            int: 1 if deleted, -1 if it is not a subscription of this client.
+        """
+        if _subscription not in self.subscriptions:
+            return -1
+        self.subscriptions.remove(_subscription)
+        await _subscription.stop()
+        return 1
@@ -0,0 +1,288 @@
+import time
+import random
+import asyncio
+import contextlib
+
+from asyncua import Client, ua
+
+# Errors of the transport, after them a session is not trusted any more and is reconnected.
+# ua.UaStatusCodeError is a ua.UaError too, but it is the answer of a working session (e.g.
+# BadNodeIdUnknown), only the status codes of CONNECTION_STATUS_CODES report a lost connection.
+CONNECTION_ERRORS = (ConnectionError, OSError, asyncio.TimeoutError, ua.UaError)
+CONNECTION_STATUS_CODES = frozenset((
+    ua.StatusCodes.BadConnectionClosed,
+    ua.StatusCodes.BadSecureChannelClosed,
+    ua.StatusCodes.BadSecureChannelIdInvalid,
+    ua.StatusCodes.BadSessionClosed,
+    ua.StatusCodes.BadSessionIdInvalid,
+    ua.StatusCodes.BadSessionNotActivated,
+    ua.StatusCodes.BadNotConnected,
+    ua.StatusCodes.BadServerNotConnected,
+    ua.StatusCodes.BadCommunicationError,
+    ua.StatusCodes.BadShutdown,
+    ua.StatusCodes.BadServerHalted
+))
+
+
+def is_connection_error(_error: BaseException) -> bool:
+    """
+    Check if an error means the connection of a session is lost.
+
+    Args:
+        _error: Raised exception.
+
+    Returns:
+        bool: True for transport errors and status codes of a lost session or channel,
+              False for service faults of a working session.
+    """
+    if isinstance(_error, ua.UaStatusCodeError):
+        return _error.code in CONNECTION_STATUS_CODES
+    return isinstance(_error, CONNECTION_ERRORS)
+
+
+class _PooledSession:
+    """ One asyncua Client session of the pool with its state """
+
+    __slots__ = ("index", "client", "healthy", "in_use", "reconnect_task", "reconnects")
+
+    def __init__(self, _index: int) -> None:
+        self.index = _index
+        self.client = None                          # connected asyncua Client, None while reconnecting
+        self.healthy = False                        # session may be handed out
+        self.in_use = 0                             # tasks using the session right now
+        self.reconnect_task = None                  # running reconnect with backoff
+        self.reconnects = 0                         # successful reconnects
+
+
+class OPCUAClientPool:
+    """
+    Pool of OPC UA sessions to one endpoint for many concurrent tasks.
+
+    Every session has its own secure channel. Tasks lease a session with session(), each
+    session serves up to _requests_per_session tasks at the same time, the least used healthy
+    session is handed out first. Sessions which fail a request or the periodic health check
+    are reconnected in the background with exponential backoff, the other sessions keep serving.
+
+        async with pool.session() as client:
+            data_values = await read_attribute_batched(_session= client.uaclient, _node_ids= node_ids)
+    """
+
+    def __init__(
+            self,
+            _endpoint: str,
+            _size: int = 4,
+            _requests_per_session: int = 1,
+            _timeout: float = 4,
+            _health_interval: float = 10.0,
+            _backoff_initial: float = 0.5,
+            _backoff_max: float = 30.0
+        ) -> None:
+        """
+        Initialize the pool, the sessions are opened with start().
+
+        Args:
+            _endpoint: The OPC UA server endpoint URL.
+            _size: Number of sessions.
+            _requests_per_session: Tasks which may use one session at the same time.
+            _timeout: Request timeout of the sessions in seconds.
+            _health_interval: Seconds between two health checks of the idle sessions.
+            _backoff_initial: First reconnect delay in seconds.
+            _backoff_max: Maximum reconnect delay in seconds.
+        """
+        self.endpoint = _endpoint
+        self.size = _size
+        self.requests_per_session = _requests_per_session
+        self.timeout = _timeout
+        self.health_interval = _health_interval
+        self.backoff_initial = _backoff_initial
+        self.backoff_max = _backoff_max
+
+        self.sessions: list[_PooledSession] = [_PooledSession(index) for index in range(_size)]
+        self.available: asyncio.Condition = None    # notified when a session gets free or healthy
+        self.health_task = None                     # periodic health check
+        self.running = False
+
+        # Statistics
+        self.leases: int = 0                        # sessions handed out
+        self.wait_time: float = 0.0                 # summed time tasks waited for a session
+        self.failures: int = 0                      # sessions marked unhealthy
+
+    # ---------------------------------------------------------------------- #
+    # Pool management
+    # ---------------------------------------------------------------------- #
+
+    async def start(self) -> int:
+        """
+        Open all sessions at the same time and start the health check.
+        Sessions which can not connect are retried in the background.
+
+        Returns:
+            int: Number of connected sessions.
+        """
+        self.available = asyncio.Condition()
+        self.running = True
+        results = await asyncio.gather(*(self._connect(_pooled= pooled) for pooled in self.sessions))
+        for pooled, connected in zip(self.sessions, results):
+            if not connected:
+                self._schedule_reconnect(_pooled= pooled)
+        if self.health_interval:
+            self.health_task = asyncio.create_task(self._health_check())
+        return sum(1 for connected in results if connected)
+
+    async def stop(self) -> int:
+        """
+        Stop the health check and the reconnects and close all sessions.
+
+        Returns:
+            int: 1
+        """
+        self.running = False
+        tasks = [self.health_task] + [pooled.reconnect_task for pooled in self.sessions]
+        for task in tasks:
+            if task is not None:
+                task.cancel()
+        await asyncio.gather(*(task for task in tasks if task is not None), return_exceptions= True)
+        self.health_task = None
+        await asyncio.gather(*(self._disconnect(_pooled= pooled) for pooled in self.sessions))
+        async with self.available:
+            self.available.notify_all()
+        return 1
+
+    async def __aenter__(self) -> "OPCUAClientPool":
+        await self.start()
+        return self
+
+    async def __aexit__(self, *_exc_info) -> None:
+        await self.stop()
+
+    @contextlib.asynccontextmanager
+    async def session(self, _timeout: float = None):
+        """
+        Lease a connected session.
+
+        A request which fails with a connection error marks the session unhealthy,
+        it is reconnected in the background and the error is raised to the task.
+        Service faults like BadNodeIdUnknown are raised without touching the session.
+
+        Args:
+            _timeout: Optional seconds to wait for a session, asyncio.TimeoutError afterwards.
+
+        Yields:
+            Client: Connected asyncua Client.
+        """
+        pooled = await asyncio.wait_for(self._acquire(), _timeout)
+        try:
+            yield pooled.client
+        except Exception as e:
+            if is_connection_error(e):
+                await self._mark_unhealthy(_pooled= pooled)
+            raise
+        finally:
+            async with self.available:
+                pooled.in_use -= 1
+                self.available.notify()
+
+    def get_statistics(self) -> dict:
+        """
+        Current state of the pool.
+
+        Returns:
+            dict: Healthy sessions, tasks in use, leases, average wait time, failures and reconnects.
+        """
+        return {
+            "sessions": self.size,
+            "healthy": sum(1 for pooled in self.sessions if pooled.healthy),
+            "in_use": sum(pooled.in_use for pooled in self.sessions),
+            "leases": self.leases,
+            "average_wait": self.wait_time / self.leases if self.leases else 0.0,
+            "failures": self.failures,
+            "reconnects": sum(pooled.reconnects for pooled in self.sessions)
+        }
+
+    # ---------------------------------------------------------------------- #
+    # Session handling
+    # ---------------------------------------------------------------------- #
+
+    async def _acquire(self) -> _PooledSession:
+        """ Wait for the least used healthy session with a free slot """
+        if not self.running:
+            raise ConnectionError("Client pool is not started.")
+        start_time = time.perf_counter()
+        async with self.available:
+            while True:
+                candidates = [pooled for pooled in self.sessions if pooled.healthy and pooled.in_use < self.requests_per_session]
+                if candidates:
+                    pooled = min(candidates, key= lambda candidate: candidate.in_use)
+                    pooled.in_use += 1
+                    break
+                if not self.running:
+                    raise ConnectionError("Client pool is stopped.")
+                await self.available.wait()
+        self.leases += 1
+        self.wait_time += time.perf_counter() - start_time
+        return pooled
+
+    async def _connect(self, _pooled: _PooledSession) -> bool:
+        """ Open a new session for a pool entry """
+        client = Client(self.endpoint, timeout= self.timeout)
+        try:
+            await client.connect()
+        except Exception as e:
+            print(f"Pool session {_pooled.index} can not connect: {e}")
+            return False
+        _pooled.client = client
+        async with self.available:
+            _pooled.healthy = True
+            self.available.notify_all()
+        return True
+
+    async def _disconnect(self, _pooled: _PooledSession) -> None:
+        """ Close the session of a pool entry, errors of a dead connection are ignored """
+        _pooled.healthy = False
+        client, _pooled.client = _pooled.client, None
+        if client is None:
+            return
+        try:
+            await client.disconnect()
+        except Exception:
+            with contextlib.suppress(Exception):
+                client.disconnect_socket()
+
+    async def _mark_unhealthy(self, _pooled: _PooledSession) -> None:
+        """ Stop handing out a session and reconnect it """
+        if not _pooled.healthy:
+            return
+        _pooled.healthy = False
+        self.failures += 1
+        self._schedule_reconnect(_pooled= _pooled)
+
+    def _schedule_reconnect(self, _pooled: _PooledSession) -> None:
+        """ Start the reconnect of a pool entry, if it is not running already """
+        if self.running and (_pooled.reconnect_task is None or _pooled.reconnect_task.done()):
+            _pooled.reconnect_task = asyncio.create_task(self._reconnect(_pooled= _pooled))
+
+    async def _reconnect(self, _pooled: _PooledSession) -> None:
+        """ Reconnect a pool entry with exponential backoff and jitter """
+        # Tasks which still use the old session finish before it is closed
+        while _pooled.in_use:
+            await asyncio.sleep(0.05)
+        await self._disconnect(_pooled= _pooled)
+        delay = self.backoff_initial
+        while self.running:
+            if await self._connect(_pooled= _pooled):
+                _pooled.reconnects += 1
+                return
+            await asyncio.sleep(delay * random.uniform(0.5, 1.0))
+            delay = min(delay * 2, self.backoff_max)
+
+    async def _health_check(self) -> None:
+        """ Read the server state on every idle healthy session periodically """
+        while self.running:
+            await asyncio.sleep(self.health_interval)
+            for pooled in self.sessions:
+                if not pooled.healthy or pooled.in_use:
+                    continue
+                try:
+                    await pooled.client.nodes.server_state.read_value()
+                except Exception:
+                    await self._mark_unhealthy(_pooled= pooled)
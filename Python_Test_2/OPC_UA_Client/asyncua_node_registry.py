@@ -0,0 +1,143 @@
+class LoadedNode:
+    """
+    Compact entry of a node the client is connected to.
+
+    The fields can also be read by index like the former [browse name, ns, i, node] lists.
+    """
+
+    __slots__ = ("browse_name", "namespace_index", "identifier", "node", "variant_type")
+
+    def __init__(self, _browse_name: str, _namespace_index: int, _identifier: object, _node: object) -> None:
+        """
+        Initialize a loaded node entry.
+
+        Args:
+            _browse_name: Browse name of the node.
+            _namespace_index: Namespace index of the node.
+            _identifier: Identifier of the node.
+            _node: asyncua Node object.
+        """
+        self.browse_name = _browse_name
+        self.namespace_index = _namespace_index
+        self.identifier = _identifier
+        self.node = _node
+        self.variant_type = None                    # VariantType of the value, None if unknown or no variable
+
+    def __getitem__(self, _index: int) -> object:
+        return (self.browse_name, self.namespace_index, self.identifier, self.node)[_index]
+
+    def __iter__(self):
+        yield from (self.browse_name, self.namespace_index, self.identifier, self.node)
+
+    def __repr__(self) -> str:
+        return f"LoadedNode(browse_name={self.browse_name!r}, ns={self.namespace_index}, i={self.identifier!r})"
+
+
+class NodeRegistry:
+    """
+    Registry of the nodes a client is connected to.
+
+    Entries are kept in the order they are added and are indexed by browse name and by
+    (namespace index, identifier), so a lookup does not depend on the number of nodes.
+    """
+
+    def __init__(self) -> None:
+        """
+        Initialize an empty registry.
+
+        Attributes:
+            self.entries (list[LoadedNode]): Entries in the order they were added.
+            self.by_name (dict): Browse name -> first entry with this name.
+            self.by_id (dict): (ns, i) -> entry.
+        """
+        self.entries: list[LoadedNode] = []
+        self.by_name: dict = {}
+        self.by_id: dict = {}
+
+    def add(self, _browse_name: str, _namespace_index: int, _identifier: object, _node: object) -> LoadedNode:
+        """
+        Add a node, a node which is already registered with the same (ns, i) is not added again.
+
+        Args:
+            _browse_name: Browse name of the node.
+            _namespace_index: Namespace index of the node.
+            _identifier: Identifier of the node.
+            _node: asyncua Node object.
+
+        Returns:
+            LoadedNode: The new entry or the one already registered.
+        """
+        key = (_namespace_index, _identifier)
+        entry = self.by_id.get(key)
+        if entry is not None:
+            return entry
+        entry = LoadedNode(_browse_name, _namespace_index, _identifier, _node)
+        self.entries.append(entry)
+        self.by_id[key] = entry
+        self.by_name.setdefault(_browse_name, entry)
+        return entry
+
+    def get(self, _browse_name: str = None, _namespace_index: int = None, _identifier: object = None) -> LoadedNode:
+        """
+        Look up an entry by browse name, else by namespace index and identifier.
+
+        Args:
+            _browse_name: Browse name of the node.
+            _namespace_index: Namespace index of the node.
+            _identifier: Identifier of the node.
+
+        Returns:
+            LoadedNode: The entry, or None if no entry matches.
+        """
+        entry = self.by_name.get(_browse_name) if _browse_name is not None else None
+        if entry is None and _namespace_index is not None and _identifier is not None:
+            entry = self.by_id.get((_namespace_index, _identifier))
+        return entry
+
+    def get_by_node_id(self, _node_id: object) -> LoadedNode:
+        """
+        Look up an entry by NodeId.
+
+        Args:
+            _node_id: asyncua NodeId.
+
+        Returns:
+            LoadedNode: The entry, or None if the node is not registered.
+        """
+        return self.by_id.get((_node_id.NamespaceIndex, _node_id.Identifier))
+
+    def rebuild(self, _entries: list) -> int:
+        """
+        Replace the entries and index them again, e.g. after their NodeIds changed.
+
+        Args:
+            _entries: LoadedNode entries in the order to keep.
+
+        Returns:
+            int: Number of entries.
+        """
+        entries = list(_entries)
+        self.clear()
+        for entry in entries:
+            key = (entry.namespace_index, entry.identifier)
+            if key in self.by_id:
+                continue
+            self.entries.append(entry)
+            self.by_id[key] = entry
+            self.by_name.setdefault(entry.browse_name, entry)
+        return len(self.entries)
+
+    def clear(self) -> None:
+        """ Remove all entries. """
+        self.entries.clear()
+        self.by_name.clear()
+        self.by_id.clear()
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def __iter__(self):
+        return iter(self.entries)
+
+    def __bool__(self) -> bool:
+        return bool(self.entries)
@@ -0,0 +1,184 @@
+import math
+import asyncio
+
+from collections import deque
+
+from asyncua import ua
+
+# Jitter and latency samples kept for the percentiles, the newest ones win on long runs
+DEFAULT_MAX_SAMPLES = 100000
+
+
+class OPCUAPublisher:
+    """
+    Rate controlled writer of one node, e.g. a test clock at 100-1000 Hz.
+
+    Ticks are scheduled on absolute loop.time() deadlines (start + k * period), so the
+    scheduling error of one tick does not add up. Late ticks are caught up, a tick which is
+    more than _max_lag late is skipped instead of bursting. Every tick sends one Write request from WriteParameters
+    which are built once per in-flight slot, only the Variant of their DataValue is replaced.
+    """
+
+    def __init__(
+            self,
+            _client: object,
+            _node: object,
+            _rate: float,
+            _value_factory: object,
+            _variant_type: ua.VariantType = None,
+            _max_in_flight: int = 1,
+            _max_lag: float = 0.1,
+            _max_samples: int = DEFAULT_MAX_SAMPLES
+        ) -> None:
+        """
+        Initialize the publisher.
+
+        Args:
+            _client: Connected OPCUAClient.
+            _node: Node object to write.
+            _rate: Writes per second.
+            _value_factory: Function returning the value of the next write.
+            _variant_type: VariantType of the value, None uses the cached type of the loaded node.
+            _max_in_flight: Writes which may wait for their response at the same time,
+                            a tick is skipped if all are in flight.
+            _max_lag: Seconds a tick may be late before it is skipped.
+            _max_samples: Newest jitter and latency samples kept for the statistics.
+        """
+        self.client = _client
+        self.node = _node
+        self.rate = _rate
+        self.period = 1.0 / _rate
+        self.value_factory = _value_factory
+        self.variant_type = _variant_type
+        self.max_in_flight = _max_in_flight
+        self.max_lag = _max_lag
+
+        self.running = False
+        self.in_flight: set = set()                 # running write tasks
+        self.ticks: int = 0                         # scheduled ticks
+        self.writes: int = 0                        # writes with good StatusCode
+        self.errors: int = 0                        # writes with bad StatusCode or exception
+        self.skipped: int = 0                       # ticks skipped because of lateness or full pipeline
+        self.jitters: deque = deque(maxlen= _max_samples)      # tick start - deadline in s
+        self.latencies: deque = deque(maxlen= _max_samples)    # write round trip in s
+        self.duration: float = 0.0                  # scheduled publishing time in s
+
+    async def run(self, _duration: float = None, _ticks: int = None) -> dict:
+        """
+        Publish until stop() is called, _duration seconds passed or _ticks ticks were scheduled.
+        If run() is cancelled, e.g. by Ctrl+C, the duration is still recorded and the writes in
+        flight are cancelled before the CancelledError is raised again.
+
+        Args:
+            _duration: Optional publishing time in seconds.
+            _ticks: Optional number of ticks.
+
+        Returns:
+            dict: Statistics, see get_statistics().
+        """
+        if self.variant_type is None:
+            entry = self.client.loaded_nodes.get_by_node_id(self.node.nodeid)
+            self.variant_type = entry.variant_type if entry is not None else None
+        session = self.client.client.uaclient
+
+        # Built once per in-flight slot, every tick only replaces the Variant
+        free_slots = []
+        for _ in range(self.max_in_flight):
+            write_value = ua.WriteValue()
+            write_value.NodeId = self.node.nodeid
+            write_value.AttributeId = ua.AttributeIds.Value
+            write_value.Value = ua.DataValue()
+            params = ua.WriteParameters()
+            params.NodesToWrite.append(write_value)
+            free_slots.append(params)
+
+        loop = asyncio.get_running_loop()
+        self.running = True
+        start = loop.time()
+        end = start + _duration if _duration is not None else math.inf
+        tick = 0
+        cancelled = False
+        try:
+            while self.running and (_ticks is None or tick < _ticks):
+                deadline = start + tick * self.period
+                if deadline >= end:
+                    break
+                delay = deadline - loop.time()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                now = loop.time()
+                tick += 1
+                self.ticks += 1
+                if now - deadline > self.max_lag or not free_slots:
+                    self.skipped += 1
+                    continue
+                self.jitters.append(now - deadline)
+                value = self.value_factory()
+                params = free_slots.pop()
+                params.NodesToWrite[0].Value.Value = ua.Variant(value) if self.variant_type is None else ua.Variant(value, self.variant_type)
+                task = asyncio.ensure_future(self._write(_session= session, _params= params, _loop= loop, _sent= now))
+                self.in_flight.add(task)
+                task.add_done_callback(self.in_flight.discard)
+                task.add_done_callback(lambda _task, _params= params: free_slots.append(_params))
+
+            if self.in_flight:
+                await asyncio.gather(*self.in_flight, return_exceptions= True)
+        except asyncio.CancelledError:
+            cancelled = True
+            raise
+        finally:
+            # Only left with writes in flight if run() was cancelled, they are cancelled and awaited too
+            pending = list(self.in_flight)
+            for task in pending:
+                task.cancel()
+            if pending:
+                await asyncio.wait(pending)
+            # The last tick covers one period, a cancelled run ends now
+            elapsed = loop.time() - start
+            self.duration = elapsed if cancelled else max(elapsed, tick * self.period)
+            self.running = False
+        return self.get_statistics()
+
+    def stop(self) -> None:
+        """ End run() after the current tick """
+        self.running = False
+
+    async def _write(self, _session: object, _params: ua.WriteParameters, _loop: object, _sent: float) -> None:
+        """ Send one Write request and record its latency """
+        try:
+            status_codes = await _session.write(_params)
+        except Exception as e:
+            self.errors += 1
+            print(f"Publish not possible: {e}")
+            return
+        self.latencies.append(_loop.time() - _sent)
+        if status_codes[0].is_good():
+            self.writes += 1
+        else:
+            self.errors += 1
+
+    def get_statistics(self) -> dict:
+        """
+        Achieved rate, jitter and latency percentiles of the last run.
+
+        Returns:
+            dict: Ticks, writes, errors, skipped ticks, target and achieved rate,
+                  jitter and latency p50/p95/p99/max in ms.
+        """
+        def percentiles(_samples: list) -> dict:
+            if not _samples:
+                return {"p50": None, "p95": None, "p99": None, "max": None}
+            samples = sorted(_samples)
+            pick = lambda q: samples[min(len(samples) - 1, int(q * len(samples)))] * 1000
+            return {"p50": pick(0.50), "p95": pick(0.95), "p99": pick(0.99), "max": samples[-1] * 1000}
+
+        return {
+            "ticks": self.ticks,
+            "writes": self.writes,
+            "errors": self.errors,
+            "skipped": self.skipped,
+            "target_rate": self.rate,
+            "achieved_rate": self.writes / self.duration if self.duration else 0.0,
+            "jitter_ms": percentiles(self.jitters),
+            "latency_ms": percentiles(self.latencies)
+        }
@@ -0,0 +1,182 @@
+import asyncio
+import inspect
+
+from asyncua import ua
+
+
+class OPCUASubscription:
+    """
+    Data change subscription of an OPCUAClient built on OPC UA MonitoredItems.
+
+    The server samples the nodes and only publishes changes, so the client gets new values
+    without polling. Changes are passed to a handler, or, without handler, queued for the
+    async iterator:
+
+        async with await opc_ua_client.subscribe(_nodes= [clock]) as subscription:
+            async for node, value, data_value in subscription:
+                ...
+    """
+
+    def __init__(
+            self,
+            _client: object,
+            _nodes: list,
+            _interval: float = 1000,
+            _handler: object = None,
+            _sampling_interval: float = None,
+            _queue_size: int = 1,
+            _deadband: float = None,
+            _deadband_type: ua.DeadbandType = ua.DeadbandType.Absolute,
+            _max_pending: int = 1000,
+            _value_cache: object = None
+        ) -> None:
+        """
+        Initialize the subscription, it is created on the server with start().
+
+        Args:
+            _client: Connected asyncua Client instance.
+            _nodes: Node objects to monitor.
+            _interval: Publishing interval in ms.
+            _handler: Optional callback handler(node, value, data_value), may be a coroutine function.
+            _sampling_interval: Sampling interval in ms of the monitored items, None uses _interval.
+            _queue_size: Values the server queues per monitored item between two publishes.
+            _deadband: Optional deadband, numeric changes within it are not reported.
+            _deadband_type: ua.DeadbandType.Absolute or ua.DeadbandType.Percent (of the EURange).
+            _max_pending: Changes kept for the iterator, the oldest are dropped on overflow.
+            _value_cache: Optional ValueCache which gets every reported value.
+        """
+        self.client = _client
+        self.nodes = list(_nodes)
+        self.interval = _interval
+        self.handler = _handler
+        self.sampling_interval = _interval if _sampling_interval is None else _sampling_interval
+        self.queue_size = _queue_size
+        self.deadband = _deadband
+        self.deadband_type = _deadband_type
+        self.value_cache = _value_cache
+
+        self.subscription = None                                # asyncua Subscription
+        self.monitored_items: list = []                         # MonitoredItemId or StatusCode per node
+        self.pending: asyncio.Queue = asyncio.Queue(maxsize= _max_pending)
+        self.notifications: int = 0                             # changes received
+        self.dropped: int = 0                                   # changes dropped on iterator overflow
+        self.status = None                                      # last StatusCode reported for the subscription
+
+    async def start(self) -> int:
+        """
+        Create the subscription and one MonitoredItem per node with one request each.
+
+        Returns:
+            int: Number of monitored nodes, -1 if the subscription exists already.
+        """
+        if self.subscription is not None:
+            return -1
+        self.subscription = await self.client.create_subscription(self.interval, self)
+
+        data_change_filter = None
+        if self.deadband is not None:
+            data_change_filter = ua.DataChangeFilter()
+            data_change_filter.Trigger = ua.DataChangeTrigger.StatusValue
+            data_change_filter.DeadbandType = self.deadband_type
+            data_change_filter.DeadbandValue = self.deadband
+
+        requests = []
+        for client_handle, node in enumerate(self.nodes, start= 1):
+            read_value = ua.ReadValueId()
+            read_value.NodeId = node.nodeid
+            read_value.AttributeId = ua.AttributeIds.Value
+            parameters = ua.MonitoringParameters()
+            parameters.ClientHandle = client_handle
+            parameters.SamplingInterval = self.sampling_interval
+            parameters.QueueSize = self.queue_size
+            parameters.DiscardOldest = True
+            if data_change_filter is not None:
+                parameters.Filter = data_change_filter
+            request = ua.MonitoredItemCreateRequest()
+            request.ItemToMonitor = read_value
+            request.MonitoringMode = ua.MonitoringMode.Reporting
+            request.RequestedParameters = parameters
+            requests.append(request)
+        self.monitored_items = await self.subscription.create_monitored_items(requests)
+
+        for node, result in zip(self.nodes, self.monitored_items):
+            if isinstance(result, ua.StatusCode):
+                print(f"Monitoring not possible for node {node.nodeid.to_string()}: {result.name}")
+        return sum(1 for result in self.monitored_items if not isinstance(result, ua.StatusCode))
+
+    async def stop(self) -> int:
+        """
+        Delete the subscription on the server and end the iterator.
+
+        Returns:
+            int: 1 if deleted, -1 if it was not started.
+        """
+        if self.subscription is None:
+            return -1
+        subscription, self.subscription = self.subscription, None
+        try:
+            await subscription.delete()
+        except Exception as e:
+            print(f"Unable to delete subscription: {e}")
+        self._put(None)
+        return 1
+
+    async def restore(self, _client: object) -> int:
+        """
+        Create the subscription again on a new connection, e.g. after a reconnect.
+        The monitored nodes are bound to the new session.
+
+        Args:
+            _client: Connected asyncua Client instance.
+
+        Returns:
+            int: Number of monitored nodes, -1 if the subscription was stopped.
+        """
+        if self.subscription is None:
+            return -1
+        self.client = _client
+        self.subscription = None                                # the old one died with its session
+        for node in self.nodes:
+            node.session = _client.uaclient
+        return await self.start()
+
+    async def datachange_notification(self, node: object, val: object, data: object) -> None:
+        """ Called by asyncua for every reported change """
+        self.notifications += 1
+        if self.value_cache is not None:
+            self.value_cache.put(node.nodeid, val, data.monitored_item.Value.StatusCode)
+        if self.handler is None:
+            self._put((node, val, data.monitored_item.Value))
+            return
+        result = self.handler(node, val, data.monitored_item.Value)
+        if inspect.isawaitable(result):
+            await result
+
+    def status_change_notification(self, status: object) -> None:
+        """ Called by asyncua when the server reports a new subscription state, e.g. a timeout """
+        self.status = status.Status
+
+    def _put(self, _item: tuple) -> None:
+        """ Queue a change for the iterator, drop the oldest one if the queue is full """
+        if self.pending.full():
+            self.pending.get_nowait()
+            self.dropped += 1
+        self.pending.put_nowait(_item)
+
+    async def __aenter__(self) -> "OPCUASubscription":
+        if self.subscription is None:
+            await self.start()
+        return self
+
+    async def __aexit__(self, *_exc_info) -> None:
+        await self.stop()
+
+    def __aiter__(self) -> "OPCUASubscription":
+        return self
+
+    async def __anext__(self) -> tuple:
+        """ Next change as (node, value, data_value), ends after stop() """
+        item = await self.pending.get()
+        if item is None:
+            raise StopAsyncIteration
+        return item
@@ -0,0 +1,90 @@
+import time
+
+from collections import OrderedDict
+
+
+class ValueCache:
+    """
+    Client side cache of node values with max age lookups and LRU eviction.
+
+    Values are stored with the time they were received, from a Read or from a subscription.
+    A lookup returns a value only if it is not older than the max age the caller accepts,
+    like the MaxAge parameter of the OPC UA Read service.
+    """
+
+    def __init__(self, _size: int = 1000) -> None:
+        """
+        Initialize an empty cache.
+
+        Args:
+            _size: Maximum number of cached nodes, the least recently used one is evicted.
+
+        Attributes:
+            self.entries (OrderedDict): NodeId -> (value, StatusCode, receive time), least recently used first.
+            self.hits (int): Lookups answered from the cache.
+            self.misses (int): Lookups which needed a Read.
+            self.evictions (int): Entries evicted because the cache was full.
+        """
+        self.size = _size
+        self.entries: OrderedDict = OrderedDict()
+        self.hits: int = 0
+        self.misses: int = 0
+        self.evictions: int = 0
+
+    def get(self, _node_id: object, _max_age: float) -> tuple:
+        """
+        Look up a value which is not older than _max_age.
+
+        Args:
+            _node_id: asyncua NodeId.
+            _max_age: Accepted age in ms.
+
+        Returns:
+            tuple: (value, StatusCode), or None on a miss.
+        """
+        entry = self.entries.get(_node_id)
+        if entry is None or (time.monotonic() - entry[2]) * 1000 > _max_age:
+            self.misses += 1
+            return None
+        self.entries.move_to_end(_node_id)
+        self.hits += 1
+        return entry[0], entry[1]
+
+    def put(self, _node_id: object, _value: object, _status_code: object) -> None:
+        """
+        Store a value received now.
+
+        Args:
+            _node_id: asyncua NodeId.
+            _value: Value of the node.
+            _status_code: StatusCode of the value.
+        """
+        self.entries[_node_id] = (_value, _status_code, time.monotonic())
+        self.entries.move_to_end(_node_id)
+        if len(self.entries) > self.size:
+            self.entries.popitem(last= False)
+            self.evictions += 1
+
+    def invalidate(self, _node_id: object) -> None:
+        """ Remove the value of a node, e.g. after it was written """
+        self.entries.pop(_node_id, None)
+
+    def clear(self) -> None:
+        """ Remove all values, the counters are kept """
+        self.entries.clear()
+
+    def get_statistics(self) -> dict:
+        """
+        Counters of the cache.
+
+        Returns:
+            dict: Cached nodes, hits, misses, hit rate and evictions.
+        """
+        lookups = self.hits + self.misses
+        return {
+            "nodes": len(self.entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "evictions": self.evictions
+        }
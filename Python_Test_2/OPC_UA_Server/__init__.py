@@ -1,4 +1,5 @@
 from .asyncua_server import OPCUAServer
 from .asyncua_node_container import OPCUANodeContainer
+from .asyncua_address_space_tree import OPCUAAddressSpaceTree
 from .opc_ua_node import OPCUANode
 from .opc_ua_namespace import OPCUANamespace
\ No newline at end of file
@@ -0,0 +1,246 @@
+import time
+import logging
+
+from asyncua import ua
+
+from Lib.addressspace import walk_address_space, DEFAULT_BATCH_SIZE
+from Lib.dependencytree import CompactTree
+
+# Namespaces of the OPC UA specifications, their nodes are not part of the server model
+STANDARD_NAMESPACE_URIS = (
+    "http://opcfoundation.org/UA/",
+    "http://opcfoundation.org/UA/DI/",
+    "http://opcfoundation.org/UA/ADI/",
+    "http://opcfoundation.org/UA/MDIS/"
+)
+
+# Node changes kept between two reads of the tree, more changes are not recorded and the tree is browsed again
+DEFAULT_MAX_PENDING = 10000
+
+
+class OPCUAAddressSpaceTree:
+    """
+    Node tree of the custom nodes below the Objects node, read from the running server.
+
+    The tree works for every build mode, also if the nodes were not created by the node
+    container (e.g. --build xml). The address space is browsed once with batched Browse
+    requests. Afterwards the server reports every added and deleted node to the tree, so the
+    tree is updated in memory and the address space is not browsed again. If more than
+    _max_pending nodes change between two reads, the changes are dropped and the tree is
+    marked dirty, update() browses it again. Only one tree can follow the NodeManagementService
+    of a server at a time.
+    """
+
+    def __init__(self, _server: object, _logger: logging = None, _batch_size: int = DEFAULT_BATCH_SIZE, _concurrency: int = 1,
+                 _max_pending: int = DEFAULT_MAX_PENDING) -> None:
+        """
+        Initialize an empty tree, it is read from the server with build().
+
+        Args:
+            _server: Running asyncua Server instance.
+            _logger: Optional logger of the server.
+            _batch_size: Maximum nodes per Browse request.
+            _concurrency: Number of Browse requests in flight.
+            _max_pending: Maximum node changes recorded until the next read, the tree is marked dirty past it.
+
+        Attributes:
+            self.children (dict): Parent NodeId -> child NodeIds in browse order.
+            self.parents (dict): NodeId -> parent NodeId.
+            self.nodes (dict): NodeId -> (browse name, node class name).
+            self.pending (list): Nodes added or deleted on the server since the last update, (parent NodeId, NodeId, browse name, node class name)
+                for added nodes and (None, NodeId, None, None) for deleted nodes.
+            self.compact_tree (CompactTree): Cached tree, None if it has to be rebuilt from self.children.
+            self.dirty (bool): More than _max_pending nodes changed, the tree has to be browsed again.
+        """
+        self.server = _server
+        self.logger = _logger
+        self.batch_size = _batch_size
+        self.concurrency = _concurrency
+        self.max_pending = _max_pending
+
+        self.root_node_id: ua.NodeId = None                     # Objects node
+        self.custom_namespaces: set = set()                     # indexes of the custom namespaces
+        self.children: dict = {}
+        self.parents: dict = {}
+        self.nodes: dict = {}
+        self.pending: list = []
+        self.compact_tree: CompactTree = None
+        self.dirty = False
+        self.built = False
+        self.browse_duration: float = None                      # duration of the last build() in seconds
+        self.updates: int = 0                                   # nodes added to or removed from the tree after build()
+
+        self._node_management = None                            # NodeManagementService with the add and delete node hooks
+
+    async def build(self) -> int:
+        """
+        Browse the custom nodes below the Objects node and start following node additions and deletions.
+
+        Returns:
+            int: Number of nodes in the tree.
+
+        Raises:
+            RuntimeError: Another tree already follows the NodeManagementService of the server.
+        """
+        start_time = time.perf_counter()
+        self.close()
+        namespaces = await self.server.get_namespace_array()
+        self.custom_namespaces = {index for index, uri in enumerate(namespaces) if uri not in STANDARD_NAMESPACE_URIS}
+        self.root_node_id = self.server.nodes.objects.nodeid
+        self.children = {}
+        self.parents = {}
+        self.nodes = {}
+        self.pending = []
+        self.compact_tree = None
+        self.dirty = False
+
+        # The hook is installed before the walk, nodes added during the walk are applied afterwards
+        self._install_hook()
+        async for reference, parent_node_id, _ in walk_address_space(
+            _session= self.server.nodes.objects.session,
+            _root_node_id= self.root_node_id,
+            _node_filter= lambda reference: reference.NodeId.NamespaceIndex in self.custom_namespaces,
+            _concurrency= self.concurrency,
+            _batch_size= self.batch_size
+        ):
+            self.children.setdefault(parent_node_id, []).append(reference.NodeId)
+            self.parents[reference.NodeId] = parent_node_id
+            self.nodes[reference.NodeId] = (reference.BrowseName.Name, reference.NodeClass.name)
+        self.built = True
+        self.browse_duration = time.perf_counter() - start_time
+        self.apply_pending()
+        if self.logger is not None:
+            self.logger.info(f"Address space tree with {len(self.nodes)} nodes browsed in {self.browse_duration:.3f} s.")
+        return len(self.nodes)
+
+    async def update(self) -> int:
+        """
+        Bring the tree up to date, it is browsed again if it is dirty.
+
+        Returns:
+            int: Number of nodes added to or removed from the tree, or of nodes browsed if the tree was dirty.
+        """
+        if self.dirty or not self.built:
+            if self.logger is not None and self.dirty:
+                self.logger.warning(f"More than {self.max_pending} nodes changed, the address space tree is browsed again.")
+            return await self.build()
+        return self.apply_pending()
+
+    def apply_pending(self) -> int:
+        """
+        Apply the nodes which were added or deleted on the server since the last update.
+        Added nodes outside of the tree (other parents or standard namespaces) are ignored,
+        a deleted node is removed with its subtree.
+
+        Returns:
+            int: Number of nodes added to or removed from the tree.
+        """
+        pending, self.pending = self.pending, []
+        changed = 0
+        for parent_node_id, node_id, browse_name, node_class in pending:
+            if parent_node_id is None:
+                changed += self._remove_subtree(_node_id= node_id)
+                continue
+            if node_id in self.nodes or node_id.NamespaceIndex not in self.custom_namespaces:
+                continue
+            if parent_node_id != self.root_node_id and parent_node_id not in self.nodes:
+                continue
+            self.children.setdefault(parent_node_id, []).append(node_id)
+            self.parents[node_id] = parent_node_id
+            self.nodes[node_id] = (browse_name, node_class)
+            changed += 1
+        if changed:
+            self.compact_tree = None
+            self.updates += changed
+        return changed
+
+    def get_compact_tree(self) -> CompactTree:
+        """
+        Return the tree with the node information, it is only rebuilt if nodes were added.
+
+        Returns:
+            CompactTree: Node tree, None if build() was not called or the tree is dirty and has to be updated with update().
+        """
+        if not self.built or self.dirty:
+            return None
+        self.apply_pending()
+        if self.compact_tree is None:
+            tree = CompactTree()
+            tree.append(_id= 85, _depth= 0, _name= "root object", _information= "browseName: root object, ns: 0, i: 85, nodeClass: Objects")
+            stack = [(node_id, 1) for node_id in reversed(self.children.get(self.root_node_id, []))]
+            while stack:
+                node_id, level = stack.pop()
+                browse_name, node_class = self.nodes[node_id]
+                identifier = node_id.Identifier if isinstance(node_id.Identifier, (int, str)) else str(node_id.Identifier)
+                information = f"browseName: {browse_name}, ns: {node_id.NamespaceIndex}, i: {identifier}, nodeClass: {node_class}"
+                tree.append(_id= identifier, _depth= level, _name= browse_name, _information= information)
+                stack.extend((child, level + 1) for child in reversed(self.children.get(node_id, [])))
+            self.compact_tree = tree
+        return self.compact_tree
+
+    def close(self) -> None:
+        """ Stop following node additions and deletions """
+        if self._node_management is not None:
+            # The hooks are instance attributes, without them the methods of the class are used again
+            del self._node_management._add_node
+            del self._node_management._delete_node
+            self._node_management = None
+
+    def _remove_subtree(self, _node_id: ua.NodeId) -> int:
+        """
+        Remove a node and all nodes below it from the tree.
+
+        Args:
+            _node_id: Deleted node.
+
+        Returns:
+            int: Number of removed nodes, 0 if the node is not in the tree.
+        """
+        if _node_id not in self.nodes:
+            return 0
+        siblings = self.children.get(self.parents[_node_id], [])
+        siblings.remove(_node_id)
+        removed = 0
+        stack = [_node_id]
+        while stack:
+            node_id = stack.pop()
+            stack.extend(self.children.pop(node_id, []))
+            del self.parents[node_id]
+            del self.nodes[node_id]
+            removed += 1
+        return removed
+
+    def _record(self, _change: tuple) -> None:
+        """ Record a node change until the next read, past self.max_pending the changes are dropped and the tree is marked dirty """
+        if self.dirty:
+            return
+        if len(self.pending) >= self.max_pending:
+            self.pending = []
+            self.compact_tree = None
+            self.dirty = True
+            return
+        self.pending.append(_change)
+
+    def _install_hook(self) -> None:
+        """ Report every node added or deleted by the NodeManagementService of the server to the tree """
+        node_management = self.server.iserver.node_mgt_service
+        if "_add_node" in vars(node_management) or "_delete_node" in vars(node_management):
+            raise RuntimeError("The NodeManagementService of the server is already followed by another address space tree.")
+        add_node = node_management._add_node
+        delete_node = node_management._delete_node
+
+        def _add_node_hook(item: ua.AddNodesItem, *args, **kwargs) -> ua.AddNodesResult:
+            result = add_node(item, *args, **kwargs)
+            if result.StatusCode.is_good():
+                self._record(_change= (item.ParentNodeId, result.AddedNodeId, item.BrowseName.Name, item.NodeClass.name))
+            return result
+
+        def _delete_node_hook(item: ua.DeleteNodesItem, *args, **kwargs) -> ua.StatusCode:
+            status = delete_node(item, *args, **kwargs)
+            if status.is_good():
+                self._record(_change= (None, item.NodeId, None, None))
+            return status
+
+        node_management._add_node = _add_node_hook
+        node_management._delete_node = _delete_node_hook
+        self._node_management = node_management
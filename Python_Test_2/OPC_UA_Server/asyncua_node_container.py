@@ -1,8 +1,11 @@
+import time
+import asyncio
 import logging
 from asyncua import ua
 import OPC_UA_Server
 from .opc_ua_node import OPCUANode
 from .opc_ua_namespace import OPCUANamespace
+from Lib.dependencytree import CompactTree
 
 class OPCUANodeContainer:
     """
@@ -22,7 +25,9 @@ class OPCUANodeContainer:
             _namespace_jsons: list,
             _node_jsons: list,
             _logger: logging = None,
-            _logger_active: bool = True
+            _logger_active: bool = True,
+            _bulk_activation: bool = False,
+            _bulk_batch_size: int = 1000
         ) -> None:
         """
         Initialize the OPC UA Node Container.
@@ -33,6 +38,8 @@ class OPCUANodeContainer:
             _node_jsons (list): List of node JSON definitions.
             _logger (logging, optional): Logger instance from server.
             _logger_active (bool, optional): Enable or disable logging.
+            _bulk_activation (bool, optional): Activate nodes level by level with batched AddNodes requests.
+            _bulk_batch_size (int, optional): Maximum number of nodes per AddNodes request.
 
         Attributes:
             self.server (OPC_UA_Server): OPC UA server instance.
@@ -40,16 +47,21 @@ class OPCUANodeContainer:
             self.node_jsons (list): JSONs for nodes.
             self.logger (logging): Logger object.
             self.logger_active (bool): Flag to enable logging.
+            self.bulk_activation (bool): Flag to enable the batched activation mode.
+            self.bulk_batch_size (int): Maximum number of nodes per AddNodes request.
             self.namespaces (list[OPCUANamespace]): List of OPCUANamespace objects.
             self.nodes (list[OPCUANode]): List of OPCUANode objects.
             self.objects_node (Node): Server Objects node reference.
             self.objects_node_information (dict): Namespace index and identifier of Objects node.
             self.node_tree (list): Hierarchical tree of node ids.
             self.node_names (list): Node names for reference.
-            self.node_children (list): Node children info (future use).
-            self.server_node_tree (list): Tree structure of activated nodes on server.
-            self.server_node_information (list): Info about nodes on server.
-            self.server_node_names (list): Node names on server.
+            self.node_index (dict): Node lookup keyed by (ns, i).
+            self.node_children (dict): Child nodes keyed by the parent (ns, i).
+            self.activation_duration (float): Duration of the last node activation in seconds.
+            self.level_durations (list): Per level activation time of the last level-wise activation.
+            self.namespace_cache (dict): Namespace URI -> server index, None if invalidated.
+            self.namespace_array_reads (int): Counter of namespace array reads from the server.
+            self.server_node_tree (CompactTree): Tree of activated nodes on server with their names and info.
             self.known_objects (list): Known OPC UA node classes ("Object", "Variable", "Methode").
         """
         self.server: OPC_UA_Server = _server    # OPC UA Server instanze
@@ -57,6 +69,8 @@ class OPCUANodeContainer:
         self.node_jsons = _node_jsons           # node jsons
         self.logger = _logger                   # logger from server
         self.logger_active = _logger_active     # activate logger
+        self.bulk_activation = _bulk_activation # activate nodes with batched AddNodes requests
+        self.bulk_batch_size = _bulk_batch_size # maximum nodes per AddNodes request
 
         self.namespaces: list[OPCUANamespace] = []                      # namespace container
         self.nodes: list[OPCUANode] = []                                # nodes container
@@ -64,11 +78,14 @@ class OPCUANodeContainer:
         self.objects_node_information: list  = {"ns": None, "i": None}  # namespace index and identifier from objects node
         self.node_tree: list = []                                       # node tree
         self.node_names: list = []                                      # node names
-        self.node_children: list = []                                   # node children
+        self.node_index: dict = {}                                      # node lookup by (ns, i)
+        self.node_children: dict = {}                                   # node children by parent (ns, i)
+        self.activation_duration: float = None                          # duration of the last activate_nodes() in seconds
+        self.level_durations: list = []                                 # per level activation time of the last activate_nodes()
+        self.namespace_cache: dict = None                               # namespace uri -> server index, None if invalid
+        self.namespace_array_reads: int = 0                             # number of namespace array reads from the server
 
-        self.server_node_tree: list = []
-        self.server_node_information: list = []
-        self.server_node_names: list = []
+        self.server_node_tree: CompactTree = CompactTree()
 
         self.known_objects = ["Object", "Variable", "Methode"]  # all known node classes
 
@@ -106,8 +123,32 @@ class OPCUANodeContainer:
         """
         self.initialise_namespaces()
         self.initialise_nodes()
+        self.build_node_index()
         self.log_message("Namespaces and nodes are initialised")
         return 1
+
+    def build_node_index(self) -> int:
+        """
+        Build the node lookup and the parent->children index, keyed by (ns, i).
+        Children keep the order of the node JSON definitions.
+
+        Returns:
+            int: 1 if successful, -1 if no nodes initialized.
+        """
+        self.node_index = {}
+        self.node_children = {}
+        if not self.nodes:
+            self.log_message("Trying to build the node index, but no nodes are initialised. Abort building node index.", "warning")
+            return -1
+        for node in self.nodes:
+            key = (node.node_header["ns"], node.node_header["i"])
+            if key in self.node_index:
+                self.log_message(f"Node ns: {key[0]}, i: {key[1]} is defined twice. Only the first definition is indexed.", "warning")
+                continue
+            self.node_index[key] = node
+            parent_key = (node.node_header["parentNodeNamespace"], node.node_header["parentNodeId"])
+            self.node_children.setdefault(parent_key, []).append(node)
+        return 1
     
     def initialise_namespaces(self) -> int:
         """
@@ -152,106 +193,157 @@ class OPCUANodeContainer:
         for namespace in self.namespaces:
             try:
                 idx = await self.server.register_namespace(namespace.namespace_header["namespaceUri"])
+                self.invalidate_namespace_cache()
                 namespace.set_server_assigned_information(_server_namespace_id= idx, _server_namespaceUri= namespace.namespace_header["namespaceUri"])
                 self.log_message(f"Namespace added to server with the following information: ID={idx}, Namespace='{namespace.namespace_header["namespaceUri"]}', Description='{namespace.namespace_header["description"]}'")
             except Exception as e:
                 self.log_message(f"Trying to activate namespace, but the server exits with an error. Abort activating namespace. {e}", "error")
+        await self.refresh_namespace_cache()
         self.log_message("All namespaces are activated.")
         return 1
 
-    async def activate_nodes(self) -> int:
+    async def refresh_namespace_cache(self) -> int:
+        """
+        Read the server namespace array once and cache the URI -> server index mapping.
+
+        Returns:
+            int: 1 if successful, -1 if the namespace array could not be read.
+        """
+        try:
+            namespace_array = await self.server.get_namespace_array()
+        except Exception as e:
+            self.log_message(f"Trying to read the namespace array, but the server exits with an error. Abort refreshing namespace cache. {e}", "error")
+            return -1
+        self.namespace_array_reads += 1
+        self.namespace_cache = {uri: index for index, uri in enumerate(namespace_array)}
+        return 1
+
+    def invalidate_namespace_cache(self) -> int:
+        """
+        Drop the cached namespace array. Called whenever a namespace is registered.
+
+        Returns:
+            int: Always 1.
+        """
+        self.namespace_cache = None
+        return 1
+
+    async def get_namespace_index(self, _namespace_uri: str) -> int:
+        """
+        Resolve a namespace URI to its server index using the namespace cache.
+        The namespace array is only read from the server if the cache is invalid.
+
+        Args:
+            _namespace_uri (str): Namespace URI to resolve.
+
+        Returns:
+            int: Server namespace index.
+
+        Raises:
+            ValueError: If the namespace URI is not registered on the server.
+        """
+        if self.namespace_cache is None:
+            await self.refresh_namespace_cache()
+        if self.namespace_cache is None or _namespace_uri not in self.namespace_cache:
+            raise ValueError(f"'{_namespace_uri}' is not in the server namespace array")
+        return self.namespace_cache[_namespace_uri]
+
+    async def activate_nodes(self, _concurrency: int = 1) -> int:
         """
         Activate nodes on the server under their respective parents.
         This includes Objects, Variables, and Methods.
 
+        Args:
+            _concurrency (int, optional): Number of nodes activated at the same time.
+                                          1 activates the nodes one by one, depth first.
+
         Returns:
             int: 1 if successful, -1 if no nodes initialized.
         """
-        async def _iterate_node(_nodes: list[OPCUANode], _level: int, _parent: OPCUANode = None, _root: object = None) -> int:
+        async def _iterate_node(_root: object) -> int:
             """
-            Recursively iterate nodes to attach them under their parent nodes.
+            Walk the parent->children index once, depth first, and attach every node
+            under its already activated parent.
 
             Args:
-                _nodes (list[OPCUANode]): List of nodes to activate.
-                _level (int): Current tree depth.
-                _parent (OPCUANode, optional): Parent node reference.
-                _root (Node, optional): Root node reference for recursion.
+                _root (Node): Root node reference (server Objects node).
 
             Returns:
-                int: 1 if iteration completed, -1 otherwise.
+                int: Number of activated nodes.
             """
-            if _root is not None:
-                for node in _nodes:
-                    index = 0
-                    if node.node_header["parentNodeId"] == _root.nodeid.Identifier:
-                        await _activate_node(_node= node, _level= _level)
-                        _nodes = _nodes[:index] + _nodes[1 + index:]
-                        child_level = _level + 1
-                        await _iterate_node(_nodes = _nodes, _level = child_level, _parent= node)  
-                    index += 1
-                return 1
-            elif _parent is not None:
-                for node in _nodes:
-                    index = 0
-                    if node.node_header["parentNodeId"] == _parent.node_header["i"]:
-                        await _activate_node(_node= node, _level= _level)
-                        _nodes = _nodes[:index] + _nodes[1 + index:]
-                        child_level = _level + 1
-                        await _iterate_node(_nodes = _nodes, _level = child_level, _parent= node)  
-                    index += 1
-                return 1
-            return -1
+            activated = 0
+            root_key = (self.objects_node_information["ns"], self.objects_node_information["i"])
+            # Stack of (node, level, parent server node), children pushed reversed to keep the config order
+            stack = [(node, 1, _root) for node in reversed(self.node_children.get(root_key, []))]
+            while stack:
+                node, level, parent = stack.pop()
+                if await _activate_node(_node= node, _level= level, _parent= parent) != 1:
+                    continue
+                activated += 1
+                children = self.node_children.get((node.node_header["ns"], node.node_header["i"]), [])
+                for child in reversed(children):
+                    stack.append((child, level + 1, node.node))
+            return activated
 
-        async def _activate_node(_node: OPCUANode, _level: int) -> int:
+        async def _iterate_levels(_root: object, _width: int) -> int:
+            """
+            Walk the parent->children index level by level. The nodes of one level are
+            independent of each other and are activated by a pool of _width tasks.
+            A level starts only after its parent level is done.
+
+            Args:
+                _root (Node): Root node reference (server Objects node).
+                _width (int): Number of concurrent activation tasks.
+
+            Returns:
+                int: Number of activated nodes.
+            """
+            activated = 0
+            root_key = (self.objects_node_information["ns"], self.objects_node_information["i"])
+            # Pairs of (node, parent server node) for the current tree level
+            level_nodes = [(node, _root) for node in self.node_children.get(root_key, [])]
+            level = 1
+            while level_nodes:
+                level_start = time.perf_counter()
+                results = [None] * len(level_nodes)
+                pending = enumerate(level_nodes)
+
+                async def _worker() -> None:
+                    # The iterator is shared by all workers, every node is taken once
+                    for position, (node, parent) in pending:
+                        results[position] = await _activate_node(_node= node, _level= level, _parent= parent)
+
+                await asyncio.gather(*(_worker() for _ in range(min(_width, len(level_nodes)))))
+
+                next_level_nodes = []
+                for (node, _), result in zip(level_nodes, results):
+                    if result != 1:
+                        continue
+                    activated += 1
+                    for child in self.node_children.get((node.node_header["ns"], node.node_header["i"]), []):
+                        next_level_nodes.append((child, node.node))
+                self._log_level_duration(_level= level, _nodes= len(level_nodes), _duration= time.perf_counter() - level_start)
+                level_nodes = next_level_nodes
+                level += 1
+            return activated
+
+        async def _activate_node(_node: OPCUANode, _level: int, _parent: object) -> int:
             """
             Activate a single node on the server, assign it to the correct namespace and parent.
 
             Args:
                 _node (OPCUANode): Node to activate.
                 _level (int): Current depth in hierarchy.
+                _parent (Node): Parent node in server, resolved by the node index.
 
             Returns:
                 int: 1 if successful, -1 on error.
             """
-            ns = None
-            found_namespace = False
-
-            # Ensure namespaces exist
-            if not self.namespaces:
-                self.log_message("Trying to activate a node, but no namespaces are initialised. Abort activating namespace.", "error")
+            ns = await self.resolve_node_namespace(_node= _node)
+            if ns == -1:
                 return -1
 
-            # Find corresponding namespace
-            for namespace in self.namespaces:
-                if _node.node_header["namespaceUri"] in namespace.namespace_header["namespaceUri"]:
-                    try:
-                        namespace_server_id_array = await self.server.get_namespace_array()
-                        namespace_server_id = namespace_server_id_array.index(_node.node_header["namespaceUri"])
-                        _ns = namespace.server_assigned_header["ns"]
-                        if namespace_server_id == _ns:
-                            ns = _ns
-                            found_namespace = True
-                        else:
-                            self.log_message("Trying to activate a node, but no namespaces has the same index. Node gets server namespace index.", "warning")
-                            ns = namespace_server_id
-                            found_namespace = True
-                    except Exception as e:
-                        self.log_message(f"Trying to get namespace index, but the namespace is not activated. Abort getting namespace index. {e}", "error")
-                        return -1
-            if not found_namespace:
-                self.log_message("Trying to activate a node, but no matching namespaces uri exists in the server. Abort activating node.", "warning")
-                return -1
-            
-            # Determine parent node
-            if _node.node_header["parentNodeId"] == self.objects_node_information["i"] and _node.node_header["parentNodeNamespace"] == self.objects_node_information["ns"]:
-                await _start_node(_node= _node, _parent= self.objects_node, _ns= ns, _level= _level)
-            else:
-                for parent in self.nodes:
-                    if parent.server_assigned_header is not None:
-                        # Check if parent was found
-                        if _node.node_header["parentNodeId"] == parent.node_header["i"]  and _node.node_header["parentNodeNamespace"] == parent.node_header["ns"]:
-                            await _start_node(_node= _node, _parent= parent.node, _ns= ns, _level= _level)
-            return 1
+            return await _start_node(_node= _node, _parent= _parent, _ns= ns, _level= _level)
             
         async def _start_node(_node: OPCUANode, _parent: object, _ns: int, _level: int):
             """
@@ -262,6 +354,9 @@ class OPCUANodeContainer:
                 _parent (Node): Parent node in server.
                 _ns (int): Namespace index.
                 _level (int): Depth level for node tree tracking.
+
+            Returns:
+                int: 1 if successful, -1 if the node class can not be added.
             """
             idx = None
             match _node.node_header["nodeClass"]:
@@ -294,31 +389,9 @@ class OPCUANodeContainer:
                     
                     return -1
             _node.set_server_assigned_information(_server_node_idx= idx, _server_nodeUri= _node.node_header["namespaceUri"])
-            _write_to_tree(_node= _node, _level= _level)
             self.log_message(f"Node: {_node.node_header["browseName"]}, was added to the server with ns: {idx.nodeid.NamespaceIndex}, i: {idx.nodeid.Identifier}.")            
-            
-        def _write_to_tree(_node: OPCUANode, _level: int) -> int:
-            """
-            Maintain internal node tree and info structures.
-
-            Args:
-                _node (OPCUANode): Node added to server.
-                _level (int): Depth level in tree.
-
-            Returns:
-                int: Always 1.
-            """
-            entry = [None] * _level
-            entry.append(_node.node_header["i"])
-            name = _node.node_header["browseName"]
-            self.server_node_tree.append(entry)
-            # ns: i: nodeClass: browseName
-            information = (f"browseName: {_node.node_header['browseName']}, ns: {_node.server_assigned_header['ns']}, "
-                           f"i: {_node.server_assigned_header['i']}, nodeClass: {_node.node_header['nodeClass']}")
-            self.server_node_information.append([_node.node_header["i"], information])
-            self.server_node_names.append([_node.node_header["i"], name])
             return 1
-        
+            
         if not self.nodes:
             self.log_message("Trying to activate nodes, but no nodes are initialised. Abort activating nodes.", "warning")
             return -1
@@ -332,24 +405,245 @@ class OPCUANodeContainer:
             self.log_message(f"Trying to get root node, but the server exits with an error. Abort activating nodes. {e}", "error")
             return -1
         
-        level = 1
-        nodes_copy = self.nodes
+        # Build the index if the nodes were not loaded by load_namespaces_and_nodes()
+        if not self.node_index:
+            self.build_node_index()
+
         # Initialize tree with root object
-        self.server_node_tree.append([85])
-        self.server_node_information.append([85, "browseName: root object, ns: 0, i: 85, nodeClass: Objects"])
-        self.server_node_names.append([85, "root object"])
+        self.server_node_tree.clear()
+        self.server_node_tree.append(_id= 85, _depth= 0, _name= "root object", _information= "browseName: root object, ns: 0, i: 85, nodeClass: Objects")
 
-        await _iterate_node(_nodes= nodes_copy, _level = level, _root= self.objects_node)
+        start_time = time.perf_counter()
+        self.level_durations = []
+        if self.bulk_activation:
+            if _concurrency > 1:
+                self.log_message(f"Concurrency {_concurrency} is not used, the bulk activation adds every tree level with batched AddNodes requests.", "warning")
+            activated = await self.activate_nodes_bulk()
+        elif _concurrency > 1:
+            activated = await _iterate_levels(_root= self.objects_node, _width= _concurrency)
+        else:
+            activated = await _iterate_node(_root= self.objects_node)
+        self.activation_duration = time.perf_counter() - start_time
+        self._write_activated_tree()
+
+        if activated < len(self.nodes):
+            self.log_message(f"{len(self.nodes) - activated} nodes could not be activated, their parent is missing or failed.", "warning")
+        self.log_message(f"{activated} nodes are activated in {self.activation_duration:.3f} s, namespace array reads: {self.namespace_array_reads}.")
+        return 1
         
+    async def resolve_node_namespace(self, _node: OPCUANode) -> int:
+        """
+        Resolve the server namespace index of a node by its namespace URI.
+
+        Args:
+            _node (OPCUANode): Node to resolve.
+
+        Returns:
+            int: Server namespace index, -1 on error.
+        """
+        ns = None
+        found_namespace = False
+
+        # Ensure namespaces exist
+        if not self.namespaces:
+            self.log_message("Trying to activate a node, but no namespaces are initialised. Abort resolving namespace.", "error")
+            return -1
+
+        # Find corresponding namespace
+        for namespace in self.namespaces:
+            if _node.node_header["namespaceUri"] in namespace.namespace_header["namespaceUri"]:
+                try:
+                    namespace_server_id = await self.get_namespace_index(_node.node_header["namespaceUri"])
+                    _ns = namespace.server_assigned_header["ns"]
+                    if namespace_server_id == _ns:
+                        ns = _ns
+                        found_namespace = True
+                    else:
+                        self.log_message("Trying to activate a node, but no namespaces has the same index. Node gets server namespace index.", "warning")
+                        ns = namespace_server_id
+                        found_namespace = True
+                except Exception as e:
+                    self.log_message(f"Trying to get namespace index, but the namespace is not activated. Abort getting namespace index. {e}", "error")
+                    return -1
+        if not found_namespace:
+            self.log_message("Trying to activate a node, but no matching namespaces uri exists in the server. Abort activating node.", "warning")
+            return -1
+        return ns
+
+    async def activate_nodes_bulk(self) -> int:
+        """
+        Activate the nodes level by level with batched AddNodes requests.
+        All nodes of one tree level are created together, chunked by bulk_batch_size.
+        Access levels are part of the node attributes, so no extra write per variable is needed.
+
+        Returns:
+            int: Number of activated nodes.
+        """
+        session = self.objects_node.session
+        activated = 0
+        root_key = (self.objects_node_information["ns"], self.objects_node_information["i"])
+        # Pairs of (node, parent NodeId) for the current tree level
+        level_nodes = [(node, self.objects_node.nodeid) for node in self.node_children.get(root_key, [])]
+        level = 1
+        while level_nodes:
+            level_start = time.perf_counter()
+            items = []
+            pending = []
+            for node, parent_nodeid in level_nodes:
+                ns = await self.resolve_node_namespace(_node= node)
+                if ns == -1:
+                    continue
+                item = self._create_add_nodes_item(_node= node, _parent_nodeid= parent_nodeid, _ns= ns)
+                if item is None:
+                    continue
+                items.append(item)
+                pending.append(node)
+
+            next_level_nodes = []
+            for start in range(0, len(items), self.bulk_batch_size):
+                try:
+                    results = await session.add_nodes(items[start:start + self.bulk_batch_size])
+                except Exception as e:
+                    self.log_message(f"Trying to add nodes in bulk, but the server exits with an error. Abort activating batch. {e}", "error")
+                    continue
+                for node, result in zip(pending[start:start + self.bulk_batch_size], results):
+                    if not result.StatusCode.is_good():
+                        self.log_message(f"Node: {node.node_header['browseName']}, could not be added to the server. {result.StatusCode}", "error")
+                        continue
+                    node.set_server_assigned_information(_server_node_idx= self.server.get_node(result.AddedNodeId), _server_nodeUri= node.node_header["namespaceUri"])
+                    activated += 1
+                    for child in self.node_children.get((node.node_header["ns"], node.node_header["i"]), []):
+                        next_level_nodes.append((child, result.AddedNodeId))
+            self._log_level_duration(_level= level, _nodes= len(pending), _duration= time.perf_counter() - level_start)
+            level_nodes = next_level_nodes
+            level += 1
+        return activated
+
+    def _create_add_nodes_item(self, _node: OPCUANode, _parent_nodeid: ua.NodeId, _ns: int) -> ua.AddNodesItem:
+        """
+        Create the AddNodesItem of a node, matching the attributes of add_object() and add_variable().
+
+        Args:
+            _node (OPCUANode): Node to add.
+            _parent_nodeid (NodeId): NodeId of the parent in server.
+            _ns (int): Namespace index.
+
+        Returns:
+            AddNodesItem: Item for the AddNodes request, None if the node class can not be added.
+        """
+        qname = ua.QualifiedName(_node.node_header["browseName"], _ns)
+        item = ua.AddNodesItem()
+        item.RequestedNewNodeId = ua.NodeId(0, _ns)     # Identifier is assigned by the server
+        item.BrowseName = qname
+        item.ParentNodeId = _parent_nodeid
+        match _node.node_header["nodeClass"]:
+            case "Object":
+                # Objects is a folder, hence its children are organized
+                if _parent_nodeid == self.objects_node.nodeid:
+                    item.ReferenceTypeId = ua.NodeId(ua.ObjectIds.Organizes)
+                else:
+                    item.ReferenceTypeId = ua.NodeId(ua.ObjectIds.HasComponent)
+                item.NodeClass = ua.NodeClass.Object
+                item.TypeDefinition = ua.NodeId(ua.ObjectIds.BaseObjectType)
+                attrs = ua.ObjectAttributes()
+                attrs.EventNotifier = 0
+            case "Variable":
+                item.ReferenceTypeId = ua.NodeId(ua.ObjectIds.HasComponent)
+                item.NodeClass = ua.NodeClass.Variable
+                item.TypeDefinition = ua.NodeId(ua.ObjectIds.BaseDataVariableType)
+                variant = ua.Variant(_node.data["value"])
+                attrs = ua.VariableAttributes()
+                attrs.DataType = ua.NodeId(variant.VariantType.value)
+                attrs.Value = variant
+                attrs.ValueRank = ua.ValueRank.Scalar if not isinstance(variant.Value, (list, tuple)) else ua.ValueRank.OneDimension
+                attrs.Historizing = False
+
+                # Same access as add_variable() and set_writable(): readable by default, writeable adds the write bit
+                access = ua.AccessLevel.CurrentRead.mask
+                if _node.access["writeable"] == True:
+                    access |= ua.AccessLevel.CurrentWrite.mask
+                attrs.AccessLevel = access
+                attrs.UserAccessLevel = access
+            case _:
+                self.log_message(f"Node: {_node.node_header['browseName']}, nodeClass {_node.node_header['nodeClass']} can not be added in bulk.", "warning")
+                return None
+        attrs.Description = ua.LocalizedText(qname.Name)
+        attrs.DisplayName = ua.LocalizedText(qname.Name)
+        attrs.WriteMask = 0
+        attrs.UserWriteMask = 0
+        item.NodeAttributes = attrs
+        return item
+
+    def _log_level_duration(self, _level: int, _nodes: int, _duration: float) -> int:
+        """
+        Store and log the activation time of one tree level.
+
+        Args:
+            _level (int): Tree level.
+            _nodes (int): Number of nodes on this level.
+            _duration (float): Activation time of the level in seconds.
+
+        Returns:
+            int: Always 1.
+        """
+        self.level_durations.append({"level": _level, "nodes": _nodes, "duration": _duration})
+        self.log_message(f"Level {_level}: {_nodes} nodes are activated in {_duration:.3f} s.")
+        return 1
+
+    def _write_activated_tree(self) -> int:
+        """
+        Write all activated nodes to the node tree in depth first order.
+
+        Returns:
+            int: Always 1.
+        """
+        root_key = (self.objects_node_information["ns"], self.objects_node_information["i"])
+        stack = [(node, 1) for node in reversed(self.node_children.get(root_key, []))]
+        while stack:
+            node, level = stack.pop()
+            if node.server_assigned_header is None:
+                continue
+            self._write_to_tree(_node= node, _level= level)
+            for child in reversed(self.node_children.get((node.node_header["ns"], node.node_header["i"]), [])):
+                stack.append((child, level + 1))
+        return 1
+
+    def _write_to_tree(self, _node: OPCUANode, _level: int) -> int:
+        """
+        Maintain internal node tree and info structures.
+
+        Args:
+            _node (OPCUANode): Node added to server.
+            _level (int): Depth level in tree.
+
+        Returns:
+            int: Always 1.
+        """
+        # ns: i: nodeClass: browseName
+        information = (f"browseName: {_node.node_header['browseName']}, ns: {_node.server_assigned_header['ns']}, "
+                       f"i: {_node.server_assigned_header['i']}, nodeClass: {_node.node_header['nodeClass']}")
+        self.server_node_tree.append(_id= _node.node_header["i"], _depth= _level, _name= _node.node_header["browseName"], _information= information)
+        return 1
+
     def get_node_tree(self) -> dict:
         """
-        Return the internal representation of the node tree and node information.
+        Return the node tree and node information in the list format of dependencytree.
 
         Returns:
             dict: Contains "node_tree", "server_node_information", and "server_node_names".
         """
+        node_tree, server_node_names, server_node_information = self.server_node_tree.to_lists()
         return {
-            "node_tree": self.server_node_tree,
-            "server_node_information": self.server_node_information,
-            "server_node_names": self.server_node_names
-        }
\ No newline at end of file
+            "node_tree": node_tree,
+            "server_node_information": server_node_information,
+            "server_node_names": server_node_names
+        }
+
+    def get_compact_tree(self) -> CompactTree:
+        """
+        Return the node tree with names and node information.
+
+        Returns:
+            CompactTree: Tree of the activated nodes.
+        """
+        return self.server_node_tree
\ No newline at end of file
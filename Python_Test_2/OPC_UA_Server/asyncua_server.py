@@ -1,7 +1,10 @@
 import os
+import gzip
 import json
+import time
 import asyncio
 import logging
+import contextlib
 
 from typing import Literal
 
@@ -10,13 +13,17 @@ from asyncua import ua
 from asyncua.ua import NodeId
 
 from lxml import etree
-import xml.etree.ElementTree as ET
 
 from pathlib import Path
 from datetime import datetime
 
 from asyncua import Server
 from .asyncua_node_container import OPCUANodeContainer
+from .asyncua_address_space_tree import OPCUAAddressSpaceTree, STANDARD_NAMESPACE_URIS
+from Lib.addressspace import browse_batched, read_attribute_batched, walk_address_space
+from Lib.nodeset import load_nodeset
+from Lib.dependencytree import CompactTree
+from Lib.snapshot import hash_source_files, write_snapshot, read_snapshot, install_snapshot, restore_namespaces, load_snapshot_nodes
 
 # Standard OPC UA types mapping
 STANDARD_DATATYPES = {
@@ -76,6 +83,12 @@ BUILTIN_DATATYPE_ALIASES = {
     "DiagnosticInfo": "ns=0;i=25",
 }
 
+# Exported node classes and their NodeSet2 element
+EXPORT_NODE_TAGS = {
+    ua.NodeClass.Object: "UAObject",
+    ua.NodeClass.Variable: "UAVariable",
+}
+
 class OPCUAServer:
     """
     Asynchronous OPC UA server wrapper.
@@ -95,8 +108,12 @@ class OPCUAServer:
             _server_config_file: str = "server_config.json",
             _server_xml_path: str = "design_models",
             _server_xml_file: str = "server_design_model.xml",
+            _server_snapshot_path: str = "snapshots",
+            _server_snapshot_file: str = "server_snapshot.pickle",
+            _snapshot_source: Literal ["json", "xml"] = "json",
             _use_config_file: bool = None,
             _logger_path: str = None,
+            _bulk_activation: bool = None,
         ) -> None:
         """
         Initialize the OPC UA server object.
@@ -111,8 +128,13 @@ class OPCUAServer:
             _server_config_file: Configuration file name.
             _server_xml_path: Directory containing server design models files.
             _server_xml_file: Design model file name.
+            _server_snapshot_path: Directory containing the address space snapshot.
+            _server_snapshot_file: Address space snapshot file name.
+            _snapshot_source: Source the snapshot is built from, "json" or "xml".
             _use_config_file: If True, load settings from the config file.
             _logger_path: Path to store log files.
+            _bulk_activation: If True, nodes are activated with batched AddNodes requests. None uses the
+                              bulk_activation key of the config file, set values win over the config file.
 
         Returns:
             None
@@ -126,8 +148,13 @@ class OPCUAServer:
         self.server_config_file: str = _server_config_file          # Server configuration file name
         self.server_xml_path: str = _server_xml_path                # Path to server design model files
         self.server_xml_file: str = _server_xml_file                # Server design model file name
+        self.server_snapshot_path: str = _server_snapshot_path      # Path to the address space snapshot
+        self.server_snapshot_file: str = _server_snapshot_file      # Address space snapshot file name
+        self.snapshot_source: str = _snapshot_source                # Source the snapshot is built from
+        self.loaded_by_snapshot: bool = False                       # True if loaded by snapshot file
         self.loaded_by_xml: bool = False                            # True if loaded by xml file
         self.use_config_file: bool = _use_config_file               # Whether to use configuration file or preconfigured parameters
+        self.bulk_activation: bool = _bulk_activation == True       # Activate nodes with batched AddNodes requests
         self.module_path = Path(__file__).parent                    # Get module path
 
         # ------------------------------------------------------------------ #
@@ -163,17 +190,27 @@ class OPCUAServer:
                 self.endpoint = config_data.get("endpoint", self.endpoint)                      # Get endpoint
                 self.namespace_jsons = config_data.get("namespaces", self.namespace_jsons)      # Get namespaces json
                 self.node_jsons = config_data.get("nodes", self.node_jsons)                     # Get nodes json
+                if _bulk_activation is None:
+                    self.bulk_activation = config_data.get("bulk_activation", self.bulk_activation) # Get bulk activation mode
+                self.snapshot_source = config_data.get("snapshot_source", self.snapshot_source) # Get snapshot source
         
         self._running: bool = False                     # Server running state
         self.server: Server | None = None               # OPC UA Server instance
         self._server_task: asyncio.Task | None = None   # Background server task
+        self.phase_durations: dict = {}                 # Startup phase name -> duration in seconds
+        self.type_names: dict = {}                      # Reference type and datatype NodeId -> browse name
+        self.exported_nodes: int = 0                    # Number of nodes of the last export
+        self.xml_statistics: dict = {}                  # Node, batch and deferred node counts of the last xml load
+        self.snapshot_node_tree: dict = None            # Node tree stored in the loaded snapshot
+        self.address_space_tree: OPCUAAddressSpaceTree = None  # Node tree browsed from the running server
+        self._snapshot_task: asyncio.Task | None = None # Background task unpickling the snapshot nodes
 
         self.logger.info("-------------------- OPC-UA server class is created --------------------")
     # ---------------------------------------------------------------------- #
     # Lifecycle management
     # ---------------------------------------------------------------------- #
 
-    async def autostart(self, source: Literal ["json", "xml"] = "json") -> int:
+    async def autostart(self, source: Literal ["json", "xml", "snapshot"] = "json", concurrency: int = 1) -> int:
         """
         Automatically initialize, start, and populate the OPC UA server.
 
@@ -183,6 +220,12 @@ class OPCUAServer:
             3. Create a node container if missing.
             4. Load and activate namespaces and nodes.
 
+        Args:
+            source: Build the address space from the json config, the xml design model or
+                    the snapshot of the address space built from them.
+            concurrency: Number of json nodes activated at the same time. Independent
+                         subtrees are activated level by level, parents before children.
+
         Returns:
             int
         """
@@ -203,10 +246,12 @@ class OPCUAServer:
                     self.logger.info("OPC-UA nodes are created by autostart ...")
                     await self.init_node_container()
                     self.load_namespaces_and_nodes_to_container()
-                    await self.activate_namespaces_and_nodes_on_server()
+                    await self.activate_namespaces_and_nodes_on_server(_concurrency= concurrency)
             case "xml":
                 await self.start_xml_server()
                 self.loaded_by_xml = True
+            case "snapshot":
+                await self.start_snapshot_server(_concurrency= concurrency)
             case _:
                 self.logger.error(f"{source} not found, server has not started!")
                 return -1        
@@ -214,10 +259,16 @@ class OPCUAServer:
         self.logger.info("-------------------- OPC-UA server has autostarted --------------------")
         return 1
 
-    async def start_xml_server(self) -> int:
+    async def start_xml_server(self, _batch_size: int = 1000) -> int:
         """
         Initialize and start the OPC UA server using a NodeSet2 XML design model.
 
+        The design model is read in a single streaming pass, namespaces are registered
+        from its header and the nodes are added in batches while the file is parsed.
+
+        Args:
+            _batch_size: Number of parsed nodes added to the server at once.
+
         Returns:
             int:
         """
@@ -226,43 +277,125 @@ class OPCUAServer:
             await self.init_server()
             self.logger.info("OPC-UA server was created by autostart ...")
 
-        # Load namespaces from XML automatically
+        # Design model file
         xml_file = os.path.join(
             self.module_path,
             self.server_xml_path,
             self.server_xml_file
         )
-        tree = ET.parse(xml_file)
-        root = tree.getroot()
-
-        # Namespace for NodeSet XML
-        ns = {"ua": "http://opcfoundation.org/UA/2011/03/UANodeSet.xsd"}
-
-        for uri_elem in root.findall("ua:NamespaceUris/ua:Uri", ns):
-            uri = uri_elem.text
-            if uri:
-                await self.server.register_namespace(uri)
-
-        # Import all nodes from XML
-        await self.server.import_xml(xml_file)
+        # Register the namespaces and import all nodes with one pass over the XML file
+        start_time = time.perf_counter()
+        self.xml_statistics = await load_nodeset(_server= self.server, _xml_file= xml_file, _batch_size= _batch_size)
+        self.phase_durations["activate_namespaces"] = self.xml_statistics["namespaces_duration"]
+        self.logger.info(f"Loaded {self.xml_statistics['nodes']} nodes in {self.xml_statistics['batches']} batches, {self.xml_statistics['deferred']} nodes waited for a dependency")
+        self.record_phase("import_xml", start_time)
 
         # Check if server is running:
         if not self._running:
             await self.start_server()
             self.logger.info("OPC-UA server was started by autostart ...")
+        return 1
 
-    async def init_server(self) -> int:
+    async def start_snapshot_server(self, _concurrency: int = 1) -> int:
         """
-        Create and configure the underlying asyncua.Server instance.
+        Initialize and start the OPC UA server from the address space snapshot.
+
+        If the snapshot is missing or was built from other source files, the address space
+        is built from the snapshot source ("json" or "xml") and the snapshot is written for
+        the next start. Snapshot nodes are unpickled on first access and in the background.
+
+        Args:
+            _concurrency: Number of json nodes activated at the same time when the snapshot is built.
+
+        Returns:
+            int
+        """
+        snapshot_file = os.path.join(self.module_path, self.server_snapshot_path, self.server_snapshot_file)
+        source_hash = self.get_snapshot_source_hash()
+
+        snapshot = None
+        if not self.server:
+            start_time = time.perf_counter()
+            snapshot = read_snapshot(_file= snapshot_file, _source_hash= source_hash)
+            self.record_phase("read_snapshot", start_time)
+
+        if snapshot is not None and await self.init_server(_snapshot= snapshot) == 1:
+            start_time = time.perf_counter()
+            if await restore_namespaces(_server= self.server, _snapshot= snapshot) == 1:
+                self.record_phase("restore_namespaces", start_time)
+                self.snapshot_node_tree = snapshot["data"].get("node_tree")
+                self.loaded_by_xml = snapshot["data"].get("loaded_by_xml", False)
+                self.loaded_by_snapshot = True
+                if not self._running:
+                    await self.start_server()
+                self._snapshot_task = asyncio.create_task(load_snapshot_nodes(_server= self.server))
+                self.logger.info(f"OPC-UA server was loaded from snapshot {snapshot_file} ...")
+                return 1
+            self.logger.warning("Snapshot namespaces do not match the server, the snapshot is rebuilt ...")
+            self.server = None
+
+        self.logger.info(f"No valid snapshot found, building the server from {self.snapshot_source} ...")
+        await self.autostart(source= self.snapshot_source, concurrency= _concurrency)
+        await self.write_server_snapshot(_file= snapshot_file, _source_hash= source_hash)
+        return 1
+
+    async def write_server_snapshot(self, _file: str = None, _source_hash: str = None) -> int:
+        """
+        Write the current address space to the snapshot file.
+
+        Args:
+            _file: Snapshot file, default is the configured snapshot file.
+            _source_hash: Hash of the snapshot sources, default is get_snapshot_source_hash().
 
         Returns:
             int
         """
+        if _file is None:
+            _file = os.path.join(self.module_path, self.server_snapshot_path, self.server_snapshot_file)
+        if _source_hash is None:
+            _source_hash = self.get_snapshot_source_hash()
+
+        start_time = time.perf_counter()
+        data = {"node_tree": self.get_server_node_tree(), "loaded_by_xml": self.loaded_by_xml}
+        nodes = await write_snapshot(_server= self.server, _file= _file, _source_hash= _source_hash, _data= data)
+        self.record_phase("write_snapshot", start_time)
+        self.logger.info(f"Snapshot with {nodes} nodes written to {_file}")
+        return 1
+
+    def get_snapshot_source_hash(self) -> str:
+        """
+        Content hash of the files the snapshot is built from.
+
+        Returns:
+            str: sha256 hex digest of the snapshot source.
+        """
+        if self.snapshot_source == "xml":
+            return hash_source_files(_files= [os.path.join(self.module_path, self.server_xml_path, self.server_xml_file)], _salt= "xml")
+        if self.use_config_file == True:
+            return hash_source_files(_files= [os.path.join(self.module_path, self.server_config_path, self.server_config_file)], _salt= "json")
+        # Preconfigured namespaces and nodes
+        return hash_source_files(_files= [], _salt= "json|" + json.dumps([self.endpoint, self.namespace_jsons, self.node_jsons], sort_keys= True))
+
+    async def init_server(self, _snapshot: dict = None) -> int:
+        """
+        Create and configure the underlying asyncua.Server instance.
+
+        Args:
+            _snapshot: Optional snapshot from read_snapshot(), replaces the generated standard address space.
 
+        Returns:
+            int: 1, -1 if the snapshot can not be installed.
+        """
+        start_time = time.perf_counter()
         self.server = Server()
+        if _snapshot is not None and install_snapshot(_server= self.server, _snapshot= _snapshot) != 1:
+            self.logger.warning("The address space of this asyncua version can not be loaded from a snapshot ...")
+            self.server = None
+            return -1
         await self.server.init()
         self.server.set_endpoint(self.endpoint)
         self.server.set_server_name(self.server_name)
+        self.record_phase("init_server", start_time)
 
         self.logger.info("-------------------- OPC-UA server is initialised --------------------")
         return 1
@@ -281,8 +414,10 @@ class OPCUAServer:
             self.logger.warning("Trying to start a running server. Abort starting server.")
             return -1
         
+        start_time = time.perf_counter()
         await self.server.start()
         self._running = True
+        self.record_phase("start_server", start_time)
         self.logger.info("----------------------------------------------------------------------------------")
         self.logger.info("OPC UA Server started!")
         self.logger.info(f"Endpoint URL: {self.server.endpoint}")
@@ -305,10 +440,31 @@ class OPCUAServer:
             return -1
 
         self._running = False 
+        if self._snapshot_task is not None:
+            self._snapshot_task.cancel()
+            self._snapshot_task = None
+        if self.address_space_tree is not None:
+            self.address_space_tree.close()
+            self.address_space_tree = None
         await self.server.stop()
         self.logger.info("-------------------- OPC-UA server stoped --------------------")
         return 1
     
+    def record_phase(self, _phase: str, _start_time: float) -> int:
+        """
+        Store and log the duration of a startup phase.
+
+        Args:
+            _phase: Name of the phase, e.g. "init_server" or "import_xml".
+            _start_time: time.perf_counter() value at the start of the phase.
+
+        Returns:
+            int
+        """
+        self.phase_durations[_phase] = time.perf_counter() - _start_time
+        self.logger.info(f"Phase {_phase} took {self.phase_durations[_phase]:.3f} s")
+        return 1
+
     # ---------------------------------------------------------------------- #
     # Node management
     # ---------------------------------------------------------------------- #
@@ -330,7 +486,8 @@ class OPCUAServer:
             _namespace_jsons= self.namespace_jsons,
             _node_jsons= self.node_jsons,
             _logger= self.logger,
-            _logger_active= True
+            _logger_active= True,
+            _bulk_activation= self.bulk_activation
         )
         self.logger.info("-------------------- OPC-UA node container initialised --------------------")
         return 1
@@ -346,13 +503,18 @@ class OPCUAServer:
             self.logger.warning("Trying to load namespaces and nodes to a container, but no exists. Abort adding namespaces and nodes.")
             return -1
         
+        start_time = time.perf_counter()
         self.node_container.load_namespaces_and_nodes()
+        self.record_phase("load_namespaces_and_nodes", start_time)
         return 1
  
-    async def activate_namespaces_and_nodes_on_server(self) -> int:
+    async def activate_namespaces_and_nodes_on_server(self, _concurrency: int = 1) -> int:
         """
         Register all namespaces and nodes with the running server.
 
+        Args:
+            _concurrency: Number of nodes activated at the same time.
+
         Returns:
             int
         """
@@ -360,10 +522,40 @@ class OPCUAServer:
             self.logger.warning("Trying to activate namespaces and nodes on server, but no container exists. Abort activating namespaces and nodes.")
             return -1
         
+        start_time = time.perf_counter()
         await self.node_container.activate_namespaces()
-        await self.node_container.activate_nodes()
+        self.record_phase("activate_namespaces", start_time)
+
+        start_time = time.perf_counter()
+        await self.node_container.activate_nodes(_concurrency= _concurrency)
+        self.record_phase("activate_nodes", start_time)
         return 1
 
+    async def build_address_space_tree(self, _batch_size: int = 1000, _concurrency: int = 1) -> int:
+        """
+        Browse the node tree from the running server, e.g. if it was loaded by xml.
+        The tree is cached and follows nodes added or deleted later, it is only browsed again
+        if too many nodes changed since the last call.
+
+        Args:
+            _batch_size: Maximum nodes per Browse request.
+            _concurrency: Number of Browse requests in flight.
+
+        Returns:
+            int: Number of nodes in the tree, -1 if the server is not running.
+        """
+        if not self.server or not self._running:
+            self.logger.error("Server is not running, cannot browse the node tree.")
+            return -1
+        if self.address_space_tree is None:
+            start_time = time.perf_counter()
+            self.address_space_tree = OPCUAAddressSpaceTree(_server= self.server, _logger= self.logger, _batch_size= _batch_size, _concurrency= _concurrency)
+            await self.address_space_tree.build()
+            self.record_phase("browse_node_tree", start_time)
+        else:
+            await self.address_space_tree.update()
+        return len(self.address_space_tree.nodes)
+
     def get_server_node_tree(self) -> dict:
         """
         Return the current server node tree from the container.
@@ -371,18 +563,51 @@ class OPCUAServer:
         Returns:
             dict: Hierarchical node information.
         """
+        if self.address_space_tree is not None and not self.address_space_tree.dirty:
+            node_tree, server_node_names, server_node_information = self.address_space_tree.get_compact_tree().to_lists()
+            return {"node_tree": node_tree, "server_node_information": server_node_information, "server_node_names": server_node_names}
+        if self.snapshot_node_tree is not None:
+            return self.snapshot_node_tree
         if not self.loaded_by_xml:
             return self.node_container.get_node_tree()
         else:
             return {'node_tree': [[404]], 'server_node_information': [[404, 'Node-tree is not printable']]}
+
+    def get_server_compact_tree(self) -> CompactTree:
+        """
+        Return the current server node tree as compact tree.
+
+        Returns:
+            CompactTree: Node tree with the node information.
+        """
+        if self.address_space_tree is not None and not self.address_space_tree.dirty:
+            return self.address_space_tree.get_compact_tree()
+        if self.snapshot_node_tree is None and not self.loaded_by_xml:
+            return self.node_container.get_compact_tree()
+        node_tree = self.get_server_node_tree()
+        return CompactTree.from_lists(
+            node_tree["node_tree"],
+            _object_names= node_tree.get("server_node_names", []),
+            _information= node_tree.get("server_node_information", [])
+        )
                 
-    async def export_server_model(self, output_file: str = None) -> int:
+    async def export_server_model(self, output_file: str = None, _batch_size: int = 1000, _streaming: bool = False, _gzip: bool = False, _concurrency: int = 1) -> int:
         """
         Export the current server address space to a NodeSet2 XML file
         using datatype aliases for built-in types.
 
+        Nodes are collected with batched Browse requests and their attributes are read
+        with batched Read requests. Browse names of reference types and datatypes are cached.
+
         Args:
             output_file: Optional path to the output XML file.
+            _batch_size: Maximum nodes per Browse or Read request.
+            _streaming: If True, every chunk of _batch_size nodes is written to the file while
+                        the address space is walked, in walk order (level by level). No node
+                        list or XML tree is kept, only the walk keeps its visited NodeIds.
+                        Without streaming the nodes are collected first and written depth first.
+            _gzip: If True, the file is gzip compressed and gets the suffix ".gz".
+            _concurrency: Number of Browse requests in flight while collecting the nodes.
 
         Returns:
             int: 1 on success, -1 on failure.
@@ -390,34 +615,25 @@ class OPCUAServer:
         if not self.server or not self._running:
             self.logger.error("Server is not running, cannot export model.")
             return -1
+        start_time = time.perf_counter()
 
         # Get all namespaces
         namespaces = await self.server.get_namespace_array()
         self.logger.info(f"Namespaces: {namespaces}")
 
         # Identify custom URIs (exclude standard OPC UA URIs)
-        standard_ns = [
-            "http://opcfoundation.org/UA/",
-            "http://opcfoundation.org/UA/DI/",
-            "http://opcfoundation.org/UA/ADI/",
-            "http://opcfoundation.org/UA/MDIS/"
-        ]
-        custom_ns_indices = [i for i, ns in enumerate(namespaces) if ns not in standard_ns]
+        custom_ns_indices = [i for i, ns in enumerate(namespaces) if ns not in STANDARD_NAMESPACE_URIS]
         self.logger.info(f"Custom namespace indices: {custom_ns_indices}")
 
-        # Recursively collect all custom nodes under Objects
-        root_node = self.server.nodes.objects
+        session = self.server.nodes.objects.session
 
-        async def collect_nodes(node: Node):
-            nodes = []
-            for child in await node.get_children():
-                if child.nodeid.NamespaceIndex in custom_ns_indices:
-                    nodes.append(child)
-                    nodes.extend(await collect_nodes(child))
-            return nodes
-
-        custom_nodes = await collect_nodes(root_node)
-        self.logger.info(f"Found {len(custom_nodes)} custom nodes.")
+        # Determine output path
+        if output_file is None:
+            out_folder = os.path.join(os.path.dirname(os.path.abspath(__file__)), "design_models")
+            os.makedirs(out_folder, exist_ok=True)
+            output_file = os.path.join(out_folder, "server_design_model.xml")
+        if _gzip and not output_file.endswith(".gz"):
+            output_file += ".gz"
 
         # Build XML with NodeSet2 namespace
         nsmap = {
@@ -426,90 +642,189 @@ class OPCUAServer:
             "xsd": "http://www.w3.org/2001/XMLSchema",
             None: "http://opcfoundation.org/UA/2011/03/UANodeSet.xsd"
         }
-        root_elem = etree.Element("UANodeSet", nsmap=nsmap)
 
         # NamespaceUris block
-        ns_uris_elem = etree.SubElement(root_elem, "NamespaceUris")
+        ns_uris_elem = etree.Element("NamespaceUris")
         for i in custom_ns_indices:
             uri_elem = etree.SubElement(ns_uris_elem, "Uri")
             uri_elem.text = namespaces[i]
 
         # Aliases block (datatype aliases only)
-        aliases_elem = etree.SubElement(root_elem, "Aliases")
+        aliases_elem = etree.Element("Aliases")
         for alias, nodeid in BUILTIN_DATATYPE_ALIASES.items():
             alias_elem = etree.SubElement(aliases_elem, "Alias", Alias=alias)
             # Only identifier, omit ns=0 for aliases
             alias_elem.text = nodeid
 
-        # Write each node
-        for node in custom_nodes:
-            nc = await node.read_node_class()
-            browse_name = await node.read_browse_name()
-            display_name = await node.read_display_name()
-
-            # Only export objects and variables
-            tag = None
-            if nc.name == "Object":
-                tag = "UAObject"
-            elif nc.name == "Variable":
-                tag = "UAVariable"
-            else:
-                continue
-
-            node_elem = etree.SubElement(root_elem, tag)
-            node_elem.set("NodeId", f"ns={node.nodeid.NamespaceIndex};i={node.nodeid.Identifier}")
-            node_elem.set("BrowseName", f"{browse_name.NamespaceIndex}:{browse_name.Name}")
-
-            # DisplayName
-            dn_elem = etree.SubElement(node_elem, "DisplayName")
-            dn_elem.text = display_name.Text or browse_name.Name
-
-            # ParentNodeId if present
-            try:
-                parent = await node.get_parent()
-                if parent is not None:
-                    node_elem.set("ParentNodeId", f"ns={parent.nodeid.NamespaceIndex};i={parent.nodeid.Identifier}")
-            except Exception:
-                pass
-
-            # References block
-            refs_elem = etree.SubElement(node_elem, "References")
-            refs = await node.get_references()
-            for ref in refs:
-                ref_type_node = self.server.get_node(ref.ReferenceTypeId)
-                ref_type_browse = await ref_type_node.read_browse_name()
-                try:
-                    target_nodeid = ref.NodeId
-                except AttributeError:
-                    continue
-
-                ref_elem = etree.SubElement(
-                    refs_elem,
-                    "Reference",
-                    ReferenceType=str(ref_type_browse.Name),
-                    IsForward=str(ref.IsForward).lower()
-                )
-                ref_elem.text = f"ns={target_nodeid.NamespaceIndex};i={target_nodeid.Identifier}"
-
-            # Set DataType for variables only
-            if tag == "UAVariable":
-                try:
-                    dtype = await node.read_data_type()
-                    dtype_node = self.server.get_node(dtype)
-                    dtype_browse = await dtype_node.read_browse_name()
-                    if dtype_browse.Name in BUILTIN_DATATYPE_ALIASES:
-                        node_elem.set("DataType", dtype_browse.Name)
-                except Exception:
-                    # fallback: do nothing if datatype can't be read
-                    pass
+        # All custom nodes under Objects, one batched Browse per chunk of a tree level
+        walk = walk_address_space(
+            _session= session,
+            _root_node_id= self.server.nodes.objects.nodeid,
+            _node_filter= lambda reference: reference.NodeId.NamespaceIndex in custom_ns_indices,
+            _concurrency= _concurrency,
+            _batch_size= _batch_size
+        )
+        found_nodes = 0
+        self.exported_nodes = 0
+        if _streaming:
+            # Every chunk of _batch_size nodes is written while the walk goes on, in walk order.
+            # Only the walk itself keeps its visited NodeIds and the NodeIds of the current tree level
+            with (gzip.open(output_file, "wb") if _gzip else open(output_file, "wb")) as out_file:
+                with etree.xmlfile(out_file, encoding="UTF-8") as xml_file:
+                    xml_file.write_declaration()
+                    with xml_file.element("UANodeSet", nsmap=nsmap):
+                        xml_file.write("\n")
+                        xml_file.write(ns_uris_elem, pretty_print=True)
+                        xml_file.write(aliases_elem, pretty_print=True)
+                        chunk = []
+                        async with contextlib.aclosing(walk):
+                            async for ref, parent_id, _ in walk:
+                                found_nodes += 1
+                                if ref.NodeClass in EXPORT_NODE_TAGS:
+                                    chunk.append((ref, parent_id))
+                                if len(chunk) >= _batch_size:
+                                    await self._write_node_elements(_xml_file= xml_file, _session= session, _nodes= chunk, _batch_size= _batch_size)
+                                    chunk = []
+                        await self._write_node_elements(_xml_file= xml_file, _session= session, _nodes= chunk, _batch_size= _batch_size)
+        else:
+            children = {}       # parent NodeId -> ReferenceDescriptions of the custom children
+            async for ref, parent_id, _ in walk:
+                found_nodes += 1
+                children.setdefault(parent_id, []).append((ref, parent_id))
+
+            # Depth first order, so the exported file keeps a stable node order. Only objects and variables are exported
+            export_nodes = []
+            stack = list(reversed(children.get(self.server.nodes.objects.nodeid, [])))
+            while stack:
+                ref, parent_id = stack.pop()
+                if ref.NodeClass in EXPORT_NODE_TAGS:
+                    export_nodes.append((ref, parent_id))
+                stack.extend(reversed(children.get(ref.NodeId, [])))
+            del children
+
+            root_elem = etree.Element("UANodeSet", nsmap=nsmap)
+            root_elem.append(ns_uris_elem)
+            root_elem.append(aliases_elem)
+            async for node_elem in self._create_node_elements(_session= session, _nodes= export_nodes, _batch_size= _batch_size):
+                root_elem.append(node_elem)
+            self.exported_nodes = len(export_nodes)
+            tree = etree.ElementTree(root_elem)
+            tree.write(output_file, pretty_print=True, xml_declaration=True, encoding="UTF-8", compression=9 if _gzip else 0)
+
+        self.logger.info(f"Found {found_nodes} custom nodes.")
+        self.record_phase("export_server_model", start_time)
+        self.logger.info(f"Exported {self.exported_nodes} nodes to NodeSet2 XML {output_file}, "
+                         f"{self.exported_nodes / max(self.phase_durations['export_server_model'], 1e-9):.0f} nodes/s")
+        return 1
 
-        # Determine output path
-        if output_file is None:
-            out_folder = os.path.join(os.path.dirname(os.path.abspath(__file__)), "design_models")
-            os.makedirs(out_folder, exist_ok=True)
-            output_file = os.path.join(out_folder, "server_design_model.xml")
+    async def _write_node_elements(self, _xml_file: object, _session: object, _nodes: list, _batch_size: int) -> int:
+        """
+        Write the NodeSet2 elements of one chunk of nodes to a streamed XML file.
+
+        Args:
+            _xml_file: Open lxml xmlfile writer.
+            _session: asyncua session used for the batched requests.
+            _nodes: (ReferenceDescription, parent NodeId) of the exported objects and variables.
+            _batch_size: Maximum nodes per Browse or Read request.
 
-        tree = etree.ElementTree(root_elem)
-        tree.write(output_file, pretty_print=True, xml_declaration=True, encoding="UTF-8")
-        self.logger.info(f"Exported NodeSet2 XML to {output_file}")
-        return 1
\ No newline at end of file
+        Returns:
+            int: Number of written elements.
+        """
+        async for node_elem in self._create_node_elements(_session= _session, _nodes= _nodes, _batch_size= _batch_size):
+            _xml_file.write(node_elem, pretty_print=True)
+        _xml_file.flush()
+        self.exported_nodes += len(_nodes)
+        return len(_nodes)
+
+    async def _create_node_elements(self, _session: object, _nodes: list, _batch_size: int):
+        """
+        Create the NodeSet2 elements of the exported nodes, one chunk of _batch_size nodes at a time.
+        References and datatypes of a chunk are fetched with one batched Browse and Read.
+
+        Args:
+            _session: asyncua session used for the batched requests.
+            _nodes: (ReferenceDescription, parent NodeId) of the exported objects and variables.
+            _batch_size: Maximum nodes per Browse or Read request.
+
+        Yields:
+            etree.Element: UAObject or UAVariable element.
+        """
+        for start in range(0, len(_nodes), _batch_size):
+            chunk = _nodes[start:start + _batch_size]
+
+            # All references of the chunk. A null reference type returns all references
+            # without resolving the subtypes of References on the server
+            node_references = await browse_batched(
+                _session= _session,
+                _node_ids= [ref.NodeId for ref, _ in chunk],
+                _reference_type= ua.ObjectIds.Null,
+                _direction= ua.BrowseDirection.Both,
+                _batch_size= _batch_size
+            )
+
+            # DataTypes of the variables in the chunk
+            variable_node_ids = [ref.NodeId for ref, _ in chunk if ref.NodeClass == ua.NodeClass.Variable]
+            data_types = {}
+            for node_id, data_value in zip(variable_node_ids, await read_attribute_batched(_session= _session, _node_ids= variable_node_ids, _attribute= ua.AttributeIds.DataType, _batch_size= _batch_size)):
+                if data_value.StatusCode.is_good():
+                    data_types[node_id] = data_value.Value.Value
+
+            # Browse names of reference types and datatypes, only unknown ones are read
+            type_node_ids = {ref.ReferenceTypeId for references in node_references for ref in references}
+            type_node_ids.update(data_types.values())
+            await self._cache_type_names(_session= _session, _node_ids= type_node_ids, _batch_size= _batch_size)
+
+            for (ref, parent), references in zip(chunk, node_references):
+                node_id = ref.NodeId
+                browse_name = ref.BrowseName
+                tag = EXPORT_NODE_TAGS[ref.NodeClass]
+
+                node_elem = etree.Element(tag)
+                node_elem.set("NodeId", f"ns={node_id.NamespaceIndex};i={node_id.Identifier}")
+                node_elem.set("BrowseName", f"{browse_name.NamespaceIndex}:{browse_name.Name}")
+
+                # DisplayName
+                dn_elem = etree.SubElement(node_elem, "DisplayName")
+                dn_elem.text = ref.DisplayName.Text or browse_name.Name
+
+                # ParentNodeId
+                node_elem.set("ParentNodeId", f"ns={parent.NamespaceIndex};i={parent.Identifier}")
+
+                # References block
+                refs_elem = etree.SubElement(node_elem, "References")
+                for reference in references:
+                    target_nodeid = reference.NodeId
+                    # Reference types without a readable browse name are written as NodeId, a NodeSet2 allows both
+                    ref_elem = etree.SubElement(
+                        refs_elem,
+                        "Reference",
+                        ReferenceType=self.type_names.get(reference.ReferenceTypeId) or reference.ReferenceTypeId.to_string(),
+                        IsForward=str(reference.IsForward).lower()
+                    )
+                    ref_elem.text = f"ns={target_nodeid.NamespaceIndex};i={target_nodeid.Identifier}"
+
+                # Set DataType for variables only
+                if tag == "UAVariable":
+                    dtype_name = self.type_names.get(data_types.get(node_id))
+                    if dtype_name in BUILTIN_DATATYPE_ALIASES:
+                        node_elem.set("DataType", dtype_name)
+                yield node_elem
+
+    async def _cache_type_names(self, _session: object, _node_ids: set, _batch_size: int) -> int:
+        """
+        Read the browse names of reference types and datatypes which are not cached yet.
+
+        Args:
+            _session: asyncua session used for the batched Read.
+            _node_ids: NodeIds of reference types and datatypes.
+            _batch_size: Maximum nodes per Read request.
+
+        Returns:
+            int: Number of newly cached browse names.
+        """
+        unknown = [node_id for node_id in _node_ids if node_id not in self.type_names]
+        data_values = await read_attribute_batched(_session= _session, _node_ids= unknown, _attribute= ua.AttributeIds.BrowseName, _batch_size= _batch_size)
+        for node_id, data_value in zip(unknown, data_values):
+            if data_value.StatusCode.is_good():
+                self.type_names[node_id] = data_value.Value.Value.Name
+        return len(unknown)
\ No newline at end of file
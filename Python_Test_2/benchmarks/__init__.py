@@ -0,0 +1 @@
+from .model_generator import generate_node_jsons, write_server_config, write_nodeset
@@ -0,0 +1,135 @@
+"""
+Dependency Tree Benchmark times the child computation of Lib.dependencytree for large trees.
+
+Random trees in the dependencytree list format ([None] * level + [id]) are generated for every
+requested size. The single pass _get_all_children is timed and compared with the former
+quadratic implementation, which is only run up to --baseline-max rows.
+
+Run from the Python_Test_2 folder:
+    python -m benchmarks.dependencytree_benchmark --rows 1000 10000 100000
+"""
+
+import os
+import json
+import time
+import random
+import argparse
+
+from datetime import datetime
+from pathlib import Path
+
+from Lib.dependencytree.dependencytree import _get_all_children
+
+
+### paser
+parser = argparse.ArgumentParser(description="Dependency tree benchmark")
+parser.add_argument(
+    "--rows",
+    type=int,
+    nargs="+",
+    required=False,
+    default=[1000, 10000, 100000],
+    help="Number of tree rows, one run per value")
+parser.add_argument(
+    "--depth",
+    type=int,
+    required=False,
+    default=8,
+    help="Maximum depth of the generated trees")
+parser.add_argument(
+    "--baseline-max",
+    type=int,
+    required=False,
+    default=10000,
+    help="Largest tree the quadratic implementation is run for")
+parser.add_argument(
+    "--output",
+    required=False,
+    default=os.path.join(Path(__file__).parent, "results"),
+    help="Folder of the JSON report")
+
+
+def generate_tree(_rows: int, _depth: int, _seed: int = 0) -> list:
+    """ Generate a random tree list """
+
+    """
+        Attributes:
+            _rows               int     number of rows, the first one is the root
+            _depth              int     maximum depth
+            _seed               int     seed of the random generator
+
+        Return value:
+            tree                list    tree in the dependencytree list format
+    """
+    rng = random.Random(_seed)
+    tree = [[85]]
+    level = 0
+    for node_id in range(1000, 1000 + _rows - 1):
+        # A row is a child of the previous row or of one of its ancestors
+        level = rng.randint(1, min(level + 1, _depth))
+        tree.append([None] * level + [node_id])
+    return tree
+
+
+def _get_all_children_quadratic(_tree: list) -> list:
+    """ Former implementation, every row scans all later rows for its children """
+    result = []
+    last_seen = []
+    parents = []
+    for row in _tree:
+        while len(last_seen) < len(row):
+            last_seen.append(None)
+        for i, val in enumerate(row):
+            if val is not None:
+                last_seen[i] = val
+        parents.append(last_seen[len(row)-2] if len(row) > 1 else None)
+
+    n = len(_tree)
+    ids = [row[-1] for row in _tree]
+    for idx, id_ in enumerate(ids):
+        children = [j for j in range(idx+1, n) if parents[j] == id_]
+        result.append([idx] + children)
+    return result
+
+
+def main() -> int:
+    """ Run the dependency tree benchmark and write the report """
+    args = parser.parse_args()
+    rows = []
+    for count in args.rows:
+        tree = generate_tree(_rows= count, _depth= args.depth)
+
+        start_time = time.perf_counter()
+        children = _get_all_children(_tree= tree)
+        linear = time.perf_counter() - start_time
+
+        quadratic = None
+        if count <= args.baseline_max:
+            start_time = time.perf_counter()
+            expected = _get_all_children_quadratic(_tree= tree)
+            quadratic = time.perf_counter() - start_time
+            if expected != children:
+                print(f"rows={count}: results of both implementations differ")
+                return -1
+
+        rows.append({
+            "rows": count,
+            "depth": args.depth,
+            "linear": linear,
+            "quadratic": quadratic,
+            "speedup": quadratic / linear if quadratic is not None else None
+        })
+        quadratic_text = f"{quadratic * 1000:10.1f} ms" if quadratic is not None else "   skipped"
+        print(f"rows={count:7} linear={linear * 1000:8.1f} ms quadratic={quadratic_text}")
+
+    os.makedirs(args.output, exist_ok=True)
+    report_file = os.path.join(args.output, f"dependencytree_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json")
+    with open(report_file, "w") as output_file:
+        json.dump({"created": datetime.now().isoformat(timespec= "seconds"), "runs": rows}, output_file, indent= 4)
+    print(f"Report written to {report_file}")
+    return 1
+
+
+if __name__ == "__main__":
+    """ Run the benchmark. """
+    main()
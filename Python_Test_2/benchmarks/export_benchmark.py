@@ -0,0 +1,138 @@
+"""
+Export Benchmark measures the throughput of OPCUAServer.export_server_model() in nodes per second.
+
+For every model size a synthetic address space is generated (see model_generator.py), activated
+on a localhost server with the bulk json activation and exported to a temporary NodeSet2 file.
+
+Run from the Python_Test_2 folder:
+    python -m benchmarks.export_benchmark --objects 100 1000 --variables 10 --depth 3
+"""
+
+import os
+import json
+import time
+import asyncio
+import argparse
+import tempfile
+
+from datetime import datetime
+from pathlib import Path
+
+from OPC_UA_Server import OPCUAServer
+from .model_generator import generate_node_jsons, BENCHMARK_NAMESPACE_URI
+
+
+### paser
+parser = argparse.ArgumentParser(description="OPC UA server export benchmark")
+parser.add_argument(
+    "--objects",
+    type=int,
+    nargs="+",
+    required=False,
+    default=[100, 1000],
+    help="Number of objects, one model per value")
+parser.add_argument(
+    "--variables",
+    type=int,
+    required=False,
+    default=10,
+    help="Number of variables per object")
+parser.add_argument(
+    "--depth",
+    type=int,
+    required=False,
+    default=1,
+    help="Number of object levels")
+parser.add_argument(
+    "--batch-size",
+    type=int,
+    required=False,
+    default=1000,
+    help="Maximum nodes per Browse or Read request")
+parser.add_argument(
+    "--stream",
+    required=False,
+    action="store_true",
+    help="Stream flag writes the export chunk by chunk")
+parser.add_argument(
+    "--gzip",
+    required=False,
+    action="store_true",
+    help="Gzip flag compresses the export")
+parser.add_argument(
+    "--port",
+    type=int,
+    required=False,
+    default=48400,
+    help="Localhost port of the benchmark server")
+parser.add_argument(
+    "--output",
+    required=False,
+    default=os.path.join(Path(__file__).parent, "results"),
+    help="Folder of the JSON report")
+
+
+async def _run_export(_objects: int, _variables: int, _depth: int, _batch_size: int, _streaming: bool, _gzip: bool, _port: int, _work_dir: str) -> dict:
+    """ Build one model on a server and export it """
+
+    """
+        Attributes:
+            _objects            int     number of objects
+            _variables          int     number of variables per object
+            _depth              int     number of object levels
+            _batch_size         int     maximum nodes per Browse or Read request
+            _streaming          bool    write the export chunk by chunk
+            _gzip               bool    gzip compress the export
+            _port               int     localhost port
+            _work_dir           str     folder for the export and the logs
+
+        Return value:
+            result              dict    exported nodes, export time and nodes per second
+    """
+    opc_ua_server = OPCUAServer(
+        _endpoint= f"opc.tcp://127.0.0.1:{_port}/freeopcua/server/",
+        _namespace_jsons= [{"namespaceIndex": 2, "namespaceUri": BENCHMARK_NAMESPACE_URI, "description": "Benchmark namespace"}],
+        _node_jsons= generate_node_jsons(_objects= _objects, _variables= _variables, _depth= _depth),
+        _logger_path= os.path.join(_work_dir, "logs"),
+        _bulk_activation= True
+    )
+    await opc_ua_server.autostart(source= "json")
+
+    start_time = time.perf_counter()
+    await opc_ua_server.export_server_model(output_file= os.path.join(_work_dir, "export.xml"), _batch_size= _batch_size, _streaming= _streaming, _gzip= _gzip)
+    duration = time.perf_counter() - start_time
+    await opc_ua_server.stop_server()
+    return {
+        "objects": _objects,
+        "variables": _variables,
+        "depth": _depth,
+        "batch_size": _batch_size,
+        "streaming": _streaming,
+        "gzip": _gzip,
+        "exported_nodes": opc_ua_server.exported_nodes,
+        "duration": duration,
+        "nodes_per_second": opc_ua_server.exported_nodes / duration
+    }
+
+
+def main() -> int:
+    """ Run the export benchmark for all model sizes and write the report """
+    args = parser.parse_args()
+    rows = []
+    for objects in args.objects:
+        with tempfile.TemporaryDirectory(prefix= "opcua_benchmark_") as work_dir:
+            result = asyncio.run(_run_export(_objects= objects, _variables= args.variables, _depth= args.depth, _batch_size= args.batch_size, _streaming= args.stream, _gzip= args.gzip, _port= args.port, _work_dir= work_dir))
+        rows.append(result)
+        print(f"nodes={result['exported_nodes']:7} export={result['duration']:.3f} s {result['nodes_per_second']:.0f} nodes/s")
+
+    os.makedirs(args.output, exist_ok=True)
+    report_file = os.path.join(args.output, f"export_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json")
+    with open(report_file, "w") as output_file:
+        json.dump({"created": datetime.now().isoformat(timespec= "seconds"), "runs": rows}, output_file, indent= 4)
+    print(f"Report written to {report_file}")
+    return 1
+
+
+if __name__ == "__main__":
+    """ Run the benchmark. """
+    main()
@@ -0,0 +1,169 @@
+"""
+Model Generator creates synthetic address spaces for benchmarks.
+
+The same model can be written as server_config.json (for --build json) and as
+NodeSet2 XML (for --build xml), so both startup paths load the identical address space.
+
+Model rules:
+• _objects objects are spread over _depth levels.
+• Object k is placed on level k % _depth. Its parent is the last object on the level above,
+  objects on level 0 are placed under Objects (ns=0;i=85).
+• Every object gets _variables Double variables.
+• Identifiers are numeric and start at 1000.
+"""
+
+import json
+
+from xml.sax.saxutils import escape
+
+BENCHMARK_NAMESPACE_URI = "http://benchmark.opcua.local"
+FIRST_IDENTIFIER = 1000
+
+
+def generate_node_jsons(_objects: int = 100, _variables: int = 10, _depth: int = 1, _namespace_uri: str = BENCHMARK_NAMESPACE_URI) -> list:
+    """ Generate the node jsons of a synthetic model """
+
+    """
+        Attributes:
+            _objects            int     number of objects
+            _variables          int     number of variables per object
+            _depth              int     number of object levels
+            _namespace_uri      str     namespace uri of all nodes
+
+        Return value:
+            node_jsons          list    node jsons in the format of server_config.json
+    """
+    depth = max(1, _depth)
+    node_jsons = []
+    last_object_on_level = {}
+    identifier = FIRST_IDENTIFIER
+    for k in range(_objects):
+        level = k % depth
+        parent = {"ns": 0, "i": 85} if level == 0 else {"ns": 2, "i": last_object_on_level[level - 1]}
+        object_id = identifier
+        identifier += 1
+        last_object_on_level[level] = object_id
+        node_jsons.append({
+            "nodeHeader": {
+                "nodeId": {"ns": 2, "i": object_id},
+                "nodeClass": "Object",
+                "browseName": f"Object{k}",
+                "displayName": f"Object{k}",
+                "description": "Benchmark object",
+                "namespaceUri": _namespace_uri,
+                "parentNodeId": parent
+            }
+        })
+        for v in range(_variables):
+            node_jsons.append({
+                "nodeHeader": {
+                    "nodeId": {"ns": 2, "i": identifier},
+                    "nodeClass": "Variable",
+                    "browseName": f"Object{k}_Variable{v}",
+                    "displayName": f"Object{k}_Variable{v}",
+                    "description": "Benchmark variable",
+                    "namespaceUri": _namespace_uri,
+                    "parentNodeId": {"ns": 2, "i": object_id}
+                },
+                "data": {
+                    "value": 0.0,
+                    "dataType": "double",
+                    "valueRank": -1,
+                    "arrayDimensions": "none"
+                },
+                "access": {
+                    "readable": True,
+                    "writeable": True
+                }
+            })
+            identifier += 1
+    return node_jsons
+
+
+def write_server_config(_file: str, _node_jsons: list, _endpoint: str, _namespace_uri: str = BENCHMARK_NAMESPACE_URI) -> int:
+    """ Write the node jsons as server_config.json """
+
+    """
+        Attributes:
+            _file               str     output file
+            _node_jsons         list    node jsons from generate_node_jsons()
+            _endpoint           str     endpoint of the benchmark server
+            _namespace_uri      str     namespace uri of all nodes
+
+        Return value:
+            int
+    """
+    config = {
+        "server_name": "OPC-UA-Benchmark-Server",
+        "endpoint": _endpoint,
+        "namespaces": [
+            {
+                "namespaceIndex": 2,
+                "namespaceUri": _namespace_uri,
+                "description": "Namespace for benchmark nodes"
+            }
+        ],
+        "nodes": _node_jsons
+    }
+    with open(_file, "w") as config_file:
+        json.dump(config, config_file)
+    return 1
+
+
+def write_nodeset(_file: str, _node_jsons: list, _namespace_uri: str = BENCHMARK_NAMESPACE_URI) -> int:
+    """ Write the node jsons as NodeSet2 XML, line by line to keep memory flat """
+
+    """
+        Attributes:
+            _file               str     output file
+            _node_jsons         list    node jsons from generate_node_jsons()
+            _namespace_uri      str     namespace uri of all nodes
+
+        Return value:
+            int
+    """
+    with open(_file, "w", encoding="utf-8") as xml_file:
+        xml_file.write('<?xml version="1.0" encoding="UTF-8"?>\n')
+        xml_file.write('<UANodeSet xmlns="http://opcfoundation.org/UA/2011/03/UANodeSet.xsd" '
+                       'xmlns:uax="http://opcfoundation.org/UA/2008/02/Types.xsd" '
+                       'xmlns:xsi="http://www.w3.org/2001/XMLSchema-instance" '
+                       'xmlns:xsd="http://www.w3.org/2001/XMLSchema">\n')
+        xml_file.write(f'  <NamespaceUris>\n    <Uri>{escape(_namespace_uri)}</Uri>\n  </NamespaceUris>\n')
+        xml_file.write('  <Aliases>\n'
+                       '    <Alias Alias="Double">i=11</Alias>\n'
+                       '    <Alias Alias="Organizes">i=35</Alias>\n'
+                       '    <Alias Alias="HasTypeDefinition">i=40</Alias>\n'
+                       '    <Alias Alias="HasComponent">i=47</Alias>\n'
+                       '  </Aliases>\n')
+        for node_json in _node_jsons:
+            header = node_json["nodeHeader"]
+            node_id = f"ns=1;i={header['nodeId']['i']}"
+            browse_name = escape(header["browseName"])
+            if header["parentNodeId"]["ns"] == 0:
+                parent_id = f"i={header['parentNodeId']['i']}"
+                parent_reference = "Organizes"
+            else:
+                parent_id = f"ns=1;i={header['parentNodeId']['i']}"
+                parent_reference = "HasComponent"
+
+            if header["nodeClass"] == "Object":
+                xml_file.write(f'  <UAObject NodeId="{node_id}" BrowseName="1:{browse_name}" ParentNodeId="{parent_id}">\n'
+                               f'    <DisplayName>{browse_name}</DisplayName>\n'
+                               f'    <References>\n'
+                               f'      <Reference ReferenceType="HasTypeDefinition">i=58</Reference>\n'
+                               f'      <Reference ReferenceType="{parent_reference}" IsForward="false">{parent_id}</Reference>\n'
+                               f'    </References>\n'
+                               f'  </UAObject>\n')
+            elif header["nodeClass"] == "Variable":
+                access_level = (1 if node_json["access"]["readable"] else 0) | (2 if node_json["access"]["writeable"] else 0)
+                xml_file.write(f'  <UAVariable NodeId="{node_id}" BrowseName="1:{browse_name}" ParentNodeId="{parent_id}" '
+                               f'DataType="Double" AccessLevel="{access_level}" UserAccessLevel="{access_level}">\n'
+                               f'    <DisplayName>{browse_name}</DisplayName>\n'
+                               f'    <References>\n'
+                               f'      <Reference ReferenceType="HasTypeDefinition">i=63</Reference>\n'
+                               f'      <Reference ReferenceType="{parent_reference}" IsForward="false">{parent_id}</Reference>\n'
+                               f'    </References>\n'
+                               f'    <Value>\n      <uax:Double>{float(node_json["data"]["value"])}</uax:Double>\n    </Value>\n'
+                               f'  </UAVariable>\n')
+        xml_file.write('</UANodeSet>\n')
+    return 1
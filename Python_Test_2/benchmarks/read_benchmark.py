@@ -0,0 +1,138 @@
+"""
+Read Benchmark compares per-node reads (OPCUAClient.get_value) with batched reads (OPCUAClient.get_values).
+
+A synthetic address space is generated (see model_generator.py) and activated on a localhost
+server with the bulk json activation. A client connects and reads the first N variables once per
+cycle, node by node and with one batched call, for every requested N.
+
+Run from the Python_Test_2 folder:
+    python -m benchmarks.read_benchmark --nodes 10 100 1000 --cycles 10
+"""
+
+import os
+import json
+import time
+import asyncio
+import argparse
+import tempfile
+
+from datetime import datetime
+from pathlib import Path
+
+from OPC_UA_Server import OPCUAServer
+from OPC_UA_Client import OPCUAClient
+from .model_generator import generate_node_jsons, BENCHMARK_NAMESPACE_URI
+
+
+### paser
+parser = argparse.ArgumentParser(description="OPC UA client read benchmark")
+parser.add_argument(
+    "--nodes",
+    type=int,
+    nargs="+",
+    required=False,
+    default=[10, 100, 1000],
+    help="Number of variables read per cycle, one run per value")
+parser.add_argument(
+    "--cycles",
+    type=int,
+    required=False,
+    default=10,
+    help="Read cycles per run")
+parser.add_argument(
+    "--port",
+    type=int,
+    required=False,
+    default=48400,
+    help="Localhost port of the benchmark server")
+parser.add_argument(
+    "--output",
+    required=False,
+    default=os.path.join(Path(__file__).parent, "results"),
+    help="Folder of the JSON report")
+
+
+async def _run_reads(_nodes: list, _cycles: int, _port: int, _work_dir: str) -> list:
+    """ Start one server with enough variables and read them per node and batched """
+
+    """
+        Attributes:
+            _nodes              list    number of variables read per cycle, one run per value
+            _cycles             int     read cycles per run
+            _port               int     localhost port
+            _work_dir           str     folder for the logs
+
+        Return value:
+            rows                list    one result dict per number of variables
+    """
+    endpoint = f"opc.tcp://127.0.0.1:{_port}/freeopcua/server/"
+    variables = 10
+    node_jsons = generate_node_jsons(_objects= -(-max(_nodes) // variables), _variables= variables)
+    opc_ua_server = OPCUAServer(
+        _endpoint= endpoint,
+        _namespace_jsons= [{"namespaceIndex": 2, "namespaceUri": BENCHMARK_NAMESPACE_URI, "description": "Benchmark namespace"}],
+        _node_jsons= node_jsons,
+        _logger_path= os.path.join(_work_dir, "logs"),
+        _bulk_activation= True
+    )
+    await opc_ua_server.autostart(source= "json")
+
+    opc_ua_client = OPCUAClient(_endpoint= endpoint, _use_config_file= False, _use_cache_file= False)
+    await opc_ua_client.start_Client()
+    # The server assigns the node ids, the client reads the same nodes
+    all_nodes = [
+        opc_ua_client.client.get_node(node.node.nodeid)
+        for node in opc_ua_server.node_container.nodes
+        if node.node is not None and node.node_header["nodeClass"] == "Variable"
+    ]
+
+    rows = []
+    try:
+        for count in _nodes:
+            nodes = all_nodes[:count]
+            await opc_ua_client.get_values(_nodes= nodes[:1])              # read the server limits outside of the timing
+
+            start_time = time.perf_counter()
+            for _ in range(_cycles):
+                for node in nodes:
+                    await opc_ua_client.get_value(_node= node)
+            per_node = (time.perf_counter() - start_time) / _cycles
+
+            start_time = time.perf_counter()
+            for _ in range(_cycles):
+                results = await opc_ua_client.get_values(_nodes= nodes)
+            batched = (time.perf_counter() - start_time) / _cycles
+
+            rows.append({
+                "nodes": count,
+                "cycles": _cycles,
+                "good": sum(1 for _, status_code in results if status_code.is_good()),
+                "per_node_cycle": per_node,
+                "batched_cycle": batched,
+                "speedup": per_node / batched
+            })
+    finally:
+        await opc_ua_client.stop_Client()
+        await opc_ua_server.stop_server()
+    return rows
+
+
+def main() -> int:
+    """ Run the read benchmark and write the report """
+    args = parser.parse_args()
+    with tempfile.TemporaryDirectory(prefix= "opcua_benchmark_") as work_dir:
+        rows = asyncio.run(_run_reads(_nodes= args.nodes, _cycles= args.cycles, _port= args.port, _work_dir= work_dir))
+    for row in rows:
+        print(f"nodes={row['nodes']:6} per-node={row['per_node_cycle'] * 1000:9.2f} ms batched={row['batched_cycle'] * 1000:8.2f} ms speedup={row['speedup']:.1f}x")
+
+    os.makedirs(args.output, exist_ok=True)
+    report_file = os.path.join(args.output, f"read_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json")
+    with open(report_file, "w") as output_file:
+        json.dump({"created": datetime.now().isoformat(timespec= "seconds"), "runs": rows}, output_file, indent= 4)
+    print(f"Report written to {report_file}")
+    return 1
+
+
+if __name__ == "__main__":
+    """ Run the benchmark. """
+    main()
@@ -0,0 +1,254 @@
+"""
+Startup Benchmark measures how OPCUAServer.autostart() scales with the size of the address space.
+
+For every model size a synthetic server_config.json and NodeSet2 XML file is generated
+(see model_generator.py). Every run starts a fresh Python process, which builds the server
+on localhost with autostart(source="json"), autostart(source="xml") or autostart(source="snapshot"),
+records the phase timings of the server and its peak RSS and stops the server again.
+The first snapshot run builds the snapshot from the json config, the further runs load it.
+
+The report is written as JSON and CSV, so runs of different releases can be compared.
+
+Run from the Python_Test_2 folder:
+    python -m benchmarks.startup_benchmark --objects 100 1000 --variables 10 --depth 3 --label v1.0
+"""
+
+import os
+import sys
+import csv
+import json
+import time
+import asyncio
+import argparse
+import platform
+import subprocess
+import tempfile
+
+from datetime import datetime
+from importlib import metadata
+from pathlib import Path
+
+from OPC_UA_Server import OPCUAServer
+from .model_generator import generate_node_jsons, write_server_config, write_nodeset
+
+PHASES = ["init_server", "start_server", "load_namespaces_and_nodes", "activate_namespaces", "activate_nodes", "import_xml",
+          "read_snapshot", "restore_namespaces", "write_snapshot"]
+CONFIG_FILE = "server_config.json"
+XML_FILE = "server_design_model.xml"
+
+
+### paser
+parser = argparse.ArgumentParser(description="OPC UA server startup benchmark")
+parser.add_argument(
+    "--objects",
+    type=int,
+    nargs="+",
+    required=False,
+    default=[100, 1000],
+    help="Number of objects, one model per value")
+parser.add_argument(
+    "--variables",
+    type=int,
+    required=False,
+    default=10,
+    help="Number of variables per object")
+parser.add_argument(
+    "--depth",
+    type=int,
+    required=False,
+    default=1,
+    help="Number of object levels")
+parser.add_argument(
+    "--sources",
+    choices=["json", "xml", "snapshot"],
+    nargs="+",
+    required=False,
+    default=["json", "xml"],
+    help="Build modes to benchmark, snapshot runs once more to build the snapshot")
+parser.add_argument(
+    "--bulk",
+    required=False,
+    action="store_true",
+    help="Bulk flag activates json nodes with batched AddNodes requests")
+parser.add_argument(
+    "--concurrency",
+    type=int,
+    required=False,
+    default=1,
+    help="Number of json nodes activated at the same time")
+parser.add_argument(
+    "--repeat",
+    type=int,
+    required=False,
+    default=1,
+    help="Runs per model and build mode")
+parser.add_argument(
+    "--port",
+    type=int,
+    required=False,
+    default=48400,
+    help="Localhost port of the benchmark server")
+parser.add_argument(
+    "--label",
+    required=False,
+    default="",
+    help="Label of the report, e.g. the release")
+parser.add_argument(
+    "--output",
+    required=False,
+    default=os.path.join(Path(__file__).parent, "results"),
+    help="Folder of the JSON and CSV report")
+parser.add_argument(
+    "--run-once",
+    choices=["json", "xml", "snapshot"],
+    required=False,
+    default=None,
+    help=argparse.SUPPRESS)
+parser.add_argument(
+    "--work-dir",
+    required=False,
+    default=None,
+    help=argparse.SUPPRESS)
+
+
+def _peak_rss_kb() -> int:
+    """ Peak resident set size of this process in kB, None if not available """
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # macOS reports bytes, Linux kB
+    return peak // 1024 if sys.platform == "darwin" else peak
+
+
+async def _run_once(_source: str, _work_dir: str, _bulk: bool, _concurrency: int) -> dict:
+    """ Start one server, return its phase timings """
+
+    """
+        Attributes:
+            _source             str     "json", "xml" or "snapshot"
+            _work_dir           str     folder with the generated model and the logs
+            _bulk               bool    bulk json activation
+            _concurrency        int     concurrent json activation
+
+        Return value:
+            result              dict    phase timings, total time, peak RSS and snapshot use
+    """
+    opc_ua_server = OPCUAServer(
+        _server_config_path= _work_dir,
+        _server_config_file= CONFIG_FILE,
+        _server_xml_path= _work_dir,
+        _server_xml_file= XML_FILE,
+        _server_snapshot_path= _work_dir,
+        _use_config_file= True,
+        _logger_path= os.path.join(_work_dir, "logs"),
+        _bulk_activation= _bulk
+    )
+    start_time = time.perf_counter()
+    await opc_ua_server.autostart(source= _source, concurrency= _concurrency)
+    total = time.perf_counter() - start_time
+    peak_rss_kb = _peak_rss_kb()
+    await opc_ua_server.stop_server()
+    return {"phases": opc_ua_server.phase_durations, "total": total, "peak_rss_kb": peak_rss_kb, "loaded_by_snapshot": opc_ua_server.loaded_by_snapshot}
+
+
+def _run_in_process(_source: str, _work_dir: str, _bulk: bool, _concurrency: int) -> dict:
+    """ Run one benchmark in a fresh interpreter, so the peak RSS belongs to this run only """
+    command = [sys.executable, "-m", "benchmarks.startup_benchmark", "--run-once", _source, "--concurrency", str(_concurrency)]
+    if _bulk:
+        command.append("--bulk")
+    command += ["--work-dir", _work_dir]
+    completed = subprocess.run(command, cwd= Path(__file__).parent.parent, capture_output= True, text= True)
+    if completed.returncode != 0:
+        raise RuntimeError(f"Benchmark run failed: {completed.stderr.strip()}")
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+def write_report(_rows: list, _output: str, _label: str) -> tuple:
+    """ Write the benchmark rows as JSON and CSV """
+
+    """
+        Attributes:
+            _rows               list    one dict per run
+            _output             str     output folder
+            _label              str     report label
+
+        Return value:
+            files               tuple   (json file, csv file)
+    """
+    os.makedirs(_output, exist_ok=True)
+    name = f"startup_{_label + '_' if _label else ''}{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+    json_file = os.path.join(_output, name + ".json")
+    csv_file = os.path.join(_output, name + ".csv")
+
+    try:
+        asyncua_version = metadata.version("asyncua")
+    except metadata.PackageNotFoundError:
+        asyncua_version = None
+    report = {
+        "label": _label,
+        "created": datetime.now().isoformat(timespec= "seconds"),
+        "python": platform.python_version(),
+        "asyncua": asyncua_version,
+        "platform": platform.platform(),
+        "runs": _rows
+    }
+    with open(json_file, "w") as report_file:
+        json.dump(report, report_file, indent= 4)
+
+    fieldnames = ["label", "source", "bulk", "concurrency", "objects", "variables", "depth", "nodes", "run"] + PHASES + ["total", "peak_rss_kb", "loaded_by_snapshot"]
+    with open(csv_file, "w", newline= "") as report_file:
+        writer = csv.DictWriter(report_file, fieldnames= fieldnames)
+        writer.writeheader()
+        for row in _rows:
+            flat = {key: row[key] for key in fieldnames if key in row}
+            flat.update({phase: row["phases"].get(phase) for phase in PHASES})
+            flat["label"] = _label
+            writer.writerow(flat)
+    return json_file, csv_file
+
+
+def main() -> int:
+    """ Generate the models, run all benchmarks and write the report """
+    args = parser.parse_args()
+
+    # Child process: a single server run, result on stdout
+    if args.run_once is not None:
+        result = asyncio.run(_run_once(_source= args.run_once, _work_dir= args.work_dir, _bulk= args.bulk, _concurrency= args.concurrency))
+        print(json.dumps(result))
+        return 1
+
+    rows = []
+    endpoint = f"opc.tcp://127.0.0.1:{args.port}/freeopcua/server/"
+    for objects in args.objects:
+        with tempfile.TemporaryDirectory(prefix= "opcua_benchmark_") as work_dir:
+            node_jsons = generate_node_jsons(_objects= objects, _variables= args.variables, _depth= args.depth)
+            write_server_config(_file= os.path.join(work_dir, CONFIG_FILE), _node_jsons= node_jsons, _endpoint= endpoint)
+            write_nodeset(_file= os.path.join(work_dir, XML_FILE), _node_jsons= node_jsons)
+            for source in args.sources:
+                runs = args.repeat + 1 if source == "snapshot" else args.repeat
+                for run in range(runs):
+                    result = _run_in_process(_source= source, _work_dir= work_dir, _bulk= args.bulk, _concurrency= args.concurrency)
+                    row = {
+                        "source": source,
+                        "bulk": args.bulk if source != "xml" else None,
+                        "concurrency": args.concurrency if source != "xml" else None,
+                        "objects": objects,
+                        "variables": args.variables,
+                        "depth": args.depth,
+                        "nodes": len(node_jsons),
+                        "run": run,
+                        **result
+                    }
+                    rows.append(row)
+                    print(f"{source:8} nodes={len(node_jsons):7} run={run} total={result['total']:.3f} s peak_rss={result['peak_rss_kb']} kB")
+
+    json_file, csv_file = write_report(_rows= rows, _output= args.output, _label= args.label)
+    print(f"Report written to {json_file} and {csv_file}")
+    return 1
+
+
+if __name__ == "__main__":
+    """ Run the benchmark. """
+    main()
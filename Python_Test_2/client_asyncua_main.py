@@ -9,6 +9,7 @@ async def main():
     opc_ua_client = OPCUAClient(_use_config_file = useSetupClientFile)
 
     await opc_ua_client.start_Client()
+    print(f"Loaded {len(opc_ua_client.loaded_nodes)} nodes with {opc_ua_client.startup_requests} server requests")
 
     clock = opc_ua_client.get_node(_browse_name= "Time1", _namespace_index= 2, _identifier= 2)
     
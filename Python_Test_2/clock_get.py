@@ -14,17 +14,19 @@ async def main():
 
     clock = opc_ua_client.get_node(_browse_name= "Time1", _namespace_index= 2, _identifier= 2)
     
-    # Main programm loop
+    # Main programm loop, the server reports every change of the clock
     print(" Press Ctrl+C to stop the clock.")
     try:
-        while True:
-            now = await opc_ua_client.get_value(_node= clock)
-            print("The current date and time is:")
-            print(now)
-            await asyncio.sleep(1)
-            sys.stdout.write("\033[F\033[K")  # Move up 1 line + clear line
-            sys.stdout.write("\033[F\033[K")  # Move up 1 more line + clear line
-            sys.stdout.flush()
+        async with await opc_ua_client.subscribe(_nodes= [clock], _interval= 200) as subscription:
+            first = True
+            async for _, now, _ in subscription:
+                if not first:
+                    sys.stdout.write("\033[F\033[K")  # Move up 1 line + clear line
+                    sys.stdout.write("\033[F\033[K")  # Move up 1 more line + clear line
+                first = False
+                print("The current date and time is:")
+                print(now)
+                sys.stdout.flush()
 
     except asyncio.CancelledError:
         pass
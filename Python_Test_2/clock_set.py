@@ -1,10 +1,35 @@
 import asyncio
+import argparse
 from asyncua import Client, ua
-from OPC_UA_Client import OPCUAClient
+from OPC_UA_Client import OPCUAClient, OPCUAPublisher
 from datetime import datetime
 
+
+### paser
+parser = argparse.ArgumentParser(description="Clock publisher")
+parser.add_argument(
+    "--rate",
+    type=float,
+    required=False,
+    default=1.0,
+    help="Clock writes per second, e.g. 100 or 1000")
+parser.add_argument(
+    "--duration",
+    type=float,
+    required=False,
+    default=None,
+    help="Seconds to publish, runs until Ctrl+C if not set")
+parser.add_argument(
+    "--in-flight",
+    type=int,
+    required=False,
+    default=4,
+    help="Writes which may wait for their response at the same time")
+
+
 async def main():
-    
+    args = parser.parse_args()
+
     # Create a OPCUAClient instance
     useSetupClientFile = True 
     opc_ua_client = OPCUAClient(_use_config_file = useSetupClientFile)
@@ -12,14 +37,21 @@ async def main():
     await opc_ua_client.start_Client()
 
     clock = opc_ua_client.get_node(_browse_name= "Time1", _namespace_index= 2, _identifier= 2)
+
+    # Whole seconds for the 1 Hz clock, milliseconds for faster clocks
+    time_format = "%Y-%m-%d %H:%M:%S" if args.rate <= 1 else "%Y-%m-%d %H:%M:%S.%f"
+    publisher = OPCUAPublisher(
+        _client= opc_ua_client,
+        _node= clock,
+        _rate= args.rate,
+        _value_factory= lambda: datetime.now().strftime(time_format)[:23],
+        _max_in_flight= args.in_flight
+    )
     
     # Main programm loop
     print(" Press Ctrl+C to stop the clock.")
     try:
-        while True:
-            now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            await opc_ua_client.set_value(_node= clock, _value= now)
-            await asyncio.sleep(1)
+        await publisher.run(_duration= args.duration)
 
     except asyncio.CancelledError:
         pass
@@ -27,7 +59,16 @@ async def main():
         print("Stopping clock...")
 
     finally:
+        statistics = publisher.get_statistics()
         print("Clock stopped.")
+        print(
+            f"rate={statistics['achieved_rate']:.1f}/{statistics['target_rate']:.1f} Hz "
+            f"writes={statistics['writes']} skipped={statistics['skipped']} errors={statistics['errors']}"
+        )
+        for name in ("jitter_ms", "latency_ms"):
+            values = statistics[name]
+            if values["p50"] is not None:
+                print(f"{name[:-3]:8} p50={values['p50']:.3f} p95={values['p95']:.3f} p99={values['p99']:.3f} max={values['max']:.3f} ms")
 
 if __name__ == "__main__":
-    asyncio.run(main())
\ No newline at end of file
+    asyncio.run(main())
@@ -17,20 +17,65 @@ from Lib.dependencytree import dependencytree
 parser = argparse.ArgumentParser(description="Server control")
 parser.add_argument(
     "--build",
-    choices=["xml", "json"],
+    choices=["xml", "json", "snapshot"],
     required=False,
     default="json",
     help="Build mode for server")
+parser.add_argument(
+    "--snapshot-source",
+    choices=["xml", "json"],
+    required=False,
+    default="json",
+    help="Build mode the snapshot is compiled from when it is missing or outdated")
 parser.add_argument(
     "--export",
     required=False,
     action="store_true",
     help="Export flag to create xml file of current server")
+parser.add_argument(
+    "--stream",
+    required=False,
+    action="store_true",
+    help="Stream flag writes the export chunk by chunk while the address space is walked, no node list or XML tree is kept")
+parser.add_argument(
+    "--gzip",
+    required=False,
+    action="store_true",
+    help="Gzip flag compresses the exported xml file")
 parser.add_argument(
     "--tree",
     required=False,
     action="store_true",
     help="Tree flag print node tree of current server")
+parser.add_argument(
+    "--tree-root",
+    required=False,
+    default=None,
+    help="Node id the printed tree starts at, default is the Objects node")
+parser.add_argument(
+    "--tree-depth",
+    type=int,
+    required=False,
+    default=None,
+    help="Number of levels printed below the tree root")
+parser.add_argument(
+    "--tree-limit",
+    type=int,
+    required=False,
+    default=None,
+    help="Maximum number of printed tree nodes")
+parser.add_argument(
+    "--bulk",
+    required=False,
+    action=argparse.BooleanOptionalAction,
+    default=None,
+    help="Bulk flag activates json nodes with batched AddNodes requests, overrides bulk_activation of the config file")
+parser.add_argument(
+    "--concurrency",
+    type=int,
+    required=False,
+    default=1,
+    help="Number of json nodes activated at the same time")
 args = parser.parse_args()
 
 async def main():
@@ -38,20 +83,26 @@ async def main():
 
     # Create a OPCUAServer instance
     useSetupServerFile = True 
-    opc_ua_server = OPCUAServer(_use_config_file = useSetupServerFile)    
+    opc_ua_server = OPCUAServer(_use_config_file = useSetupServerFile, _bulk_activation= args.bulk, _snapshot_source= args.snapshot_source)    
 
     # Autostart the server
-    await opc_ua_server.autostart(source= args.build)
+    await opc_ua_server.autostart(source= args.build, concurrency= args.concurrency)
     print("Server started.")
 
     # Print the node tree that is active in the server
     if args.tree:
-        node_tree = opc_ua_server.get_server_node_tree()
-        dependencytree.dependencytree_print(_tree= node_tree["node_tree"], _object_names= node_tree["server_node_information"], _add_names= True, _names_only= True)
+        # Nodes loaded by xml are not recorded by the node container, their tree is browsed
+        if opc_ua_server.loaded_by_xml:
+            await opc_ua_server.build_address_space_tree()
+        node_tree = opc_ua_server.get_server_compact_tree()
+        tree_root = int(args.tree_root) if args.tree_root is not None and args.tree_root.isdigit() else args.tree_root
+        if dependencytree.compacttree_print(_tree= node_tree, _information= True, _add_names= True, _names_only= True,
+                                            _root_id= tree_root, _max_depth= args.tree_depth, _max_nodes= args.tree_limit) == -1:
+            print(f"Node {args.tree_root} is not in the node tree.")
 
     # Export current server model
     if args.export:
-        await opc_ua_server.export_server_model()
+        await opc_ua_server.export_server_model(_streaming= args.stream, _gzip= args.gzip)
 
     # Main programm loop
     print("Press Ctrl+C to stop.")
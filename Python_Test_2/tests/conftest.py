@@ -0,0 +1,6 @@
+import sys
+
+from pathlib import Path
+
+# The tests import the packages of Python_Test_2 like the main scripts do
+sys.path.insert(0, str(Path(__file__).parent.parent))
@@ -0,0 +1,78 @@
+"""
+OPCUAAddressSpaceTree follows node additions and deletions of a local asyncua server.
+"""
+
+import asyncio
+
+import pytest
+
+from asyncua import Server
+
+from OPC_UA_Server.asyncua_address_space_tree import OPCUAAddressSpaceTree
+
+
+async def _run_with_tree(_test) -> None:
+    """ Build a tree of a server with one folder of two variables, run _test(server, tree, idx, folder) """
+    server = Server()
+    await server.init()
+    idx = await server.register_namespace("urn:test:address_space_tree")
+    folder = await server.nodes.objects.add_object(idx, "Folder")
+    await folder.add_variable(idx, "Value1", 1)
+    await folder.add_variable(idx, "Value2", 2)
+    tree = OPCUAAddressSpaceTree(_server= server, _batch_size= 2)
+    assert await tree.build() == 3
+    try:
+        await _test(server, tree, idx, folder)
+    finally:
+        tree.close()
+
+
+def _names(_tree: OPCUAAddressSpaceTree) -> list:
+    compact_tree = _tree.get_compact_tree()
+    return [compact_tree.get_name(row) for row in range(len(compact_tree))]
+
+
+def test_tree_follows_additions_and_deletions():
+    async def _test(_server, _tree, _idx, _folder):
+        assert _names(_tree) == ["root object", "Folder", "Value1", "Value2"]
+        sub_folder = await _folder.add_object(_idx, "SubFolder")
+        await sub_folder.add_variable(_idx, "Value3", 3)
+        assert _names(_tree) == ["root object", "Folder", "Value1", "Value2", "SubFolder", "Value3"]
+        await sub_folder.delete(recursive= True)
+        assert _names(_tree) == ["root object", "Folder", "Value1", "Value2"]
+        await _folder.delete(recursive= True)
+        assert _names(_tree) == ["root object"]
+        assert _tree.nodes == {} and _tree.parents == {}
+        assert _tree.updates == 2 + 2 + 3
+    asyncio.run(_run_with_tree(_test))
+
+
+def test_second_tree_is_rejected():
+    async def _test(_server, _tree, _idx, _folder):
+        with pytest.raises(RuntimeError):
+            await OPCUAAddressSpaceTree(_server= _server).build()
+        # Building the same tree again replaces its own hooks
+        assert await _tree.build() == 3
+        _tree.close()
+        assert "_add_node" not in vars(_server.iserver.node_mgt_service)
+        assert "_delete_node" not in vars(_server.iserver.node_mgt_service)
+        assert await OPCUAAddressSpaceTree(_server= _server).build() == 3
+    asyncio.run(_run_with_tree(_test))
+
+
+def test_too_many_changes_mark_the_tree_dirty():
+    async def _test(_server, _tree, _idx, _folder):
+        _tree.max_pending = 3
+        for k in range(5):
+            await _folder.add_variable(_idx, f"Extra{k}", k)
+        assert _tree.dirty and _tree.pending == []
+        assert _tree.get_compact_tree() is None
+        # The next update browses the server again
+        assert await _tree.update() == 8
+        assert not _tree.dirty
+        assert _names(_tree) == ["root object", "Folder", "Value1", "Value2"] + [f"Extra{k}" for k in range(5)]
+        # Below the threshold the changes are applied in memory
+        await _folder.add_variable(_idx, "Value3", 3)
+        assert await _tree.update() == 1
+        assert _names(_tree)[-1] == "Value3"
+    asyncio.run(_run_with_tree(_test))
@@ -0,0 +1,152 @@
+"""
+The batched service calls of Lib.addressspace return one result per node in input order and send one
+request per chunk, checked with the internal session of a local asyncua server.
+"""
+
+import asyncio
+
+from asyncua import Server, ua
+
+from Lib.addressspace import browse_batched, read_attribute_batched, write_attribute_batched, walk_address_space, CountingSession
+
+
+async def _run_with_server(_test) -> None:
+    """ Server with 5 folders of 3 variables each, run _test(session, folders, variables) """
+    server = Server()
+    await server.init()
+    idx = await server.register_namespace("urn:test:addressspace")
+    folders = []
+    variables = []
+    for k in range(5):
+        folder = await server.nodes.objects.add_folder(idx, f"Folder{k}")
+        folders.append(folder.nodeid)
+        for v in range(3):
+            variables.append((await folder.add_variable(idx, f"Folder{k}_Value{v}", 10 * k + v)).nodeid)
+    await _test(server.nodes.objects.session, folders, variables)
+
+
+class _ContinuationSession:
+    """ Session which returns every reference in its own BrowseResult with a continuation point """
+
+    def __init__(self, _references: list) -> None:
+        self.references = _references
+        self.browse_next_calls = 0
+
+    async def browse(self, _parameters: ua.BrowseParameters) -> list:
+        return [self._result(_index= 0) for _ in _parameters.NodesToBrowse]
+
+    async def browse_next(self, _parameters: ua.BrowseNextParameters) -> list:
+        self.browse_next_calls += 1
+        return [self._result(_index= int(_parameters.ContinuationPoints[0]))]
+
+    def _result(self, _index: int) -> ua.BrowseResult:
+        result = ua.BrowseResult()
+        result.References = [self.references[_index]]
+        result.ContinuationPoint = str(_index + 1).encode() if _index + 1 < len(self.references) else None
+        return result
+
+
+def test_browse_batched_aligns_results_and_chunks_requests():
+    async def _test(_session, _folders, _variables):
+        session = CountingSession(_session= _session)
+        references = await browse_batched(_session= session, _node_ids= _folders, _batch_size= 2)
+        assert session.requests == 3
+        assert [[reference.BrowseName.Name for reference in node_references] for node_references in references] == [
+            [f"Folder{k}_Value{v}" for v in range(3)] for k in range(5)
+        ]
+    asyncio.run(_run_with_server(_test))
+
+
+def test_browse_batched_follows_continuation_points():
+    async def _test():
+        references = []
+        for k in range(4):
+            reference = ua.ReferenceDescription()
+            reference.NodeId = ua.NodeId(1000 + k, 2)
+            references.append(reference)
+        session = _ContinuationSession(_references= references)
+        results = await browse_batched(_session= session, _node_ids= [ua.NodeId(85, 0), ua.NodeId(86, 0)])
+        assert [[reference.NodeId.Identifier for reference in node_references] for node_references in results] == [[1000, 1001, 1002, 1003]] * 2
+        assert session.browse_next_calls == 6
+    asyncio.run(_test())
+
+
+def test_read_attribute_batched_aligns_results_and_chunks_requests():
+    async def _test(_session, _folders, _variables):
+        session = CountingSession(_session= _session)
+        unknown = ua.NodeId(999999, _variables[0].NamespaceIndex)
+        node_ids = list(reversed(_variables)) + [unknown]
+        data_values = await read_attribute_batched(_session= session, _node_ids= node_ids, _batch_size= 4)
+        assert session.requests == 4
+        assert [data_value.Value.Value for data_value in data_values[:-1]] == [10 * k + v for k in reversed(range(5)) for v in reversed(range(3))]
+        assert data_values[-1].StatusCode.value == ua.StatusCodes.BadNodeIdUnknown
+
+        browse_names = await read_attribute_batched(_session= _session, _node_ids= _folders, _attribute= ua.AttributeIds.BrowseName)
+        assert [data_value.Value.Value.Name for data_value in browse_names] == [f"Folder{k}" for k in range(5)]
+    asyncio.run(_run_with_server(_test))
+
+
+def test_write_attribute_batched_aligns_results_and_chunks_requests():
+    async def _test(_session, _folders, _variables):
+        session = CountingSession(_session= _session)
+        unknown = ua.NodeId(999999, _variables[0].NamespaceIndex)
+        node_ids = _variables + [unknown]
+        data_values = [ua.DataValue(ua.Variant(-index, ua.VariantType.Int64)) for index in range(len(node_ids))]
+        status_codes = await write_attribute_batched(_session= session, _node_ids= node_ids, _data_values= data_values, _batch_size= 7)
+        assert session.requests == 3
+        assert all(status_code.is_good() for status_code in status_codes[:-1])
+        assert status_codes[-1].value == ua.StatusCodes.BadNodeIdUnknown
+
+        written = await read_attribute_batched(_session= _session, _node_ids= _variables)
+        assert [data_value.Value.Value for data_value in written] == [-index for index in range(len(_variables))]
+    asyncio.run(_run_with_server(_test))
+
+def test_empty_input_sends_no_request():
+    async def _test(_session, _folders, _variables):
+        session = CountingSession(_session= _session)
+        assert await browse_batched(_session= session, _node_ids= []) == []
+        assert await read_attribute_batched(_session= session, _node_ids= []) == []
+        assert await write_attribute_batched(_session= session, _node_ids= [], _data_values= []) == []
+        assert session.requests == 0
+    asyncio.run(_run_with_server(_test))
+
+
+def test_walk_yields_every_node_once_with_parent_and_depth():
+    async def _test(_session, _folders, _variables):
+        namespace = _folders[0].NamespaceIndex
+        objects = ua.NodeId(ua.ObjectIds.ObjectsFolder)
+        walks = []
+        for concurrency, batch_size in [(1, 1000), (1, 2), (3, 2)]:
+            walks.append([
+                (reference.BrowseName.Name, parent_node_id, depth)
+                async for reference, parent_node_id, depth in walk_address_space(
+                    _session= _session,
+                    _root_node_id= objects,
+                    _node_filter= lambda reference: reference.NodeId.NamespaceIndex == namespace,
+                    _concurrency= concurrency,
+                    _batch_size= batch_size
+                )
+            ])
+        expected = [(f"Folder{k}", objects, 1) for k in range(5)]
+        expected += [(f"Folder{k}_Value{v}", _folders[k], 2) for k in range(5) for v in range(3)]
+        assert all(walk == expected for walk in walks)
+
+        first_level = [reference.NodeId async for reference, _, _ in walk_address_space(_session= _session, _root_node_id= objects, _node_filter= lambda reference: reference.NodeId.NamespaceIndex == namespace, _max_depth= 1)]
+        assert first_level == _folders
+    asyncio.run(_run_with_server(_test))
+
+
+def test_walk_does_not_revisit_nodes():
+    async def _test(_session, _folders, _variables):
+        # A second hierarchical reference leads back to a folder which is already known
+        await _session.add_references([ua.AddReferencesItem(
+            SourceNodeId= _folders[4],
+            ReferenceTypeId= ua.NodeId(ua.ObjectIds.Organizes),
+            IsForward= True,
+            TargetNodeId= _folders[0],
+            TargetNodeClass= ua.NodeClass.Object
+        )])
+        node_ids = [reference.NodeId async for reference, _, _ in walk_address_space(_session= _session, _root_node_id= ua.NodeId(ua.ObjectIds.ObjectsFolder))]
+        assert len(node_ids) == len(set(node_ids))
+        assert set(_folders + _variables) <= set(node_ids)
+    asyncio.run(_run_with_server(_test))
@@ -0,0 +1,75 @@
+"""
+The bulk activation creates the same variables as the node by node activation, and the bulk argument
+wins over the bulk_activation key of the config file.
+"""
+
+import json
+import asyncio
+import itertools
+
+import pytest
+
+from asyncua import ua
+
+from OPC_UA_Server import OPCUAServer
+from benchmarks.model_generator import generate_node_jsons, write_server_config
+
+ENDPOINT = "opc.tcp://127.0.0.1:48433/freeopcua/server/"
+ACCESS_COMBINATIONS = list(itertools.product([True, False], repeat= 2))
+
+
+def _create_server(_folder: str, _bulk_activation: bool) -> OPCUAServer:
+    return OPCUAServer(_server_config_path= _folder, _use_config_file= True, _logger_path= _folder, _bulk_activation= _bulk_activation)
+
+
+def _close_logger(_opc_ua_server: OPCUAServer) -> None:
+    _opc_ua_server.logger.removeHandler(_opc_ua_server.file_handler)
+    _opc_ua_server.file_handler.close()
+
+
+async def _read_variables(_folder: str, _bulk_activation: bool) -> dict:
+    """ Start a json server, return browse name -> (AccessLevel, UserAccessLevel, value) of the variables """
+    opc_ua_server = _create_server(_folder= _folder, _bulk_activation= _bulk_activation)
+    await opc_ua_server.autostart(source= "json")
+    try:
+        address_space = opc_ua_server.server.iserver.aspace
+        variables = {}
+        for node_id in list(address_space.keys()):
+            node = address_space.get(node_id)
+            if node_id.NamespaceIndex == 0 or node.attributes[ua.AttributeIds.NodeClass].value.Value.Value != ua.NodeClass.Variable:
+                continue
+            attributes = [node.attributes[attribute].value.Value.Value for attribute in (ua.AttributeIds.BrowseName, ua.AttributeIds.AccessLevel, ua.AttributeIds.UserAccessLevel, ua.AttributeIds.Value)]
+            variables[attributes[0].Name] = tuple(attributes[1:])
+        return variables
+    finally:
+        await opc_ua_server.stop_server()
+        _close_logger(_opc_ua_server= opc_ua_server)
+
+
+@pytest.fixture
+def config_folder(tmp_path):
+    node_jsons = generate_node_jsons(_objects= 2, _variables= len(ACCESS_COMBINATIONS), _depth= 2)
+    variables = [node_json for node_json in node_jsons if node_json["nodeHeader"]["nodeClass"] == "Variable"]
+    for node_json, (readable, writeable) in zip(variables, ACCESS_COMBINATIONS * 2):
+        node_json["access"] = {"readable": readable, "writeable": writeable}
+    write_server_config(_file= str(tmp_path / "server_config.json"), _node_jsons= node_jsons, _endpoint= ENDPOINT)
+    return str(tmp_path)
+
+
+def test_bulk_activation_matches_node_activation(config_folder):
+    expected = asyncio.run(_read_variables(_folder= config_folder, _bulk_activation= False))
+    bulk = asyncio.run(_read_variables(_folder= config_folder, _bulk_activation= True))
+    assert len(expected) == 2 * len(ACCESS_COMBINATIONS)
+    assert bulk == expected
+
+
+@pytest.mark.parametrize("argument, config, expected", [(None, True, True), (None, None, False), (False, True, False), (True, False, True)])
+def test_bulk_argument_wins_over_config(tmp_path, argument, config, expected):
+    config_data = {"endpoint": ENDPOINT, "namespaces": [], "nodes": []}
+    if config is not None:
+        config_data["bulk_activation"] = config
+    with open(tmp_path / "server_config.json", "w") as config_file:
+        json.dump(config_data, config_file)
+    opc_ua_server = _create_server(_folder= str(tmp_path), _bulk_activation= argument)
+    _close_logger(_opc_ua_server= opc_ua_server)
+    assert opc_ua_server.bulk_activation is expected
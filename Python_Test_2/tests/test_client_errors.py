@@ -0,0 +1,90 @@
+"""
+OPCUAClient keeps a working connection on service faults, with a local asyncua server.
+"""
+
+import asyncio
+
+from asyncua import Server, ua
+
+from OPC_UA_Client import OPCUAClient, ValueCache
+
+ENDPOINT = "opc.tcp://127.0.0.1:48431/freeopcua/server/"
+
+
+async def _run_with_client(_test) -> None:
+    """ Start a server with one variable and a connected auto reconnect client, run _test(client, variable) """
+    server = Server()
+    await server.init()
+    server.set_endpoint(ENDPOINT)
+    idx = await server.register_namespace("urn:test:client_errors")
+    variable = await server.nodes.objects.add_variable(idx, "Value", 1.5)
+    async with server:
+        opc_ua_client = OPCUAClient(_endpoint= ENDPOINT, _use_config_file= False, _use_cache_file= False, _auto_reconnect= True)
+        await opc_ua_client.start_Client()
+        try:
+            await _test(opc_ua_client, variable)
+        finally:
+            await opc_ua_client.stop_Client()
+
+
+def test_unknown_node_keeps_connection():
+    async def _test(_client, _variable):
+        unknown = _client.client.get_node(ua.NodeId(999999, _variable.nodeid.NamespaceIndex))
+        assert await _client.get_value(_node= unknown) is None
+        results = await _client.get_values(_nodes= [_variable.nodeid, unknown.nodeid])
+        assert results[0] == (1.5, results[0][1]) and results[0][1].is_good()
+        assert results[1][1].value == ua.StatusCodes.BadNodeIdUnknown
+        assert _client.connected is True
+        assert _client._reconnect_task is None
+    asyncio.run(_run_with_client(_test))
+
+
+def test_service_fault_returns_its_status_code():
+    async def _test(_client, _variable):
+        await _client.read_operation_limits()
+
+        async def _read(_parameters):
+            raise ua.UaStatusCodeError(ua.StatusCodes.BadTooManyOperations)
+        _client.client.uaclient.read = _read
+        results = await _client.get_values(_nodes= [_variable.nodeid])
+        assert results[0][1].value == ua.StatusCodes.BadTooManyOperations
+        assert _client.connected is True
+        assert _client._reconnect_task is None
+    asyncio.run(_run_with_client(_test))
+
+
+def test_lost_session_starts_reconnect():
+    async def _test(_client, _variable):
+        await _client.read_operation_limits()
+        read = _client.client.uaclient.read
+
+        async def _read(_parameters):
+            _client.client.uaclient.read = read
+            raise ua.UaStatusCodeError(ua.StatusCodes.BadSessionIdInvalid)
+        _client.client.uaclient.read = _read
+        results = await _client.get_values(_nodes= [_variable.nodeid])
+        assert results[0][1].value == ua.StatusCodes.BadConnectionClosed
+        assert _client.connected is False
+        assert _client._reconnect_task is not None
+        for _ in range(100):
+            if _client.connected:
+                break
+            await asyncio.sleep(0.1)
+        assert _client.connected is True
+        assert (await _client.get_values(_nodes= [_variable.nodeid]))[0][0] == 1.5
+    asyncio.run(_run_with_client(_test))
+
+
+def test_get_value_returns_none_on_other_errors():
+    async def _test(_client, _variable):
+        await _client.read_operation_limits()
+        node = _client.client.get_node(_variable.nodeid)
+
+        async def _read(_parameters):
+            raise ValueError("broken response")
+        _client.client.uaclient.read = _read
+        _client.value_cache = ValueCache(_size= 10)
+        assert await _client.get_value(_node= node) is None
+        assert await _client.get_value(_node= node, _max_age= 1000) is None
+        assert _client.connected is True
+    asyncio.run(_run_with_client(_test))
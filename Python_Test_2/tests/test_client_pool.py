@@ -0,0 +1,64 @@
+"""
+Reconnect behaviour of OPCUAClientPool.session(), without server.
+
+The sessions of the pool are marked healthy by hand, reconnects are recorded instead of connecting.
+"""
+
+import asyncio
+
+import pytest
+
+from asyncua import ua
+
+from OPC_UA_Client.asyncua_client_pool import OPCUAClientPool, is_connection_error
+
+
+async def _lease_and_raise(_error: BaseException) -> OPCUAClientPool:
+    """ Lease the only session of a pool, raise _error inside and return the pool """
+    pool = OPCUAClientPool(_endpoint= "opc.tcp://127.0.0.1:4840", _size= 1, _health_interval= 0)
+    pool.available = asyncio.Condition()
+    pool.running = True
+    pool.sessions[0].client = object()
+    pool.sessions[0].healthy = True
+    reconnects = []
+    pool._schedule_reconnect = lambda _pooled: reconnects.append(_pooled.index)
+    pool.reconnects_scheduled = reconnects
+    with pytest.raises(type(_error)):
+        async with pool.session():
+            raise _error
+    return pool
+
+
+@pytest.mark.parametrize("error", [
+    ConnectionResetError("reset by peer"),
+    asyncio.TimeoutError(),
+    ua.UaStatusCodeError(ua.StatusCodes.BadSessionIdInvalid),
+    ua.UaStatusCodeError(ua.StatusCodes.BadConnectionClosed),
+])
+def test_transport_error_reconnects_session(error):
+    pool = asyncio.run(_lease_and_raise(error))
+    assert pool.sessions[0].healthy is False
+    assert pool.reconnects_scheduled == [0]
+    assert pool.failures == 1
+    assert pool.sessions[0].in_use == 0
+
+
+@pytest.mark.parametrize("error", [
+    ua.UaStatusCodeError(ua.StatusCodes.BadNodeIdUnknown),
+    ua.UaStatusCodeError(ua.StatusCodes.BadTypeMismatch),
+    ua.UaStatusCodeError(ua.StatusCodes.BadUserAccessDenied),
+    ValueError("not an OPC UA error"),
+])
+def test_service_fault_keeps_session(error):
+    pool = asyncio.run(_lease_and_raise(error))
+    assert pool.sessions[0].healthy is True
+    assert pool.reconnects_scheduled == []
+    assert pool.failures == 0
+    assert pool.sessions[0].in_use == 0
+
+
+def test_is_connection_error():
+    assert is_connection_error(OSError())
+    assert is_connection_error(ua.UaStatusCodeError(ua.StatusCodes.BadSecureChannelClosed))
+    assert not is_connection_error(ua.UaStatusCodeError(ua.StatusCodes.BadNodeIdUnknown))
+    assert not is_connection_error(KeyError())
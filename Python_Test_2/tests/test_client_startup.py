@@ -0,0 +1,51 @@
+"""
+OPCUAClient sends every request of the node resolution, also the DataType lookups, through the
+session it is given, so startup_requests counts all of them.
+"""
+
+import asyncio
+
+from asyncua import Server, ua
+
+from Lib.addressspace import CountingSession
+from OPC_UA_Client import OPCUAClient
+
+ENDPOINT = "opc.tcp://127.0.0.1:48437/freeopcua/server/"
+
+
+def test_add_nodes_sends_every_request_through_the_session():
+    async def _test():
+        server = Server()
+        await server.init()
+        server.set_endpoint(ENDPOINT)
+        idx = await server.register_namespace("urn:test:client_startup")
+        folder = await server.nodes.objects.add_folder(idx, "Folder")
+        await folder.add_variable(idx, "Value", 1.5)
+        # Duration is no builtin type, its VariantType is resolved over the supertypes
+        await folder.add_variable(idx, "Timeout", 2.5, datatype= ua.NodeId(ua.ObjectIds.Duration))
+        await server.nodes.objects.add_folder(idx, "Other")
+        async with server:
+            opc_ua_client = OPCUAClient(_endpoint= ENDPOINT, _use_config_file= False, _use_cache_file= False)
+            await opc_ua_client.start_Client()
+            try:
+                # Every service request of the client ends in the UaSession, also those of plain Node objects
+                uaclient = opc_ua_client.client.uaclient
+                ua_session = uaclient.session
+                sent = []
+                for name in ("browse", "browse_next", "read"):
+                    def _wrap(_function, _name= name):
+                        async def _call(_parameters):
+                            sent.append(_name)
+                            return await _function(_parameters)
+                        return _call
+                    setattr(ua_session, name, _wrap(getattr(ua_session, name)))
+
+                session = CountingSession(uaclient)
+                assert await opc_ua_client.add_nodes(_loadable_nodes= [{"browseName": "Value"}, {"browseName": "Timeout"}], _session= session) == 2
+                await asyncio.sleep(0.1)
+                assert "browse" in sent and "read" in sent
+                assert session.requests == len(sent)
+                assert [entry.variant_type for entry in opc_ua_client.loaded_nodes.entries] == [ua.VariantType.Double, ua.VariantType.Double]
+            finally:
+                await opc_ua_client.stop_Client()
+    asyncio.run(_test())
@@ -0,0 +1,59 @@
+"""
+CompactTree prints the same tree as the tree list of dependencytree and finds its rows by id.
+"""
+
+import io
+import os
+import filecmp
+
+import pytest
+
+from Lib.dependencytree import dependencytree_print, compacttree_print, CompactTree
+from benchmarks.dependencytree_benchmark import generate_tree
+
+
+def _print_both(_tree: list, _object_names: list, **_options) -> tuple:
+    """ Output of dependencytree_print() and compacttree_print() for the same tree """
+    expected = io.StringIO()
+    dependencytree_print(_tree= _tree, _object_names= _object_names, _stream= expected, **_options)
+    printed = io.StringIO()
+    compacttree_print(_tree= CompactTree.from_lists(_tree= _tree, _object_names= _object_names), _stream= printed, **_options)
+    return printed.getvalue(), expected.getvalue()
+
+
+@pytest.mark.parametrize("rows, depth", [(1, 1), (50, 3), (2000, 8)])
+@pytest.mark.parametrize("options", [{}, {"_add_names": True}, {"_names_only": True}])
+def test_compacttree_prints_like_dependencytree(rows, depth, options):
+    tree = generate_tree(_rows= rows, _depth= depth)
+    object_names = [[row[-1], f"node {row[-1]}"] for row in tree]
+    printed, expected = _print_both(_tree= tree, _object_names= object_names, **options)
+    assert printed == expected
+    assert printed.count("\n") == rows
+
+
+def test_lists_round_trip():
+    tree = generate_tree(_rows= 500, _depth= 6, _seed= 1)
+    object_names = [[row[-1], f"node {row[-1]}"] for row in tree]
+    information = [[row[-1], f"information {row[-1]}"] for row in tree[::3]]
+    assert CompactTree.from_lists(_tree= tree, _object_names= object_names, _information= information).to_lists() == (tree, object_names, information)
+
+
+def test_find_returns_the_first_row():
+    compact_tree = CompactTree()
+    compact_tree.append(_id= 85, _depth= 0)
+    compact_tree.append(_id= "Folder", _depth= 1)
+    compact_tree.append(_id= 1001, _depth= 2)
+    compact_tree.append(_id= 1001, _depth= 1)
+    assert compact_tree.find(85) == 0
+    assert compact_tree.find("Folder") == 1
+    assert compact_tree.find(1001) == 2
+    assert compact_tree.find(1002) == -1
+    assert compact_tree.find("Missing") == -1
+    compact_tree.clear()
+    assert compact_tree.find(85) == -1
+
+
+def test_client_copy_is_identical():
+    folder = os.path.join(os.path.dirname(__file__), "..")
+    for file in ("compacttree.py", "dependencytree.py"):
+        assert filecmp.cmp(os.path.join(folder, "Lib", "dependencytree", file), os.path.join(folder, "OPC_UA_Client", "Lib", "dependencytree", file), shallow= False)
@@ -0,0 +1,93 @@
+"""
+export_server_model() writes the reference types by browse name and falls back to the NodeId of types
+whose browse name could not be read. The streaming export writes the nodes while the address space is walked.
+"""
+
+import os
+import asyncio
+
+import pytest
+
+from lxml import etree
+
+from OPC_UA_Server import OPCUAServer
+from OPC_UA_Server import asyncua_server
+from benchmarks.model_generator import generate_node_jsons, write_server_config
+
+ENDPOINT = "opc.tcp://127.0.0.1:48434/freeopcua/server/"
+
+
+async def _export_reference_types(_folder: str, _streaming: bool, _read_type_names: bool) -> list:
+    """ Export a json server, return the ReferenceType attributes of the file """
+    write_server_config(_file= os.path.join(_folder, "server_config.json"), _node_jsons= generate_node_jsons(_objects= 4, _variables= 2, _depth= 2), _endpoint= ENDPOINT)
+    opc_ua_server = OPCUAServer(_server_config_path= _folder, _use_config_file= True, _logger_path= _folder)
+    await opc_ua_server.autostart(source= "json")
+    try:
+        if not _read_type_names:
+            async def _cache_type_names(_session, _node_ids, _batch_size):
+                return 0
+            opc_ua_server._cache_type_names = _cache_type_names
+        output_file = os.path.join(_folder, "export.xml")
+        assert await opc_ua_server.export_server_model(output_file= output_file, _batch_size= 3, _streaming= _streaming) == 1
+    finally:
+        await opc_ua_server.stop_server()
+        opc_ua_server.logger.removeHandler(opc_ua_server.file_handler)
+        opc_ua_server.file_handler.close()
+    return [element.get("ReferenceType") for element in etree.parse(output_file).iter("{*}Reference", "Reference")]
+
+
+@pytest.mark.parametrize("streaming", [False, True])
+def test_reference_types_by_browse_name(tmp_path, streaming):
+    reference_types = asyncio.run(_export_reference_types(_folder= str(tmp_path), _streaming= streaming, _read_type_names= True))
+    assert reference_types
+    assert {"HasComponent", "Organizes", "HasTypeDefinition"} <= set(reference_types)
+
+
+@pytest.mark.parametrize("streaming", [False, True])
+def test_unknown_reference_types_by_node_id(tmp_path, streaming):
+    reference_types = asyncio.run(_export_reference_types(_folder= str(tmp_path), _streaming= streaming, _read_type_names= False))
+    assert reference_types
+    assert "None" not in reference_types
+    assert "i=47" in reference_types
+
+
+def test_streaming_export_writes_while_walking(tmp_path, monkeypatch):
+    events = []
+    walk_address_space = asyncua_server.walk_address_space
+
+    async def _walk(**_arguments):
+        async for item in walk_address_space(**_arguments):
+            yield item
+        events.append("walk done")
+    monkeypatch.setattr(asyncua_server, "walk_address_space", _walk)
+
+    async def _export() -> dict:
+        folder = str(tmp_path)
+        write_server_config(_file= os.path.join(folder, "server_config.json"), _node_jsons= generate_node_jsons(_objects= 6, _variables= 3, _depth= 3), _endpoint= ENDPOINT)
+        opc_ua_server = OPCUAServer(_server_config_path= folder, _use_config_file= True, _logger_path= folder)
+        await opc_ua_server.autostart(source= "json")
+        write_node_elements = opc_ua_server._write_node_elements
+
+        async def _write_node_elements(**_arguments):
+            events.append("write")
+            return await write_node_elements(**_arguments)
+        opc_ua_server._write_node_elements = _write_node_elements
+        nodes = {}
+        try:
+            for streaming in (False, True):
+                output_file = os.path.join(folder, f"export_{streaming}.xml")
+                assert await opc_ua_server.export_server_model(output_file= output_file, _batch_size= 4, _streaming= streaming) == 1
+                assert opc_ua_server.exported_nodes == 6 + 6 * 3
+                nodes[streaming] = {(element.get("NodeId"), element.get("ParentNodeId")) for element in etree.parse(output_file).getroot() if element.get("NodeId")}
+        finally:
+            await opc_ua_server.stop_server()
+            opc_ua_server.logger.removeHandler(opc_ua_server.file_handler)
+            opc_ua_server.file_handler.close()
+        return nodes
+
+    nodes = asyncio.run(_export())
+    assert nodes[True] == nodes[False] and len(nodes[True]) == 6 + 6 * 3
+    # The non streaming export walks first, the streaming export writes chunks before the walk ends
+    streaming_events = events[events.index("walk done") + 1:]
+    assert streaming_events.index("write") < streaming_events.index("walk done")
+    assert streaming_events.count("write") > 2
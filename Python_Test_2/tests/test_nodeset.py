@@ -0,0 +1,62 @@
+"""
+load_nodeset() builds the same address space as Server.import_xml(), it uses private parts of asyncua
+and this test has to pass before the pinned asyncua version is changed.
+"""
+
+import os
+import asyncio
+
+import asyncua
+import pytest
+
+from asyncua import Server, ua
+
+from Lib.nodeset import load_nodeset, SUPPORTED_ASYNCUA_VERSION
+from benchmarks.model_generator import generate_node_jsons, write_nodeset, BENCHMARK_NAMESPACE_URI
+
+DESIGN_MODEL = os.path.join(os.path.dirname(__file__), "..", "OPC_UA_Server", "design_models", "server_design_model.xml")
+
+
+async def _read_address_space(_xml_file: str, _use_nodeset: bool) -> dict:
+    """ Import the file into a new server, return node id -> (sorted references, value of custom variables) """
+    server = Server()
+    await server.init()
+    if _use_nodeset:
+        await load_nodeset(_server= server, _xml_file= _xml_file, _batch_size= 7)
+    else:
+        await server.import_xml(_xml_file)
+    address_space = server.iserver.aspace
+    nodes = {}
+    for node_id in address_space.keys():
+        node = address_space.get(node_id)
+        references = sorted((reference.ReferenceTypeId.to_string(), reference.NodeId.to_string(), reference.IsForward) for reference in node.references)
+        value = None
+        if node_id.NamespaceIndex != 0 and ua.AttributeIds.Value in node.attributes:
+            value = node.attributes[ua.AttributeIds.Value].value.Value
+        nodes[node_id.to_string()] = (references, value)
+    return nodes
+
+
+def _assert_same_address_space(_xml_file: str) -> None:
+    expected = asyncio.run(_read_address_space(_xml_file= _xml_file, _use_nodeset= False))
+    loaded = asyncio.run(_read_address_space(_xml_file= _xml_file, _use_nodeset= True))
+    assert sorted(loaded) == sorted(expected)
+    for node_id, (references, value) in expected.items():
+        assert loaded[node_id][0] == references, node_id
+        assert loaded[node_id][1] == value, node_id
+
+
+def test_pinned_asyncua_version():
+    assert asyncua.__version__ == SUPPORTED_ASYNCUA_VERSION
+
+
+def test_design_model_matches_import_xml():
+    _assert_same_address_space(_xml_file= DESIGN_MODEL)
+
+
+@pytest.mark.parametrize("depth", [1, 3])
+def test_generated_model_matches_import_xml(tmp_path, depth):
+    xml_file = str(tmp_path / "nodeset.xml")
+    node_jsons = generate_node_jsons(_objects= 20, _variables= 4, _depth= depth, _namespace_uri= BENCHMARK_NAMESPACE_URI)
+    write_nodeset(_file= xml_file, _node_jsons= node_jsons, _namespace_uri= BENCHMARK_NAMESPACE_URI)
+    _assert_same_address_space(_xml_file= xml_file)
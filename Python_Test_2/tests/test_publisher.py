@@ -0,0 +1,64 @@
+"""
+OPCUAPublisher reports its statistics also if it is cancelled like clock_set.py on Ctrl+C, and keeps
+a bounded number of jitter and latency samples.
+"""
+
+import asyncio
+
+import pytest
+
+from asyncua import Server
+
+from OPC_UA_Client import OPCUAClient, OPCUAPublisher
+
+ENDPOINT = "opc.tcp://127.0.0.1:48436/freeopcua/server/"
+
+
+async def _run_with_publisher(_test) -> None:
+    """ Start a server with one writable variable and a connected client, run _test(publisher) """
+    server = Server()
+    await server.init()
+    server.set_endpoint(ENDPOINT)
+    idx = await server.register_namespace("urn:test:publisher")
+    variable = await server.nodes.objects.add_variable(idx, "Clock", 0.0)
+    await variable.set_writable()
+    async with server:
+        opc_ua_client = OPCUAClient(_endpoint= ENDPOINT, _use_config_file= False, _use_cache_file= False)
+        await opc_ua_client.start_Client()
+        try:
+            publisher = OPCUAPublisher(
+                _client= opc_ua_client,
+                _node= opc_ua_client.client.get_node(variable.nodeid),
+                _rate= 200,
+                _value_factory= lambda: 1.0,
+                _max_in_flight= 4,
+                _max_samples= 10
+            )
+            await _test(publisher)
+        finally:
+            await opc_ua_client.stop_Client()
+
+
+def test_cancelled_run_reports_its_rate():
+    async def _test(_publisher):
+        task = asyncio.create_task(_publisher.run())
+        await asyncio.sleep(0.5)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        statistics = _publisher.get_statistics()
+        assert _publisher.running is False
+        assert not _publisher.in_flight
+        assert 0.4 < _publisher.duration < 1.0
+        assert statistics["writes"] > 0 and statistics["achieved_rate"] > 0.0
+        assert len(_publisher.jitters) == 10 and len(_publisher.latencies) == 10
+    asyncio.run(_run_with_publisher(_test))
+
+
+def test_run_with_ticks_covers_every_period():
+    async def _test(_publisher):
+        statistics = await _publisher.run(_ticks= 20)
+        assert statistics["ticks"] == 20
+        assert statistics["writes"] + statistics["skipped"] + statistics["errors"] == 20
+        assert _publisher.duration >= 20 / 200
+    asyncio.run(_run_with_publisher(_test))
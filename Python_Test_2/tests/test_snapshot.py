@@ -0,0 +1,89 @@
+"""
+A server started from a snapshot has the same address space as a server built from the json config or
+the xml design model. The snapshot replaces private parts of asyncua, this test has to pass before the
+pinned asyncua version is changed.
+"""
+
+import os
+import pickle
+import asyncio
+
+import pytest
+
+from asyncua import ua
+
+from Lib.snapshot import hash_source_files, read_snapshot
+from OPC_UA_Server import OPCUAServer
+from benchmarks.model_generator import generate_node_jsons, write_server_config, write_nodeset, BENCHMARK_NAMESPACE_URI
+
+ENDPOINT = "opc.tcp://127.0.0.1:48432/freeopcua/server/"
+
+
+def _read_address_space(_server: object) -> dict:
+    """ Node id -> (sorted references, value of custom variables) of a running server """
+    address_space = _server.iserver.aspace
+    nodes = {}
+    for node_id in list(address_space.keys()):
+        node = address_space.get(node_id)
+        references = sorted((reference.ReferenceTypeId.to_string(), reference.NodeId.to_string(), reference.IsForward) for reference in node.references)
+        value = None
+        if node_id.NamespaceIndex != 0 and ua.AttributeIds.Value in node.attributes:
+            value = node.attributes[ua.AttributeIds.Value].value.Value
+        nodes[node_id.to_string()] = (references, value)
+    return nodes
+
+
+async def _start(_folder: str, _source: str) -> tuple:
+    """ Start a server with the snapshot source, return (address space, loaded by snapshot) """
+    opc_ua_server = OPCUAServer(
+        _server_config_path= _folder,
+        _server_xml_path= _folder,
+        _server_xml_file= "nodeset.xml",
+        _server_snapshot_path= _folder,
+        _snapshot_source= _source,
+        _use_config_file= True,
+        _logger_path= _folder
+    )
+    await opc_ua_server.autostart(source= "snapshot")
+    try:
+        if opc_ua_server._snapshot_task is not None:
+            await opc_ua_server._snapshot_task
+        return _read_address_space(_server= opc_ua_server.server), opc_ua_server.loaded_by_snapshot
+    finally:
+        await opc_ua_server.stop_server()
+        opc_ua_server.logger.removeHandler(opc_ua_server.file_handler)
+        opc_ua_server.file_handler.close()
+
+
+@pytest.fixture
+def model_folder(tmp_path):
+    node_jsons = generate_node_jsons(_objects= 10, _variables= 3, _depth= 2, _namespace_uri= BENCHMARK_NAMESPACE_URI)
+    write_server_config(_file= str(tmp_path / "server_config.json"), _node_jsons= node_jsons, _endpoint= ENDPOINT)
+    write_nodeset(_file= str(tmp_path / "nodeset.xml"), _node_jsons= node_jsons, _namespace_uri= BENCHMARK_NAMESPACE_URI)
+    return str(tmp_path)
+
+
+@pytest.mark.parametrize("source", ["json", "xml"])
+def test_snapshot_start_matches_normal_start(model_folder, source):
+    expected, expected_by_snapshot = asyncio.run(_start(_folder= model_folder, _source= source))
+    loaded, loaded_by_snapshot = asyncio.run(_start(_folder= model_folder, _source= source))
+    assert expected_by_snapshot is False and loaded_by_snapshot is True
+    assert any(node_id.startswith("ns=2;") for node_id in expected)
+    assert sorted(loaded) == sorted(expected)
+    for node_id, (references, value) in expected.items():
+        assert loaded[node_id][0] == references, node_id
+        assert loaded[node_id][1] == value, node_id
+
+
+def test_snapshot_of_other_asyncua_version_is_rejected(model_folder):
+    asyncio.run(_start(_folder= model_folder, _source= "json"))
+    snapshot_file = os.path.join(model_folder, "server_snapshot.pickle")
+    source_hash = hash_source_files(_files= [os.path.join(model_folder, "server_config.json")], _salt= "json")
+    assert read_snapshot(_file= snapshot_file, _source_hash= source_hash) is not None
+
+    with open(snapshot_file, "rb") as snapshot_file_handle:
+        snapshot = pickle.load(snapshot_file_handle)
+    snapshot["asyncua_version"] = "0.0.0"
+    with open(snapshot_file, "wb") as snapshot_file_handle:
+        pickle.dump(snapshot, snapshot_file_handle)
+    assert read_snapshot(_file= snapshot_file, _source_hash= source_hash) is None
@@ -0,0 +1,101 @@
+"""
+ValueCache evicts the least recently used node and answers only with values of the accepted age,
+OPCUAClient reads only the nodes without such a value.
+"""
+
+import asyncio
+
+from asyncua import Server, ua
+
+from OPC_UA_Client import OPCUAClient, ValueCache
+from OPC_UA_Client import asyncua_value_cache
+
+ENDPOINT = "opc.tcp://127.0.0.1:48435/freeopcua/server/"
+GOOD = ua.StatusCode(ua.StatusCodes.Good)
+
+
+class _Clock:
+    """ Replacement of time.monotonic() which only moves when it is told to """
+
+    def __init__(self) -> None:
+        self.now = 100.0
+
+    def monotonic(self) -> float:
+        return self.now
+
+
+def test_least_recently_used_node_is_evicted():
+    cache = ValueCache(_size= 2)
+    cache.put("a", 1, GOOD)
+    cache.put("b", 2, GOOD)
+    assert cache.get("a", 1000) == (1, GOOD)            # "b" is the least recently used node now
+    cache.put("c", 3, GOOD)
+    assert cache.get("b", 1000) is None
+    assert cache.get("a", 1000) == (1, GOOD)
+    assert cache.get("c", 1000) == (3, GOOD)
+    cache.put("a", 4, GOOD)                             # an update does not evict
+    assert list(cache.entries) == ["c", "a"]
+    assert cache.get_statistics() == {"nodes": 2, "hits": 3, "misses": 1, "hit_rate": 0.75, "evictions": 1}
+
+
+def test_values_older_than_max_age_are_misses(monkeypatch):
+    clock = _Clock()
+    monkeypatch.setattr(asyncua_value_cache.time, "monotonic", clock.monotonic)
+    cache = ValueCache(_size= 10)
+    cache.put("a", 1, GOOD)
+    clock.now += 0.5
+    assert cache.get("a", 500) == (1, GOOD)
+    assert cache.get("a", 499) is None
+    assert cache.get("a", 0) is None
+    cache.put("a", 2, GOOD)                             # a new value restarts the age
+    assert cache.get("a", 0) == (2, GOOD)
+    cache.invalidate("a")
+    assert cache.get("a", 1000) is None
+    cache.put("b", 3, GOOD)
+    cache.clear()
+    assert cache.entries == {} and cache.get_statistics()["hits"] == 2
+
+
+def test_client_reads_only_missing_nodes():
+    async def _test():
+        server = Server()
+        await server.init()
+        server.set_endpoint(ENDPOINT)
+        idx = await server.register_namespace("urn:test:value_cache")
+        variables = [await server.nodes.objects.add_variable(idx, f"Value{k}", float(k)) for k in range(3)]
+        for variable in variables:
+            await variable.set_writable()
+        async with server:
+            opc_ua_client = OPCUAClient(_endpoint= ENDPOINT, _use_config_file= False, _use_cache_file= False, _value_cache_size= 2)
+            await opc_ua_client.start_Client()
+            try:
+                read = opc_ua_client.client.uaclient.read
+                read_nodes = []
+
+                async def _read(_parameters):
+                    read_nodes.append([read_value.NodeId for read_value in _parameters.NodesToRead])
+                    return await read(_parameters)
+                opc_ua_client.client.uaclient.read = _read
+                node_ids = [variable.nodeid for variable in variables]
+
+                assert [value for value, _ in await opc_ua_client.get_values(_nodes= node_ids[:2], _max_age= 60000)] == [0.0, 1.0]
+                assert [value for value, _ in await opc_ua_client.get_values(_nodes= node_ids, _max_age= 60000)] == [0.0, 1.0, 2.0]
+                assert read_nodes[-1] == [node_ids[2]]
+                # Value0 was evicted by Value2, Value1 is still cached
+                read_nodes.clear()
+                await opc_ua_client.get_values(_nodes= node_ids[:2], _max_age= 60000)
+                assert read_nodes == [[node_ids[0]]]
+
+                # A write invalidates the node, the next lookup reads the new value
+                await opc_ua_client.set_values(_values= {node_ids[1]: 5.0})
+                read_nodes.clear()
+                assert (await opc_ua_client.get_values(_nodes= [node_ids[1]], _max_age= 60000))[0][0] == 5.0
+                assert read_nodes == [[node_ids[1]]]
+
+                # Without _max_age every node is read
+                read_nodes.clear()
+                await opc_ua_client.get_values(_nodes= node_ids)
+                assert read_nodes == [node_ids]
+            finally:
+                await opc_ua_client.stop_Client()
+    asyncio.run(_test())